@@ -0,0 +1,159 @@
+from bisect import bisect_right
+from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app import pagination
+from app.models.avatar import Avatar
+from app.models.badge import Badge
+import hashlib
+import os
+import threading
+import time
+
+load_dotenv()
+
+# Segundos até recarregar o catálogo do banco (0 = só recarrega quando
+# invalidado ou ao pedir um id que ele não conhece)
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "60"))
+
+class CatalogSnapshot:
+    """
+    Conteúdo imutável do catálogo em um instante: itens por id, ids
+    ordenados e um digest do conteúdo (usado como ETag).
+    """
+    __slots__ = ("itens", "ids", "digest")
+
+    def __init__(self, itens: dict):
+        self.itens = itens
+        self.ids = sorted(itens)
+        self.digest = hashlib.sha256(
+            repr([sorted(itens[i].items()) for i in self.ids]).encode()
+        ).hexdigest()
+
+    def get(self, id: int):
+        return self.itens.get(id)
+
+    def pagina(self, after, limit: int):
+        inicio = bisect_right(self.ids, after) if after is not None else 0
+        pagina = [self.itens[i] for i in self.ids[inicio:inicio + limit + 1]]
+        return pagination.pagina(pagina, limit, "id")
+
+class CatalogCache:
+    """
+    Cache em memória de uma tabela de referência (Badge, Avatar).
+    Carrega a tabela inteira na primeira leitura e passa a responder
+    por id com um acesso a dicionário. As rotas de escrita chamam
+    invalidate(). Itens criados por outros processos (workers do
+    uvicorn, scripts de seed) entram quando um id desconhecido é pedido
+    (ver carregar) ou, nas listagens, quando o TTL expira.
+    """
+
+    def __init__(self, model, ttl: float = CATALOG_CACHE_TTL):
+        self.model = model
+        self.ttl = ttl
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self._colunas = tuple(model.__table__.columns)
+        self._snapshot = None
+        self._carregado_em = 0.0
+        self._lock = threading.Lock()
+
+    def _atual(self):
+        # None se ainda não carregado ou expirado
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        if self.ttl > 0 and time.monotonic() - self._carregado_em >= self.ttl:
+            return None
+        return snapshot
+
+    def _consultar(self):
+        return select(*self._colunas).order_by(self.model.id)
+
+    def _preencher(self, rows, versao: int):
+        snapshot = CatalogSnapshot({row["id"]: dict(row) for row in rows})
+        with self._lock:
+            # Não publica uma carga iniciada antes de um invalidate()
+            if self.version == versao:
+                self._snapshot = snapshot
+                self._carregado_em = time.monotonic()
+            self.loads += 1
+        return snapshot
+
+    def _registrar(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _desconhecidos(self, snapshot, ids):
+        # Consulta por PK dos ids ausentes do snapshot: algum existe no banco?
+        faltando = {i for i in ids if i is not None and snapshot.get(i) is None}
+        if not faltando:
+            return None
+        return select(self.model.id).where(self.model.id.in_(faltando)).limit(1)
+
+    def carregar(self, db: Session, ids=()):
+        """
+        Snapshot do catálogo. Se algum de `ids` não estiver no snapshot
+        em cache, confere no banco (ele pode ter sido criado por outro
+        processo) e, se existir, recarrega. Ids que não existem custam
+        só a consulta por PK.
+        """
+        snapshot = self._atual()
+        self._registrar(snapshot is not None)
+        if snapshot is not None:
+            stmt = self._desconhecidos(snapshot, ids)
+            if stmt is None or db.scalar(stmt) is None:
+                return snapshot
+            self.invalidate()
+        versao = self.version
+        return self._preencher(db.execute(self._consultar()).mappings(), versao)
+
+    async def acarregar(self, db: AsyncSession, ids=()):
+        snapshot = self._atual()
+        self._registrar(snapshot is not None)
+        if snapshot is not None:
+            stmt = self._desconhecidos(snapshot, ids)
+            if stmt is None or await db.scalar(stmt) is None:
+                return snapshot
+            self.invalidate()
+        versao = self.version
+        return self._preencher((await db.execute(self._consultar())).mappings(), versao)
+
+    def get(self, db: Session, id: int):
+        return self.carregar(db, (id,)).get(id)
+
+    async def aget(self, db: AsyncSession, id: int):
+        return (await self.acarregar(db, (id,))).get(id)
+
+    def listar(self, db: Session, after, limit: int):
+        return self.carregar(db).pagina(after, limit)
+
+    async def alistar(self, db: AsyncSession, after, limit: int):
+        return (await self.acarregar(db)).pagina(after, limit)
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+            self.version += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._snapshot.itens) if self._snapshot is not None else 0,
+                "version": self.version,
+                "loads": self.loads,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "ttl_s": self.ttl,
+            }
+
+badge_cache = CatalogCache(Badge)
+avatar_cache = CatalogCache(Avatar)
@@ -1,19 +1,143 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from dotenv import load_dotenv
+import logging
 import os
+import threading
+import time
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL, echo=True)
+def _env_bool(nome: str, padrao: str) -> bool:
+    return os.getenv(nome, padrao).strip().lower() in ("1", "true", "yes", "on")
+
+DB_ECHO = _env_bool("DB_ECHO", "false")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", "true")
+
+# Driver assíncrono equivalente a cada driver síncrono suportado
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+mysqlconnector": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+def _async_url(url: str):
+    async_url = make_url(url)
+    drivername = ASYNC_DRIVERS.get(async_url.drivername, async_url.drivername)
+    return async_url.set(drivername=drivername)
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_url(DATABASE_URL)
+
+class PoolStats:
+    """
+    Contadores de espera por conexão do pool.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def registrar(self, espera: float, timeout: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += espera
+            if espera > self.wait_max:
+                self.wait_max = espera
+            if timeout:
+                self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_total_ms": round(self.wait_total * 1000, 3),
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "wait_avg_ms": round(self.wait_total * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+            }
+
+class _InstrumentedPool:
+    # Definido por subclasse (ver _pool_class); sobrevive a pool.recreate()
+    stats: PoolStats
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.registrar(time.perf_counter() - inicio, timeout=True)
+            logger.warning("Pool de conexões esgotado: %s", self.status())
+            raise
+        self.stats.registrar(time.perf_counter() - inicio)
+        return conn
+
+def _pool_class(base):
+    return type(f"Instrumented{base.__name__}", (_InstrumentedPool, base), {"stats": PoolStats()})
+
+def _engine_kwargs(url, pool_base) -> dict:
+    kwargs = {"echo": DB_ECHO, "pool_pre_ping": DB_POOL_PRE_PING}
+    # sqlite (testes/benchmarks) mantém o pool padrão do dialeto
+    if make_url(url).get_backend_name() == "sqlite":
+        return kwargs
+    kwargs.update(
+        poolclass=_pool_class(pool_base),
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+    return kwargs
+
+engine = create_engine(DATABASE_URL, **_engine_kwargs(DATABASE_URL, QueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **_engine_kwargs(ASYNC_DATABASE_URL, AsyncAdaptedQueuePool)
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+def pool_status(pool) -> dict:
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout_s=pool.timeout(),
+        )
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
+
 def get_db():
     db: Session = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
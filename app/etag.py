@@ -0,0 +1,42 @@
+import hashlib
+from fastapi import Request, Response
+
+# GET condicional (ETag / If-None-Match).
+# Catálogos usam o digest do snapshot em cache, então o 304 sai sem
+# consulta nem serialização. Perfis usam o hash do JSON serializado,
+# poupando a transferência quando nada mudou.
+
+def gerar(*partes) -> str:
+    chave = "|".join(str(p) for p in partes)
+    return '"%s"' % hashlib.sha256(chave.encode()).hexdigest()[:32]
+
+def corresponde(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidatos = {c.strip().removeprefix("W/") for c in header.split(",")}
+    return etag in candidatos
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+def aplicar(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+def json_response(request: Request, schema, payload) -> Response:
+    """
+    Serializa o payload pelo schema, calcula o ETag pelo conteúdo e
+    devolve 304 se o cliente já tem essa versão.
+    """
+    body = schema.model_validate(payload, from_attributes=True).model_dump_json().encode()
+    etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+    if corresponde(request, etag):
+        return not_modified(etag)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
+    )
@@ -0,0 +1,238 @@
+import asyncio
+import csv
+import json
+import os
+import time
+from dotenv import load_dotenv
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.cache import avatar_cache
+from app.models.aluno import Aluno
+from app.models.aluno_turma import aluno_turma
+from app.models.turma import Turma
+from app.ranking import ranking_cache
+from app.schemas.aluno import AlunoImport
+from app.security import FilaCheia, hash_passwords_async
+
+load_dotenv()
+
+# Importação de alunos em lote (POST /alunos:import).
+# O corpo é lido em streaming, linha a linha; as linhas válidas são
+# acumuladas em lotes de IMPORT_CHUNK_SIZE, e cada lote custa três
+# consultas de unicidade/existência, um hash paralelo das senhas e dois
+# INSERTs executemany (alunos e matrículas em turma), com commit próprio.
+#
+# Se a fila do bcrypt estiver cheia, o lote espera até IMPORT_QUEUE_WAIT
+# segundos por vaga; passado o prazo, as linhas do lote voltam como erro
+# e a importação segue com os próximos lotes (os anteriores já foram
+# gravados).
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "500"))
+IMPORT_QUEUE_WAIT = float(os.getenv("IMPORT_QUEUE_WAIT", "10"))
+
+# Intervalo (s) entre tentativas enquanto a fila do bcrypt está cheia
+ESPERA_FILA = 0.25
+
+async def _linhas(stream):
+    buffer = b""
+    async for parte in stream:
+        buffer += parte
+        *completas, buffer = buffer.split(b"\n")
+        for linha in completas:
+            yield linha
+    if buffer:
+        yield buffer
+
+async def registros(stream, formato: str):
+    """
+    Gera (número da linha, dict) para cada registro do corpo, ou
+    (número da linha, mensagem) quando a linha não pôde ser lida.
+    CSV: a primeira linha é o cabeçalho; aceita "," ou ";" como
+    separador. NDJSON: um objeto JSON por linha.
+    """
+    cabecalho = None
+    delimitador = ","
+    numero = 0
+    async for bruta in _linhas(stream):
+        numero += 1
+        try:
+            texto = bruta.decode("utf-8-sig" if numero == 1 else "utf-8").rstrip("\r")
+        except UnicodeDecodeError:
+            yield numero, "Linha com codificação inválida (use UTF-8)"
+            continue
+        if not texto.strip():
+            continue
+
+        if formato == "ndjson":
+            try:
+                dado = json.loads(texto)
+            except ValueError as e:
+                yield numero, f"JSON inválido: {e}"
+                continue
+            if not isinstance(dado, dict):
+                yield numero, "Cada linha deve ser um objeto JSON"
+                continue
+            yield numero, dado
+            continue
+
+        if cabecalho is None:
+            if ";" in texto and "," not in texto:
+                delimitador = ";"
+            cabecalho = [c.strip() for c in next(csv.reader([texto], delimiter=delimitador))]
+            continue
+
+        valores = next(csv.reader([texto], delimiter=delimitador))
+        if len(valores) != len(cabecalho):
+            yield numero, f"Esperadas {len(cabecalho)} colunas, encontradas {len(valores)}"
+            continue
+        # Células vazias ficam de fora: campos opcionais assumem o padrão
+        yield numero, {c: v.strip() for c, v in zip(cabecalho, valores) if v.strip()}
+
+def _erro_validacao(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in erro['loc'])}: {erro['msg']}" for erro in e.errors()
+    )
+
+def _resultado(numero, matricula, status, detail=None):
+    return {"linha": numero, "matricula": matricula, "status": status, "detail": detail}
+
+async def _hash_senhas(validos):
+    """
+    Hashes das senhas do lote, esperando vaga na fila do bcrypt por até
+    IMPORT_QUEUE_WAIT segundos. None se a fila continuar cheia.
+    """
+    prazo = time.monotonic() + IMPORT_QUEUE_WAIT
+    while True:
+        try:
+            return await hash_passwords_async(aluno.senha for _, aluno in validos)
+        except FilaCheia:
+            if time.monotonic() >= prazo:
+                return None
+            await asyncio.sleep(ESPERA_FILA)
+
+async def _processar_lote(db: AsyncSession, lote, resultados):
+    matriculas = {a.matricula for _, a in lote}
+    nicknames = {a.nickname for _, a in lote}
+    turma_ids = {a.turma_id for _, a in lote if a.turma_id is not None}
+
+    # Unicidade e existência verificadas para o lote inteiro de uma vez
+    matriculas_existentes = set(await db.scalars(
+        select(Aluno.matricula).where(Aluno.matricula.in_(matriculas))
+    ))
+    nicknames_existentes = set(await db.scalars(
+        select(Aluno.nickname).where(Aluno.nickname.in_(nicknames))
+    ))
+    turmas_existentes = set(await db.scalars(
+        select(Turma.id).where(Turma.id.in_(turma_ids))
+    )) if turma_ids else set()
+    avatares = await avatar_cache.acarregar(db, {aluno.avatar_id_fk for _, aluno in lote})
+
+    validos = []
+    for numero, aluno in lote:
+        if aluno.matricula in matriculas_existentes:
+            resultados.append(_resultado(numero, aluno.matricula, "erro", "Matricula já registrada"))
+        elif aluno.nickname in nicknames_existentes:
+            resultados.append(_resultado(numero, aluno.matricula, "erro", "Nickname já está em uso"))
+        elif avatares.get(aluno.avatar_id_fk) is None:
+            resultados.append(_resultado(numero, aluno.matricula, "erro", "Avatar não encontrado"))
+        elif aluno.turma_id is not None and aluno.turma_id not in turmas_existentes:
+            resultados.append(_resultado(numero, aluno.matricula, "erro", "Turma não encontrada"))
+        else:
+            validos.append((numero, aluno))
+    if not validos:
+        return
+
+    hashes = await _hash_senhas(validos)
+    if hashes is None:
+        for numero, aluno in validos:
+            resultados.append(_resultado(
+                numero, aluno.matricula, "erro",
+                "Servidor ocupado; nenhum aluno do lote foi criado. Reenvie esta linha."
+            ))
+        return
+
+    try:
+        await db.execute(insert(Aluno), [
+            {
+                "matricula": aluno.matricula,
+                "nome": aluno.nome,
+                "nickname": aluno.nickname,
+                "senha": senha,
+                "xp": 0,
+                "nivel": 1,
+                "avatar_id_fk": aluno.avatar_id_fk,
+            }
+            for (_, aluno), senha in zip(validos, hashes)
+        ])
+        matriculas_turma = [
+            {"aluno_matricula_fk": aluno.matricula, "turma_id_fk": aluno.turma_id}
+            for _, aluno in validos if aluno.turma_id is not None
+        ]
+        if matriculas_turma:
+            await db.execute(insert(aluno_turma), matriculas_turma)
+        await db.commit()
+    except SQLAlchemyError as e:
+        # Ex.: matrícula criada por outra requisição depois da verificação
+        await db.rollback()
+        print(f"Erro no banco de dados ao importar lote de alunos: {e}")
+        for numero, aluno in validos:
+            resultados.append(_resultado(
+                numero, aluno.matricula, "erro",
+                "Erro no banco de dados ao inserir o lote; nenhum aluno do lote foi criado."
+            ))
+        return
+
+    ranking_cache.invalidate()
+    for numero, aluno in validos:
+        resultados.append(_resultado(numero, aluno.matricula, "criado"))
+
+async def importar_alunos(db: AsyncSession, stream, formato: str, turma_id=None, tamanho_lote: int = IMPORT_CHUNK_SIZE):
+    """
+    Importa alunos do corpo da requisição. Erros de uma linha (formato,
+    duplicidade, avatar/turma inexistentes) não interrompem as demais.
+    """
+    resultados = []
+    lote = []
+    matriculas_vistas = set()
+    nicknames_vistos = set()
+
+    async for numero, dado in registros(stream, formato):
+        if isinstance(dado, str):
+            resultados.append(_resultado(numero, None, "erro", dado))
+            continue
+        if turma_id is not None:
+            dado.setdefault("turma_id", turma_id)
+        try:
+            aluno = AlunoImport.model_validate(dado)
+        except ValidationError as e:
+            resultados.append(_resultado(numero, dado.get("matricula"), "erro", _erro_validacao(e)))
+            continue
+
+        # Duplicados dentro do próprio arquivo
+        if aluno.matricula in matriculas_vistas:
+            resultados.append(_resultado(numero, aluno.matricula, "erro", "Matricula repetida no arquivo"))
+            continue
+        if aluno.nickname in nicknames_vistos:
+            resultados.append(_resultado(numero, aluno.matricula, "erro", "Nickname repetido no arquivo"))
+            continue
+        matriculas_vistas.add(aluno.matricula)
+        nicknames_vistos.add(aluno.nickname)
+
+        lote.append((numero, aluno))
+        if len(lote) >= tamanho_lote:
+            await _processar_lote(db, lote, resultados)
+            lote = []
+
+    if lote:
+        await _processar_lote(db, lote, resultados)
+
+    resultados.sort(key=lambda r: r["linha"])
+    criados = sum(1 for r in resultados if r["status"] == "criado")
+    return {
+        "total": len(resultados),
+        "criados": criados,
+        "erros": len(resultados) - criados,
+        "resultados": resultados,
+    }
@@ -0,0 +1,40 @@
+from sqlalchemy.orm import joinedload, selectinload
+from app.models.aluno import Aluno
+from app.models.aluno_badge import AlunoBadge
+from app.models.atividade import Atividade
+from app.models.turma import Turma
+
+# Estratégias de carregamento por endpoint.
+# Cada schema de resposta percorre relacionamentos aninhados
+# (Atividade -> Turma -> Aluno -> Badge); sem carregá-los de antemão
+# o Pydantic dispara um SELECT preguiçoso por objeto (N+1).
+# Relações muitos-para-um usam joinedload; coleções usam selectinload,
+# que resolve cada nível com um único SELECT ... WHERE id IN (...).
+
+ALUNO_PERFIL = (
+    joinedload(Aluno.avatar),
+    selectinload(Aluno.badges_associados).joinedload(AlunoBadge.badge),
+)
+
+TURMA_COMPLETA = (
+    joinedload(Turma.professor),
+    selectinload(Turma.alunos).options(*ALUNO_PERFIL),
+)
+
+ATIVIDADE_COMPLETA = (
+    joinedload(Atividade.badge),
+    selectinload(Atividade.turma).options(*TURMA_COMPLETA),
+)
+
+LOADER_STRATEGIES = {
+    "atividades.detail": ATIVIDADE_COMPLETA,
+    "turmas.detail": TURMA_COMPLETA,
+    "alunos.detail": ALUNO_PERFIL,
+    "alunos.turmas": TURMA_COMPLETA,
+}
+
+def loader_options(endpoint: str):
+    """
+    Retorna as opções de carregamento registradas para o endpoint.
+    """
+    return LOADER_STRATEGIES[endpoint]
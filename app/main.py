@@ -1,9 +1,20 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import aluno, atividade, avatar, badge, login, professor, turma
-from fastapi.staticfiles import StaticFiles
+from app.routers import aluno, atividade, avatar, badge, internal, login, metrics, professor, ranking, turma
+from app.static_files import AssetStaticFiles
+from app.security import password_service
+from app.database import async_engine, engine
+from app.observability import RequestTimingMiddleware, instrumentar
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    password_service.shutdown()
+
+# orjson serializa o corpo das respostas bem mais rápido que o json da stdlib
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 origins = [
     "http://localhost:9000",
@@ -16,18 +27,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"], 
+    expose_headers=["Server-Timing"],
 )
 
+# Contagem e tempo das consultas SQL por requisição (Server-Timing, log e /metrics)
+instrumentar(engine)
+instrumentar(async_engine.sync_engine)
+app.add_middleware(RequestTimingMiddleware)
+
 app.include_router(aluno.router)
 app.include_router(atividade.router)
 app.include_router(avatar.router)
 app.include_router(badge.router)
 app.include_router(professor.router)
 app.include_router(turma.router)
+app.include_router(ranking.router)
 app.include_router(login.router)
+app.include_router(internal.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 def root():
     return {"message": "API rodando com FastAPI 🚀"}
 
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+app.mount("/static", AssetStaticFiles(directory="app/static"), name="static")
@@ -0,0 +1,219 @@
+from bisect import bisect_left
+from dotenv import load_dotenv
+from app import database
+from app.cache import avatar_cache, badge_cache
+from app.ranking import ranking_cache
+from app.security import password_service, token_cache
+import os
+import threading
+
+load_dotenv()
+
+# Métricas em memória expostas em GET /metrics no formato texto do
+# Prometheus. Os contadores são por processo: com vários workers do
+# uvicorn, cada scrape enxerga só o worker que atendeu (agregue no
+# Prometheus por instância/pid).
+
+# Limites (segundos) dos buckets do histograma de latência
+METRICS_LATENCY_BUCKETS = tuple(sorted(
+    float(b) for b in os.getenv(
+        "METRICS_LATENCY_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10"
+    ).split(",") if b.strip()
+))
+
+PREFIXO = "xplearn"
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(nomes, valores) -> str:
+    if not nomes:
+        return ""
+    return "{" + ",".join(f'{n}="{_escapar(v)}"' for n, v in zip(nomes, valores)) + "}"
+
+def _numero(valor) -> str:
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+class Metricas:
+    """
+    Texto de exposição do Prometheus (um bloco HELP/TYPE por métrica).
+    """
+
+    def __init__(self):
+        self.linhas = []
+
+    def familia(self, nome: str, tipo: str, ajuda: str):
+        self.linhas.append(f"# HELP {PREFIXO}_{nome} {ajuda}")
+        self.linhas.append(f"# TYPE {PREFIXO}_{nome} {tipo}")
+
+    def amostra(self, nome: str, valor, nomes=(), valores=()):
+        self.linhas.append(f"{PREFIXO}_{nome}{_labels(nomes, valores)} {_numero(valor)}")
+
+    def texto(self) -> str:
+        return "\n".join(self.linhas) + "\n"
+
+class RequestMetrics:
+    """
+    Latência e volume das requisições HTTP por método, router e rota
+    (template do caminho, ex.: /turmas/{id}, nunca o caminho concreto).
+
+    Cada observação custa uma busca binária no bucket e alguns
+    incrementos sob um lock; a exposição monta o texto só no scrape.
+    """
+    LABELS = ("method", "router", "route")
+
+    def __init__(self, buckets=METRICS_LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.in_flight = 0
+        # (method, router, route) -> [contagem por bucket..., +Inf], soma, total
+        self._latencia = {}
+        # (method, router, route, status) -> total
+        self._respostas = {}
+        # (method, router, route) -> [consultas, segundos no banco]
+        self._banco = {}
+        self._lock = threading.Lock()
+
+    def iniciar(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def registrar(self, method: str, router: str, route: str, status: int,
+                  duracao_s: float, consultas: int, db_s: float):
+        chave = (method, router, route)
+        indice = bisect_left(self.buckets, duracao_s)
+        with self._lock:
+            self.in_flight -= 1
+            serie = self._latencia.get(chave)
+            if serie is None:
+                serie = self._latencia[chave] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            serie[0][indice] += 1
+            serie[1] += duracao_s
+            serie[2] += 1
+
+            chave_status = chave + (str(status),)
+            self._respostas[chave_status] = self._respostas.get(chave_status, 0) + 1
+
+            banco = self._banco.get(chave)
+            if banco is None:
+                banco = self._banco[chave] = [0, 0.0]
+            banco[0] += consultas
+            banco[1] += db_s
+
+    def exportar(self, m: Metricas):
+        with self._lock:
+            in_flight = self.in_flight
+            latencia = {k: ([*v[0]], v[1], v[2]) for k, v in self._latencia.items()}
+            respostas = dict(self._respostas)
+            banco = {k: tuple(v) for k, v in self._banco.items()}
+
+        m.familia("http_requests_in_flight", "gauge", "Requisições HTTP em andamento.")
+        m.amostra("http_requests_in_flight", in_flight)
+
+        m.familia("http_requests_total", "counter", "Requisições HTTP atendidas.")
+        for chave, total in sorted(respostas.items()):
+            m.amostra("http_requests_total", total, self.LABELS + ("status",), chave)
+
+        m.familia("http_request_duration_seconds", "histogram",
+                  "Latência das requisições HTTP até o fim do corpo da resposta.")
+        nomes_bucket = self.LABELS + ("le",)
+        for chave, (contagens, soma, total) in sorted(latencia.items()):
+            acumulado = 0
+            for limite, contagem in zip(self.buckets + (float("inf"),), contagens):
+                acumulado += contagem
+                m.amostra("http_request_duration_seconds_bucket", acumulado,
+                          nomes_bucket, chave + (_numero(limite),))
+            m.amostra("http_request_duration_seconds_sum", soma, self.LABELS, chave)
+            m.amostra("http_request_duration_seconds_count", total, self.LABELS, chave)
+
+        m.familia("http_request_db_queries_total", "counter", "Consultas SQL executadas pelas requisições.")
+        for chave, (consultas, _) in sorted(banco.items()):
+            m.amostra("http_request_db_queries_total", consultas, self.LABELS, chave)
+        m.familia("http_request_db_seconds_total", "counter", "Tempo das requisições gasto em consultas SQL.")
+        for chave, (_, segundos) in sorted(banco.items()):
+            m.amostra("http_request_db_seconds_total", segundos, self.LABELS, chave)
+
+request_metrics = RequestMetrics()
+
+def route_labels(scope) -> tuple:
+    """
+    (router, rota) de uma requisição já roteada. O router é o módulo em
+    app/routers (aluno, atividade, login...); rotas de app/main.py ficam
+    como "main" e os mounts (/static) usam o nome do mount.
+    """
+    route = scope.get("route")
+    if route is None:
+        # 404 sem rota: um único rótulo, para não criar uma série por URL
+        return "none", "unmatched"
+    endpoint = scope.get("endpoint")
+    modulo = getattr(endpoint, "__module__", "") if endpoint is not None else ""
+    if modulo.startswith("app.routers."):
+        router = modulo.rsplit(".", 1)[1]
+    elif modulo:
+        router = modulo.rsplit(".", 1)[-1]
+    else:
+        router = getattr(route, "name", None) or "none"
+    return router, getattr(route, "path", "") or "unmatched"
+
+def _pool(m: Metricas):
+    pools = {
+        "sync": database.pool_status(database.engine.pool),
+        "async": database.pool_status(database.async_engine.sync_engine.pool),
+    }
+    gauges = (
+        ("db_pool_size", "size", "Conexões permanentes do pool."),
+        ("db_pool_checked_out", "checked_out", "Conexões em uso."),
+        ("db_pool_checked_in", "checked_in", "Conexões ociosas no pool."),
+        ("db_pool_overflow", "overflow", "Conexões de overflow abertas (negativo: pool ainda não cheio)."),
+    )
+    for nome, campo, ajuda in gauges:
+        m.familia(nome, "gauge", ajuda)
+        for pool, status in pools.items():
+            if campo in status:
+                m.amostra(nome, status[campo], ("pool",), (pool,))
+
+    contadores = (
+        ("db_pool_checkouts_total", "checkouts", 1, "Conexões retiradas do pool."),
+        ("db_pool_timeouts_total", "timeouts", 1, "Esperas por conexão que estouraram o pool_timeout."),
+        ("db_pool_wait_seconds_total", "wait_total_ms", 0.001, "Tempo total esperando conexão do pool."),
+    )
+    for nome, campo, escala, ajuda in contadores:
+        m.familia(nome, "counter", ajuda)
+        for pool, status in pools.items():
+            if campo in status:
+                m.amostra(nome, status[campo] * escala, ("pool",), (pool,))
+
+def _bcrypt(m: Metricas):
+    m.familia("bcrypt_pending", "gauge", "Hashes/verificações bcrypt na fila ou em execução.")
+    m.amostra("bcrypt_pending", password_service.pending)
+    m.familia("bcrypt_max_pending", "gauge", "Limite da fila do bcrypt (acima dele responde 503).")
+    m.amostra("bcrypt_max_pending", password_service.max_pending)
+    m.familia("bcrypt_workers", "gauge", "Processos do pool do bcrypt (0 = no próprio processo).")
+    m.amostra("bcrypt_workers", password_service.workers)
+    m.familia("bcrypt_rejected_total", "counter", "Chamadas recusadas com 503 por fila cheia.")
+    m.amostra("bcrypt_rejected_total", password_service.rejected)
+
+def _caches(m: Metricas):
+    caches = {
+        "badges": badge_cache.stats(),
+        "avatares": avatar_cache.stats(),
+        "token": token_cache.stats(),
+        "ranking": ranking_cache.stats(),
+    }
+    for nome, campo, tipo, ajuda in (
+        ("cache_hits_total", "hits", "counter", "Leituras atendidas pelo cache."),
+        ("cache_misses_total", "misses", "counter", "Leituras que precisaram ir ao banco/decodificar."),
+        ("cache_hit_ratio", "hit_ratio", "gauge", "hits / (hits + misses) desde o início do processo."),
+    ):
+        m.familia(nome, tipo, ajuda)
+        for cache, stats in caches.items():
+            m.amostra(nome, stats[campo], ("cache",), (cache,))
+
+def render() -> str:
+    m = Metricas()
+    request_metrics.exportar(m)
+    _pool(m)
+    _bcrypt(m)
+    _caches(m)
+    return m.texto()
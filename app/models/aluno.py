@@ -1,13 +1,16 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 from app.database import Base
 from .aluno_turma import aluno_turma
 
 class Aluno(Base):
     __tablename__ = "Aluno"
+    __table_args__ = (
+        Index("idx_aluno_nickname", "nickname", unique=True),
+    )
     
     matricula = Column(String, primary_key=True, index=True)
-    nickname = Column(String, unique=True, nullable=True)
+    nickname = Column(String, nullable=True)
     nome = Column(String, nullable=False)
     senha = Column(String, nullable=True)
     xp = Column(Integer, nullable=True)
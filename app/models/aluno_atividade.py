@@ -1,14 +1,19 @@
 from app.database import Base
 from sqlalchemy.orm import relationship
 
-from sqlalchemy import Column, Date, ForeignKey, Integer, String
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, Numeric, String
 
 class AlunoAtividade(Base):
     __tablename__ = "Aluno_Atividade"
+    __table_args__ = (
+        # A PK começa pelo aluno; este índice atende "quem fez a atividade X"
+        Index("idx_alunoatividade_atividade", "atividade_id_fk", "aluno_matricula_fk"),
+    )
 
     aluno_matricula_fk = Column("aluno_matricula_fk", String, ForeignKey("Aluno.matricula"), primary_key=True)
     atividade_id_fk = Column("atividade_id_fk", Integer, ForeignKey("Atividade.id"), primary_key=True)
-    nota = Column("nota", String, nullable=False)
+    # DECIMAL(5, 2), como no XPLearn_BD_create.txt (migração 0003)
+    nota = Column("nota", Numeric(5, 2))
 
     aluno = relationship("Aluno", back_populates="atividades_associadas")
     atividade = relationship("Atividade", back_populates="alunos_associados")
\ No newline at end of file
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, DateTime, Integer, Numeric, String, ForeignKey
+from sqlalchemy import Column, DateTime, Index, Integer, Numeric, String, ForeignKey
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Atividade(Base):
     __tablename__ = "Atividade"
+    __table_args__ = (
+        # Atividades de uma turma (ou de várias, via IN), já na ordem de entrega
+        Index("idx_atividade_turma_entrega", "turma_id_fk", "data_entrega"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     nome = Column(String, nullable=False)
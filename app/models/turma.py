@@ -1,11 +1,14 @@
 from pyexpat import model
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 from .aluno_turma import aluno_turma
 from app.database import Base
 
 class Turma(Base):
     __tablename__ = "Turma"
+    __table_args__ = (
+        Index("idx_turma_professor", "professor_matricula_fk"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     nome = Column(String, nullable=False)
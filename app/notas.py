@@ -0,0 +1,132 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+from app.models.aluno import Aluno
+from app.models.atividade import Atividade
+from app.models.aluno_atividade import AlunoAtividade
+
+# Notas de Aluno_Atividade são DECIMAL(5, 2). Valores chegam como
+# texto ou número ("7.5", 7.5 ou 7) e são gravados já na escala da
+# coluna, para que a validação contra nota_max veja o mesmo
+# valor que o banco guarda.
+#
+# Com a coluna numérica, médias, distribuições e rankings saem de
+# agregações no próprio banco (uma consulta por relatório).
+
+ESCALA = Decimal("0.01")
+NOTA_MAX_PADRAO = Decimal("10")
+
+# Faixas da distribuição, em % da nota máxima da atividade: [de, ate)
+# (a última inclui os 100%)
+FAIXAS = ((0, 20), (20, 40), (40, 60), (60, 80), (80, 100))
+
+def normalizar(valor) -> Decimal:
+    """
+    Nota na escala da coluna (2 casas). None vale 0.
+    ValueError se não for um número finito.
+    """
+    if valor is None:
+        return Decimal(0).quantize(ESCALA)
+    try:
+        nota = valor if isinstance(valor, Decimal) else Decimal(str(valor).strip())
+        if not nota.is_finite():
+            raise ValueError("Nota inválida")
+        return nota.quantize(ESCALA, rounding=ROUND_HALF_UP)
+    except InvalidOperation:
+        raise ValueError("Nota inválida")
+
+def nota_maxima(atividade) -> Decimal:
+    return Decimal(atividade.nota_max) if atividade.nota_max else NOTA_MAX_PADRAO
+
+def _decimal(valor):
+    # AVG volta DECIMAL no MySQL e float no SQLite
+    return None if valor is None else Decimal(str(valor)).quantize(ESCALA, rounding=ROUND_HALF_UP)
+
+def _percentual():
+    # 100.0: no SQLite notas inteiras são gravadas como INTEGER e a
+    # divisão seria inteira. nota_max vazia ou 0 vale NOTA_MAX_PADRAO,
+    # como em nota_maxima().
+    nota_max = func.coalesce(func.nullif(Atividade.nota_max, 0), NOTA_MAX_PADRAO)
+    return AlunoAtividade.nota * 100.0 / nota_max
+
+def estatisticas_atividades(db: Session, turma_id: int = None, atividade_id: int = None) -> list:
+    """
+    Por atividade: entregas, média, mínima, máxima e quantos alunos em
+    cada faixa de FAIXAS. Um único SELECT ... GROUP BY; atividades sem
+    entregas voltam com zeros.
+    """
+    percentual = _percentual()
+    faixas = [
+        func.sum(case(
+            (percentual >= de if ate == 100 else (percentual >= de) & (percentual < ate), 1),
+            else_=0,
+        ))
+        for de, ate in FAIXAS
+    ]
+    stmt = (
+        select(
+            Atividade.id,
+            Atividade.nome,
+            Atividade.nota_max,
+            func.count(AlunoAtividade.nota),
+            func.avg(AlunoAtividade.nota),
+            func.min(AlunoAtividade.nota),
+            func.max(AlunoAtividade.nota),
+            *faixas,
+        )
+        .select_from(Atividade)
+        .outerjoin(AlunoAtividade, AlunoAtividade.atividade_id_fk == Atividade.id)
+        .group_by(Atividade.id, Atividade.nome, Atividade.nota_max)
+        .order_by(Atividade.id)
+    )
+    if turma_id is not None:
+        stmt = stmt.where(Atividade.turma_id_fk == turma_id)
+    if atividade_id is not None:
+        stmt = stmt.where(Atividade.id == atividade_id)
+
+    return [
+        {
+            "atividade_id": id_,
+            "nome": nome,
+            "nota_max": nota_max,
+            "entregas": entregas,
+            "media": _decimal(media),
+            "minima": _decimal(minima),
+            "maxima": _decimal(maxima),
+            "distribuicao": [
+                {"de": de, "ate": ate, "alunos": int(alunos or 0)}
+                for (de, ate), alunos in zip(FAIXAS, contagens)
+            ],
+        }
+        for id_, nome, nota_max, entregas, media, minima, maxima, *contagens in db.execute(stmt)
+    ]
+
+def ranking_notas(db: Session, turma_id: int, limit: int) -> list:
+    """
+    Alunos da turma com ao menos uma entrega, pela média das notas em %
+    da nota máxima de cada atividade (atividades com escalas diferentes
+    pesam igual). A posição vem de RANK() no banco: médias iguais
+    dividem a posição.
+    """
+    media = func.avg(_percentual()).label("media_percentual")
+    stmt = (
+        select(
+            func.rank().over(order_by=media.desc()).label("posicao"),
+            Aluno.matricula,
+            Aluno.nome,
+            Aluno.nickname,
+            func.count(AlunoAtividade.nota).label("entregas"),
+            media,
+        )
+        .select_from(AlunoAtividade)
+        .join(Atividade, Atividade.id == AlunoAtividade.atividade_id_fk)
+        .join(Aluno, Aluno.matricula == AlunoAtividade.aluno_matricula_fk)
+        .where(Atividade.turma_id_fk == turma_id)
+        .group_by(Aluno.matricula, Aluno.nome, Aluno.nickname)
+        .order_by(media.desc(), Aluno.matricula)
+        .limit(limit)
+    )
+    return [
+        {**row._asdict(), "media_percentual": _decimal(row.media_percentual)}
+        for row in db.execute(stmt)
+    ]
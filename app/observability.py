@@ -0,0 +1,156 @@
+from contextvars import ContextVar
+from dotenv import load_dotenv
+from sqlalchemy import event
+from app.metrics import request_metrics, route_labels
+import json
+import logging
+import os
+import time
+
+load_dotenv()
+
+# Requisições acima deste tempo (ms) são registradas com a consulta mais lenta
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+# Requisições com mais consultas que isso também são registradas (provável N+1)
+QUERY_COUNT_WARN = int(os.getenv("QUERY_COUNT_WARN", "20"))
+# Registra todas as requisições, não só as lentas
+LOG_ALL_REQUESTS = os.getenv("LOG_ALL_REQUESTS", "false").strip().lower() in ("1", "true", "yes", "on")
+# Envia o cabeçalho Server-Timing nas respostas
+SERVER_TIMING = os.getenv("SERVER_TIMING", "true").strip().lower() in ("1", "true", "yes", "on")
+
+# Log das requisições: uma linha JSON por registro, em stderr. Para
+# enviar a outro destino, configure o logger "app.observability".
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+class RequestStats:
+    """
+    Consultas SQL executadas durante uma requisição.
+    """
+    __slots__ = ("queries", "db_ms", "slowest_ms", "slowest_sql")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_sql = None
+
+    def registrar(self, duracao_ms: float, statement: str):
+        self.queries += 1
+        self.db_ms += duracao_ms
+        if duracao_ms > self.slowest_ms:
+            self.slowest_ms = duracao_ms
+            self.slowest_sql = statement
+
+# Estatísticas da requisição corrente. O objeto é compartilhado com as
+# threads do threadpool (rotas síncronas) e com o greenlet do
+# AsyncSession, pois ambos herdam o contexto da requisição.
+_stats: ContextVar = ContextVar("request_stats", default=None)
+
+def current_stats():
+    return _stats.get()
+
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    context._inicio_consulta = time.perf_counter()
+
+def _depois(conn, cursor, statement, parameters, context, executemany):
+    stats = _stats.get()
+    inicio = getattr(context, "_inicio_consulta", None)
+    if stats is not None and inicio is not None:
+        stats.registrar((time.perf_counter() - inicio) * 1000, statement)
+
+def instrumentar(engine):
+    """
+    Liga a contagem/tempo de consultas a um Engine síncrono
+    (para o assíncrono, passe async_engine.sync_engine).
+    """
+    if not event.contains(engine, "before_cursor_execute", _antes):
+        event.listen(engine, "before_cursor_execute", _antes)
+        event.listen(engine, "after_cursor_execute", _depois)
+
+def _route_path(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope.get("path", "")
+
+def _log(scope, status: int, total_ms: float, stats: RequestStats):
+    lenta = total_ms >= SLOW_REQUEST_MS
+    muitas = stats.queries > QUERY_COUNT_WARN
+    if not (LOG_ALL_REQUESTS or lenta or muitas):
+        return
+    registro = {
+        "evento": "request",
+        "method": scope.get("method"),
+        "path": scope.get("path"),
+        "route": _route_path(scope),
+        "status": status,
+        "total_ms": round(total_ms, 2),
+        "db_queries": stats.queries,
+        "db_ms": round(stats.db_ms, 2),
+    }
+    if lenta:
+        registro["slow"] = True
+    if muitas:
+        registro["many_queries"] = True
+    if (lenta or muitas) and stats.slowest_sql:
+        registro["slowest_query_ms"] = round(stats.slowest_ms, 2)
+        registro["slowest_query"] = " ".join(stats.slowest_sql.split())[:500]
+    logger.log(logging.WARNING if lenta or muitas else logging.INFO, json.dumps(registro, ensure_ascii=False))
+
+class RequestTimingMiddleware:
+    """
+    Middleware ASGI que mede cada requisição HTTP: tempo total, número
+    de consultas SQL, tempo no banco e a consulta mais lenta.
+
+    - Cabeçalho Server-Timing (visível no DevTools do navegador):
+      db;dur=<ms>;desc="<n> queries", db-slowest;dur=<ms>, app;dur=<ms>.
+      O tempo é o medido até o envio dos cabeçalhos; em respostas em
+      streaming as consultas do corpo entram só no log.
+    - Log em JSON (uma linha) para requisições lentas (SLOW_REQUEST_MS),
+      com muitas consultas (QUERY_COUNT_WARN) ou todas (LOG_ALL_REQUESTS).
+    - Histograma de latência, contagem por status e consultas por rota,
+      expostos em GET /metrics (app/metrics.py).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _stats.set(stats)
+        request_metrics.iniciar()
+        inicio = time.perf_counter()
+        status = 500
+
+        async def send_com_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if SERVER_TIMING:
+                    total_ms = (time.perf_counter() - inicio) * 1000
+                    valor = (
+                        f'db;dur={stats.db_ms:.2f};desc="{stats.queries} queries", '
+                        f"db-slowest;dur={stats.slowest_ms:.2f}, app;dur={total_ms:.2f}"
+                    )
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [(b"server-timing", valor.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_com_timing)
+        finally:
+            total_s = time.perf_counter() - inicio
+            _stats.reset(token)
+            router, rota = route_labels(scope)
+            request_metrics.registrar(
+                scope.get("method", ""), router, rota, status, total_s, stats.queries, stats.db_ms / 1000
+            )
+            _log(scope, status, total_s * 1000, stats)
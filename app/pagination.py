@@ -0,0 +1,32 @@
+from fastapi import Query
+
+# Paginação por cursor (keyset) sobre a chave primária.
+# Em vez de OFFSET, cada página filtra "chave > último visto", o que
+# mantém o custo constante independentemente da profundidade.
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+def limit_param():
+    return Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT, description="Itens por página")
+
+def keyset(stmt, chave, after, limit: int):
+    """
+    Aplica o filtro do cursor e a ordenação à consulta.
+    Busca um item a mais para saber se existe próxima página.
+    """
+    if after is not None:
+        stmt = stmt.where(chave > after)
+    return stmt.order_by(chave).limit(limit + 1)
+
+def pagina(itens: list, limit: int, chave: str):
+    """
+    Corta o item excedente e devolve (itens, next_cursor).
+    """
+    if len(itens) <= limit:
+        return itens, None
+
+    itens = itens[:limit]
+    ultimo = itens[-1]
+    valor = ultimo[chave] if isinstance(ultimo, dict) else getattr(ultimo, chave)
+    return itens, str(valor)
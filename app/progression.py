@@ -0,0 +1,57 @@
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+from app.models.aluno import Aluno
+from app import ranking
+
+# Progressão de XP/nível feita no próprio banco.
+# Cada alteração é um único UPDATE ... SET xp = xp + :p, então
+# lançamentos concorrentes para o mesmo aluno não se sobrescrevem.
+# A variação também é registrada para o ranking em memória, que a
+# aplica quando a sessão faz commit (app/ranking.py).
+
+XP_POR_NIVEL = 1000
+
+def _nivel(xp):
+    return 1 + xp // XP_POR_NIVEL
+
+def _aplicar(db: Session, matriculas, novo_xp):
+    # nivel vem antes de xp: o MySQL avalia o SET da esquerda para a
+    # direita, então ambos precisam partir do xp antigo.
+    db.execute(
+        update(Aluno).where(Aluno.matricula.in_(matriculas)).ordered_values(
+            (Aluno.nivel, _nivel(novo_xp)),
+            (Aluno.xp, novo_xp),
+        ),
+        execution_options={"synchronize_session": False}
+    )
+
+def conceder_xp(db: Session, matriculas, pontos: int):
+    """
+    Soma pontos ao XP dos alunos e recalcula o nível.
+    """
+    matriculas = list(matriculas)
+    if not matriculas or not pontos:
+        return
+    _aplicar(db, matriculas, func.coalesce(Aluno.xp, 0) + pontos)
+    ranking.registrar(db, matriculas, pontos)
+
+def remover_xp(db: Session, matriculas, pontos: int):
+    """
+    Subtrai pontos do XP dos alunos (mínimo 0) e recalcula o nível.
+    """
+    matriculas = list(matriculas)
+    if not matriculas or not pontos:
+        return
+    xp_atual = func.coalesce(Aluno.xp, 0)
+    # Compara antes de subtrair: xp é INT UNSIGNED no MySQL e xp - p < 0
+    # estouraria o tipo.
+    _aplicar(db, matriculas, case((xp_atual < pontos, 0), else_=xp_atual - pontos))
+    ranking.registrar(db, matriculas, -pontos)
+
+def obter_progresso(db: Session, matricula: str):
+    """
+    Retorna (xp, nivel) atuais do aluno, ou None se não existir.
+    """
+    return db.execute(
+        select(Aluno.xp, Aluno.nivel).where(Aluno.matricula == matricula)
+    ).first()
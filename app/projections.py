@@ -0,0 +1,178 @@
+from typing import Iterable, Optional
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.aluno import Aluno
+from app.models.aluno_badge import AlunoBadge
+from app.models.aluno_turma import aluno_turma
+from app.models.atividade import Atividade
+from app.models.avatar import Avatar
+from app.models.badge import Badge
+from app.models.professor import Professor
+from app.models.turma import Turma
+
+# Projeções "resumo" para os endpoints de listagem.
+# Selecionam apenas colunas (sem instanciar entidades ORM) e montam
+# dicionários simples; relações só são buscadas quando pedidas via
+# ?expand=, com um SELECT por nível de expansão.
+
+ATIVIDADE_COLUNAS = (
+    Atividade.id,
+    Atividade.nome,
+    Atividade.descricao,
+    Atividade.nota_max,
+    Atividade.pontos,
+    Atividade.badge_id_fk,
+    Atividade.turma_id_fk,
+    Atividade.data_entrega,
+)
+
+TURMA_COLUNAS = (
+    Turma.id,
+    Turma.nome,
+    Turma.professor_matricula_fk,
+    Professor.nome.label("professor"),
+)
+
+ALUNO_COLUNAS = (
+    Aluno.matricula,
+    Aluno.nome,
+    Aluno.nickname,
+    Aluno.xp,
+    Aluno.nivel,
+    Aluno.avatar_id_fk,
+)
+
+BADGE_COLUNAS = (Badge.id, Badge.nome, Badge.requisito, Badge.caminho_foto)
+AVATAR_COLUNAS = (Avatar.id, Avatar.nome, Avatar.caminho_foto)
+
+ALUNO_EXPANSOES = ("avatar", "badges")
+TURMA_EXPANSOES = ("alunos",) + tuple(f"alunos.{e}" for e in ALUNO_EXPANSOES)
+ATIVIDADE_EXPANSOES = ("badge", "turma") + tuple(f"turma.{e}" for e in TURMA_EXPANSOES)
+
+def parse_expand(expand: Optional[str], permitidas: Iterable[str]) -> set:
+    """
+    Converte "turma.alunos,badge" no conjunto de caminhos pedidos,
+    incluindo os prefixos implícitos ("turma").
+    """
+    if not expand:
+        return set()
+
+    caminhos = {c.strip() for c in expand.split(",") if c.strip()}
+    invalidas = caminhos - set(permitidas)
+    if invalidas:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Expansão inválida: {', '.join(sorted(invalidas))}"
+        )
+
+    completos = set()
+    for caminho in caminhos:
+        partes = caminho.split(".")
+        for i in range(1, len(partes) + 1):
+            completos.add(".".join(partes[:i]))
+    return completos
+
+def sub_expand(expand: set, prefixo: str) -> set:
+    p = prefixo + "."
+    return {c[len(p):] for c in expand if c.startswith(p)}
+
+def _mapear(db: Session, stmt):
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+def badges_por_id(db: Session, ids) -> dict:
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return {}
+    rows = _mapear(db, select(*BADGE_COLUNAS).where(Badge.id.in_(ids)))
+    return {r["id"]: r for r in rows}
+
+def avatares_por_id(db: Session, ids) -> dict:
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return {}
+    rows = _mapear(db, select(*AVATAR_COLUNAS).where(Avatar.id.in_(ids)))
+    return {r["id"]: r for r in rows}
+
+def badges_por_aluno(db: Session, matriculas) -> dict:
+    matriculas = set(matriculas)
+    if not matriculas:
+        return {}
+    stmt = (
+        select(AlunoBadge.aluno_matricula_fk, *BADGE_COLUNAS)
+        .join(Badge, AlunoBadge.badge_id_fk == Badge.id)
+        .where(AlunoBadge.aluno_matricula_fk.in_(matriculas))
+    )
+    resultado = {}
+    for row in _mapear(db, stmt):
+        matricula = row.pop("aluno_matricula_fk")
+        resultado.setdefault(matricula, []).append(row)
+    return resultado
+
+def expandir_alunos(db: Session, alunos: list, expand: set) -> list:
+    if not alunos:
+        return alunos
+
+    if "avatar" in expand:
+        avatares = avatares_por_id(db, (a["avatar_id_fk"] for a in alunos))
+        for a in alunos:
+            a["avatar"] = avatares.get(a["avatar_id_fk"])
+
+    if "badges" in expand:
+        badges = badges_por_aluno(db, (a["matricula"] for a in alunos))
+        for a in alunos:
+            a["badges"] = badges.get(a["matricula"], [])
+
+    return alunos
+
+def alunos_por_turma(db: Session, turma_ids, expand: set) -> dict:
+    turma_ids = {i for i in turma_ids if i is not None}
+    if not turma_ids:
+        return {}
+    stmt = (
+        select(aluno_turma.c.turma_id_fk, *ALUNO_COLUNAS)
+        .join(aluno_turma, Aluno.matricula == aluno_turma.c.aluno_matricula_fk)
+        .where(aluno_turma.c.turma_id_fk.in_(turma_ids))
+    )
+    rows = expandir_alunos(db, _mapear(db, stmt), expand)
+
+    resultado = {}
+    for row in rows:
+        turma_id = row.pop("turma_id_fk")
+        resultado.setdefault(turma_id, []).append(row)
+    return resultado
+
+def expandir_turmas(db: Session, turmas: list, expand: set) -> list:
+    if turmas and "alunos" in expand:
+        alunos = alunos_por_turma(db, (t["id"] for t in turmas), sub_expand(expand, "alunos"))
+        for t in turmas:
+            t["alunos"] = alunos.get(t["id"], [])
+    return turmas
+
+def turmas_por_id(db: Session, ids, expand: set) -> dict:
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return {}
+    stmt = (
+        select(*TURMA_COLUNAS)
+        .outerjoin(Professor, Turma.professor_matricula_fk == Professor.matricula)
+        .where(Turma.id.in_(ids))
+    )
+    rows = expandir_turmas(db, _mapear(db, stmt), expand)
+    return {r["id"]: r for r in rows}
+
+def expandir_atividades(db: Session, atividades: list, expand: set) -> list:
+    if not atividades:
+        return atividades
+
+    if "badge" in expand:
+        badges = badges_por_id(db, (a["badge_id_fk"] for a in atividades))
+        for a in atividades:
+            a["badge"] = badges.get(a["badge_id_fk"])
+
+    if "turma" in expand:
+        turmas = turmas_por_id(db, (a["turma_id_fk"] for a in atividades), sub_expand(expand, "turma"))
+        for a in atividades:
+            a["turma"] = turmas.get(a["turma_id_fk"])
+
+    return atividades
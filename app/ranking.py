@@ -0,0 +1,236 @@
+from dotenv import load_dotenv
+from sortedcontainers import SortedList
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from app.models.aluno import Aluno
+from app.models.aluno_turma import aluno_turma
+import os
+import threading
+import time
+
+load_dotenv()
+
+# Segundos até reconstruir o ranking a partir do banco. Cada processo
+# (worker do uvicorn) só enxerga os lançamentos feitos por ele mesmo,
+# então o TTL limita a divergência entre processos (0 = nunca expira).
+RANKING_TTL = float(os.getenv("RANKING_TTL", "60"))
+
+# Chave em Session.info onde app/progression.py registra as variações
+# de XP até o commit.
+PENDENTES = "ranking_xp_pendente"
+
+class Leaderboard:
+    """
+    (-xp, matricula) ordenados: maior XP primeiro, empate pela
+    matrícula. SortedList (lista de sublistas ordenadas com índice
+    posicional): atualizar o XP de um aluno (remove + add), posição do
+    aluno e top-k custam O(log n) (top-k: O(log n + k log n)).
+    """
+    __slots__ = ("chaves", "xp")
+
+    def __init__(self):
+        self.chaves = SortedList()
+        self.xp = {}
+
+    def definir(self, matricula: str, xp: int):
+        anterior = self.xp.get(matricula)
+        if anterior is not None:
+            self.chaves.remove((-anterior, matricula))
+        self.xp[matricula] = xp
+        self.chaves.add((-xp, matricula))
+
+    def remover(self, matricula: str):
+        anterior = self.xp.pop(matricula, None)
+        if anterior is not None:
+            self.chaves.remove((-anterior, matricula))
+
+    def _posicao_xp(self, xp: int) -> int:
+        # Empatados dividem a posição (1, 2, 2, 4...)
+        return self.chaves.bisect_left((-xp,)) + 1
+
+    def top(self, k: int):
+        return [
+            (self._posicao_xp(-neg_xp), matricula, -neg_xp)
+            for neg_xp, matricula in self.chaves.islice(0, k)
+        ]
+
+    def posicao(self, matricula: str):
+        xp = self.xp.get(matricula)
+        if xp is None:
+            return None
+        return (self._posicao_xp(xp), matricula, xp)
+
+    def __len__(self):
+        return len(self.chaves)
+
+class RankingSnapshot:
+    """
+    Ranking geral e por turma, mais as turmas de cada aluno (para saber
+    quais rankings uma variação de XP afeta).
+    """
+    __slots__ = ("geral", "turmas", "turmas_do_aluno")
+
+    def __init__(self, alunos, matriculas):
+        self.geral = Leaderboard()
+        self.turmas = {}
+        self.turmas_do_aluno = {}
+        for matricula, xp in alunos:
+            self.geral.definir(matricula, xp or 0)
+        for matricula, turma_id in matriculas:
+            xp = self.geral.xp.get(matricula)
+            if xp is None:
+                continue
+            self.turmas.setdefault(turma_id, Leaderboard()).definir(matricula, xp)
+            self.turmas_do_aluno.setdefault(matricula, []).append(turma_id)
+
+    def aplicar(self, matriculas, delta: int):
+        for matricula in matriculas:
+            xp = self.geral.xp.get(matricula)
+            if xp is None:
+                continue
+            # Mesma regra do app/progression.py: XP nunca fica negativo
+            novo = max(0, xp + delta)
+            self.geral.definir(matricula, novo)
+            for turma_id in self.turmas_do_aluno.get(matricula, ()):
+                self.turmas[turma_id].definir(matricula, novo)
+
+class RankingCache:
+    """
+    Ranking materializado em memória. Carrega alunos e matrículas do
+    banco na primeira consulta e depois é atualizado incrementalmente
+    pelas variações de XP confirmadas (commit). Mudanças estruturais
+    (aluno novo, matrícula em turma) chamam invalidate().
+    """
+
+    def __init__(self, ttl: float = RANKING_TTL):
+        self.ttl = ttl
+        self.version = 0
+        self.loads = 0
+        self.updates = 0
+        self.hits = 0
+        self.misses = 0
+        self._snapshot = None
+        self._carregado_em = 0.0
+        self._lock = threading.Lock()
+
+    def _atual(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        if self.ttl > 0 and time.monotonic() - self._carregado_em >= self.ttl:
+            return None
+        return snapshot
+
+    def carregar(self, db: Session):
+        snapshot = self._atual()
+        with self._lock:
+            if snapshot is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if snapshot is not None:
+            return snapshot
+
+        versao = self.version
+        alunos = db.execute(select(Aluno.matricula, Aluno.xp)).all()
+        matriculas = db.execute(
+            select(aluno_turma.c.aluno_matricula_fk, aluno_turma.c.turma_id_fk)
+        ).all()
+        snapshot = RankingSnapshot(alunos, matriculas)
+        with self._lock:
+            # Não publica uma carga que pode ter perdido uma variação
+            # confirmada enquanto lia o banco
+            if self.version == versao:
+                self._snapshot = snapshot
+                self._carregado_em = time.monotonic()
+            self.loads += 1
+        return snapshot
+
+    def aplicar(self, variacoes):
+        """
+        Aplica variações (matriculas, delta) já confirmadas no banco.
+        """
+        with self._lock:
+            self.version += 1
+            self.updates += 1
+            if self._snapshot is None:
+                return
+            for matriculas, delta in variacoes:
+                self._snapshot.aplicar(matriculas, delta)
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+            self.version += 1
+
+    def consultar(self, db: Session, turma_id, limit: int, matricula=None):
+        """
+        Top `limit` do ranking geral (turma_id=None) ou da turma, e a
+        posição de `matricula`, se informada. Nome, nickname, nível e
+        avatar vêm de uma única consulta por chave primária.
+        """
+        snapshot = self.carregar(db)
+        with self._lock:
+            if turma_id is None:
+                leaderboard = snapshot.geral
+            else:
+                leaderboard = snapshot.turmas.get(turma_id, Leaderboard())
+            entradas = leaderboard.top(limit)
+            posicao = leaderboard.posicao(matricula) if matricula else None
+            total = len(leaderboard)
+
+        ids = {m for _, m, _ in entradas}
+        if posicao:
+            ids.add(posicao[1])
+        dados = {}
+        if ids:
+            rows = db.execute(
+                select(Aluno.matricula, Aluno.nome, Aluno.nickname, Aluno.nivel, Aluno.avatar_id_fk)
+                .where(Aluno.matricula.in_(ids))
+            ).mappings()
+            dados = {row["matricula"]: dict(row) for row in rows}
+
+        def item(entrada):
+            pos, m, xp = entrada
+            return {**dados.get(m, {"matricula": m}), "posicao": pos, "xp": xp}
+
+        return {
+            "turma_id": turma_id,
+            "total": total,
+            "data": [item(e) for e in entradas],
+            "aluno": item(posicao) if posicao else None,
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = self._snapshot
+            total = self.hits + self.misses
+            return {
+                "alunos": len(snapshot.geral) if snapshot is not None else 0,
+                "turmas": len(snapshot.turmas) if snapshot is not None else 0,
+                "version": self.version,
+                "loads": self.loads,
+                "updates": self.updates,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "ttl_s": self.ttl,
+            }
+
+ranking_cache = RankingCache()
+
+def registrar(db: Session, matriculas, delta: int):
+    """
+    Guarda uma variação de XP na sessão; só entra no ranking após o commit.
+    """
+    db.info.setdefault(PENDENTES, []).append((list(matriculas), delta))
+
+@event.listens_for(Session, "after_commit")
+def _aplicar_pendentes(session):
+    variacoes = session.info.pop(PENDENTES, None)
+    if variacoes:
+        ranking_cache.aplicar(variacoes)
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_pendentes(session):
+    session.info.pop(PENDENTES, None)
@@ -1,5 +1,7 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from app import database
@@ -9,12 +11,17 @@ from app.models.avatar import Avatar
 from sqlalchemy.orm import joinedload
 from app.models.aluno_badge import AlunoBadge
 from app.models.turma import Turma
+from app.models.professor import Professor
 from app.schemas import turma as turma_schemas
 from app.models.atividade import Atividade
 from app.models.aluno_atividade import AlunoAtividade
 from app.models.aluno_turma import aluno_turma
 from app.schemas import atividade as atividade_schemas
-from datetime import timedelta
+from app.loaders import loader_options
+from app.cache import avatar_cache, badge_cache
+from app.ranking import ranking_cache
+from app import etag, importacao, projections, pagination, serialization
+from datetime import date, datetime, time, timedelta
 from app.security import hash_password, verify_password, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 
 router = APIRouter(prefix="/alunos", tags=["Alunos"])
@@ -29,7 +36,7 @@ def create_user(aluno: schemas.AlunoCreate, db: Session = Depends(database.get_d
         
         avatar = None
         if aluno.avatar_id_fk:
-            avatar = db.query(Avatar).filter(Avatar.id == aluno.avatar_id_fk).first()
+            avatar = avatar_cache.get(db, aluno.avatar_id_fk)
             if not avatar:
                 raise HTTPException(status_code=404, detail="Avatar não encontrado")
             
@@ -52,6 +59,7 @@ def create_user(aluno: schemas.AlunoCreate, db: Session = Depends(database.get_d
         db.add(new_aluno)
         db.commit()
         db.refresh(new_aluno)
+        ranking_cache.invalidate()
         
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
@@ -81,21 +89,77 @@ def create_user(aluno: schemas.AlunoCreate, db: Session = Depends(database.get_d
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Erro interno do servidor ao criar aluno."
         )
+
+@router.post(
+    ":import",
+    response_model=schemas.ImportacaoAlunosResponse,
+    openapi_extra={"requestBody": {"required": True, "content": {
+        "text/csv": {"schema": {"type": "string"}},
+        "application/x-ndjson": {"schema": {"type": "string"}},
+    }}},
+)
+async def importar_alunos(
+    request: Request,
+    turma_id: Optional[int] = None,
+    db: AsyncSession = Depends(database.get_async_db)
+):
+    """
+    Cadastra vários alunos de uma vez, lendo o corpo em streaming.
+
+    - text/csv: cabeçalho com matricula, nome, nickname, senha,
+      avatar_id_fk e, opcionalmente, turma_id (separador "," ou ";").
+    - application/x-ndjson: um objeto JSON por linha com os mesmos campos.
+
+    ?turma_id= matricula na turma todos os alunos que não informarem outra.
+    Cada linha recebe seu status ("criado" ou "erro"); erros não
+    interrompem a importação.
+    """
+    try:
+        if turma_id is not None and not await db.scalar(select(Turma.id).where(Turma.id == turma_id)):
+            raise HTTPException(status_code=404, detail="Turma não encontrada")
+
+        tipo = request.headers.get("content-type", "")
+        formato = "ndjson" if "json" in tipo else "csv"
+        return await importacao.importar_alunos(db, request.stream(), formato, turma_id)
+    except HTTPException as e:
+        raise e
+    except SQLAlchemyError as e:
+        await db.rollback()
+        print(f"Erro no banco de dados ao importar alunos: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro no banco de dados ao importar alunos."
+        )
+    except Exception as e:
+        await db.rollback()
+        print(f"Erro inesperado ao importar alunos: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor ao importar alunos."
+        )
     
-@router.get("/", response_model=schemas.AlunoResponseList)
+@router.get("/", response_model=schemas.AlunoResumoList)
 def get_alunos(
     turma_id: Optional[int] = None, 
+    expand: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: int = pagination.limit_param(),
     db: Session = Depends(database.get_db)
 ):
+    # Ex.: ?expand=avatar,badges
+    expand_set = projections.parse_expand(expand, projections.ALUNO_EXPANSOES)
     try:
-        query = db.query(Aluno)
+        stmt = select(*projections.ALUNO_COLUNAS)
 
         if turma_id:
-            query = query.join(aluno_turma).filter(aluno_turma.c.turma_id_fk == turma_id)
+            stmt = stmt.join(aluno_turma).where(aluno_turma.c.turma_id_fk == turma_id)
 
-        alunos = query.all()
+        stmt = pagination.keyset(stmt, Aluno.matricula, after, limit)
+        alunos = [dict(row) for row in db.execute(stmt).mappings()]
+        alunos, next_cursor = pagination.pagina(alunos, limit, "matricula")
+        projections.expandir_alunos(db, alunos, expand_set)
         
-        return {"data": alunos}
+        return serialization.resposta(schemas.AlunoResumoList, {"data": alunos, "next_cursor": next_cursor})
 
     except SQLAlchemyError as e:
         print(f"Erro no banco de dados ao listar alunos: {e}")
@@ -111,14 +175,19 @@ def get_alunos(
         )
 
 @router.get("/{matricula}", response_model=schemas.AlunoResponseSingle)
-def get_aluno_by_id(matricula: str, db: Session = Depends(database.get_db)):
+async def get_aluno_by_id(matricula: str, request: Request, db: AsyncSession = Depends(database.get_async_db)):
     try:
-        aluno = db.query(Aluno).filter(Aluno.matricula == matricula).first()
+        result = await db.execute(
+            select(Aluno).options(
+                *loader_options("alunos.detail")
+            ).where(Aluno.matricula == matricula)
+        )
+        aluno = result.scalar_one_or_none()
         
         if not aluno:
             raise HTTPException(status_code=404, detail="Aluno não encontrado")
         
-        return {"data": aluno}
+        return etag.json_response(request, schemas.AlunoResponseSingle, {"data": aluno})
     except HTTPException as e:
         raise e
     except SQLAlchemyError as e:
@@ -147,7 +216,7 @@ def update_aluno(
             raise HTTPException(status_code=404, detail="Aluno não encontrado")
         
         if aluno_update.avatar_id_fk is not None:
-            avatar = db.query(Avatar).filter(Avatar.id == aluno_update.avatar_id_fk).first()
+            avatar = avatar_cache.get(db, aluno_update.avatar_id_fk)
             if not avatar:
                 raise HTTPException(status_code=404, detail="Avatar não encontrado")
             aluno.avatar_id_fk = aluno_update.avatar_id_fk
@@ -192,7 +261,9 @@ def update_aluno(
         db.commit()
         db.refresh(aluno)
         
-        aluno_atualizado = db.query(Aluno).filter(Aluno.matricula == matricula).first()
+        aluno_atualizado = db.query(Aluno).options(
+            *loader_options("alunos.detail")
+        ).filter(Aluno.matricula == matricula).first()
         
         if not aluno_atualizado:
             raise HTTPException(status_code=404, detail="Erro ao recarregar aluno após atualização")
@@ -253,48 +324,88 @@ def get_turmas_do_aluno(matricula: str, db: Session = Depends(database.get_db)):
     if not aluno:
         raise HTTPException(status_code=404, detail="Aluno não encontrado")
     
-    return aluno.turmas
-
-@router.get("/{matricula}/atividades")
-def get_atividades_do_aluno(matricula: str, db: Session = Depends(database.get_db)):
-    # 1. Busca turmas do aluno
-    aluno = db.query(Aluno).filter(Aluno.matricula == matricula).first()
-    if not aluno:
-        raise HTTPException(status_code=404, detail="Aluno não encontrado")
-    
-    turmas_ids = [t.id for t in aluno.turmas]
+    turmas = db.query(Turma).options(
+        *loader_options("alunos.turmas")
+    ).join(aluno_turma).filter(aluno_turma.c.aluno_matricula_fk == matricula).all()
     
-    if not turmas_ids:
-        return []
+    return turmas
 
-    atividades = db.query(Atividade).options(
-        joinedload(Atividade.turma),
-        joinedload(Atividade.badge)
-    ).filter(
-        Atividade.turma_id_fk.in_(turmas_ids)
-    ).all()
-    
-    atividades_feitas = db.query(AlunoAtividade).filter(
-        AlunoAtividade.aluno_matricula_fk == matricula
-    ).all()
-    
-    ids_feitas = {af.atividade_id_fk for af in atividades_feitas} 
-    
-    resultado = []
-    for atv in atividades:
-        atv_dict = {
-            "id": atv.id,
-            "nome": atv.nome,
-            "descricao": atv.descricao,
-            "nota_max": atv.nota_max,
-            "pontos": atv.pontos,
-            "data_entrega": atv.data_entrega,
-            "turma_id_fk": atv.turma_id_fk,
-            "badge_id_fk": atv.badge_id_fk,
-            "turma": atv.turma,
-            "badge": atv.badge,
-            "fez_atividade": atv.id in ids_feitas
-        }
-        resultado.append(atv_dict)
-        
-    return resultado
\ No newline at end of file
+@router.get("/{matricula}/atividades", response_model=List[atividade_schemas.AtividadeDoAluno])
+def get_atividades_do_aluno(
+    matricula: str,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    pendentes: bool = False,
+    db: Session = Depends(database.get_db)
+):
+    """
+    Atividades das turmas do aluno, com fez_atividade e nota.
+    Filtros: entrega entre data_inicio e data_fim (inclusive) e
+    ?pendentes=true para só as que o aluno ainda não fez.
+    """
+    try:
+        # Uma consulta: turmas do aluno -> atividades, LEFT JOIN na entrega dele
+        stmt = (
+            select(
+                *projections.ATIVIDADE_COLUNAS,
+                Turma.nome.label("turma_nome"),
+                Turma.professor_matricula_fk,
+                Professor.nome.label("professor"),
+                AlunoAtividade.aluno_matricula_fk.label("entrega"),
+                AlunoAtividade.nota,
+            )
+            .join(aluno_turma, and_(
+                aluno_turma.c.turma_id_fk == Atividade.turma_id_fk,
+                aluno_turma.c.aluno_matricula_fk == matricula
+            ))
+            .join(Turma, Turma.id == Atividade.turma_id_fk)
+            .outerjoin(Professor, Professor.matricula == Turma.professor_matricula_fk)
+            .outerjoin(AlunoAtividade, and_(
+                AlunoAtividade.atividade_id_fk == Atividade.id,
+                AlunoAtividade.aluno_matricula_fk == matricula
+            ))
+            .order_by(Atividade.data_entrega, Atividade.id)
+        )
+        if data_inicio is not None:
+            stmt = stmt.where(Atividade.data_entrega >= datetime.combine(data_inicio, time.min))
+        if data_fim is not None:
+            stmt = stmt.where(Atividade.data_entrega < datetime.combine(data_fim + timedelta(days=1), time.min))
+        if pendentes:
+            stmt = stmt.where(AlunoAtividade.aluno_matricula_fk.is_(None))
+
+        rows = db.execute(stmt).mappings().all()
+
+        # Só consulta o aluno quando não há resultado, para distinguir 404 de lista vazia
+        if not rows and not db.scalar(select(Aluno.matricula).where(Aluno.matricula == matricula)):
+            raise HTTPException(status_code=404, detail="Aluno não encontrado")
+
+        badges = badge_cache.carregar(db, {row["badge_id_fk"] for row in rows})
+        resultado = []
+        for row in rows:
+            atv = dict(row)
+            entrega = atv.pop("entrega")
+            atv["turma"] = {
+                "id": atv["turma_id_fk"],
+                "nome": atv.pop("turma_nome"),
+                "professor_matricula_fk": atv.pop("professor_matricula_fk"),
+                "professor": atv.pop("professor"),
+            }
+            atv["badge"] = badges.get(atv["badge_id_fk"])
+            atv["fez_atividade"] = entrega is not None
+            resultado.append(atv)
+
+        return serialization.resposta(atividade_schemas.AtividadeDoAluno, resultado)
+    except HTTPException as e:
+        raise e
+    except SQLAlchemyError as e:
+        print(f"Erro no banco de dados ao listar atividades do aluno: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro no banco de dados ao buscar atividades do aluno."
+        )
+    except Exception as e:
+        print(f"Erro inesperado ao listar atividades do aluno: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor ao listar atividades do aluno."
+        )
\ No newline at end of file
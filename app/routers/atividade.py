@@ -1,5 +1,8 @@
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, insert, select, true, union, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from app import database
 from app.schemas import atividade as schemas
@@ -8,9 +11,15 @@ from app.models.badge import Badge
 from app.models.turma import Turma
 from app.models.aluno_atividade import AlunoAtividade
 from app.models.aluno import Aluno
+from app.models.avatar import Avatar
 from app.models.aluno_turma import aluno_turma
 from app.models.aluno_badge import AlunoBadge
 from app.schemas import aluno_atividade as aluno_atividade_schemas
+from app.schemas import notas as notas_schemas
+from app.loaders import loader_options
+from app import projections, pagination, serialization
+from app.cache import badge_cache
+from app import notas, progression
 from datetime import datetime
 import traceback
 
@@ -26,7 +35,7 @@ def create_atv(
     try:
         badge = None
         if atv.badge_id_fk:
-            badge = db.query(Badge).filter(Badge.id == atv.badge_id_fk).first()
+            badge = badge_cache.get(db, atv.badge_id_fk)
             if not badge:
                 raise HTTPException(status_code=404, detail="Badge não encontrada")
 
@@ -36,7 +45,7 @@ def create_atv(
             if not turma:
                 raise HTTPException(status_code=404, detail="Turma não encontrada")
 
-        badge_id = badge.id if badge else None
+        badge_id = badge["id"] if badge else None
         turma_id = turma.id if turma else None
     
         new_atv = Atividade(
@@ -55,8 +64,7 @@ def create_atv(
         
         # Recarrega com relacionamentos
         created_atv = db.query(Atividade).options(
-            joinedload(Atividade.badge),
-            joinedload(Atividade.turma)
+            *loader_options("atividades.detail")
         ).filter(Atividade.id == new_atv.id).first()
     
         return {"data": created_atv}
@@ -78,15 +86,21 @@ def create_atv(
             detail=f"Erro interno do servidor ao criar atividade."
         )
     
-@router.get("/", response_model=schemas.AtividadeResponse)
-def get_atvs(db: Session = Depends(database.get_db)):
+@router.get("/", response_model=schemas.AtividadeResumoList)
+def get_atvs(
+    expand: Optional[str] = None,
+    after: Optional[int] = None,
+    limit: int = pagination.limit_param(),
+    db: Session = Depends(database.get_db)
+):
+    # Ex.: ?expand=badge,turma.alunos.badges
+    expand_set = projections.parse_expand(expand, projections.ATIVIDADE_EXPANSOES)
     try:
-        # Carrega os relacionamentos de badge e turma
-        atvs = db.query(Atividade).options(
-            joinedload(Atividade.badge),
-            joinedload(Atividade.turma)
-        ).all()
-        return {"data": atvs}
+        stmt = pagination.keyset(select(*projections.ATIVIDADE_COLUNAS), Atividade.id, after, limit)
+        atvs = [dict(row) for row in db.execute(stmt).mappings()]
+        atvs, next_cursor = pagination.pagina(atvs, limit, "id")
+        projections.expandir_atividades(db, atvs, expand_set)
+        return serialization.resposta(schemas.AtividadeResumoList, {"data": atvs, "next_cursor": next_cursor})
     except SQLAlchemyError as e:
         db.rollback()
         print(f"Erro no banco de dados ao listar atividades: {e}")
@@ -103,12 +117,14 @@ def get_atvs(db: Session = Depends(database.get_db)):
         )
 
 @router.get("/{id}", response_model=schemas.AtividadeResponseSingle)
-def get_atv_by_id(id: int, db: Session = Depends(database.get_db)):
+async def get_atv_by_id(id: int, db: AsyncSession = Depends(database.get_async_db)):
     try:
-        atv = db.query(Atividade).options(
-            joinedload(Atividade.badge),
-            joinedload(Atividade.turma)
-        ).filter(Atividade.id == id).first()
+        result = await db.execute(
+            select(Atividade).options(
+                *loader_options("atividades.detail")
+            ).where(Atividade.id == id)
+        )
+        atv = result.scalar_one_or_none()
     
         if not atv:
             raise HTTPException(status_code=404, detail="Atividade não encontrada")
@@ -117,14 +133,14 @@ def get_atv_by_id(id: int, db: Session = Depends(database.get_db)):
     except HTTPException as e:
         raise e
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         print(f"Erro no banco de dados ao buscar atividade por ID: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro no banco de dados ao buscar atividade."
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Erro inesperado ao buscar atividade por ID: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -151,10 +167,10 @@ def update_atv(
             pass
 
         if atv.badge_id_fk:
-            badge = db.query(Badge).filter(Badge.id == atv.badge_id_fk).first()
+            badge = badge_cache.get(db, atv.badge_id_fk)
             if not badge:
                 raise HTTPException(status_code=404, detail="Badge informada não encontrada")
-            activity.badge_id_fk = badge.id
+            activity.badge_id_fk = badge["id"]
         else:
             pass
 
@@ -168,8 +184,7 @@ def update_atv(
         db.refresh(activity)
 
         updated_atv = db.query(Atividade).options(
-            joinedload(Atividade.badge),
-            joinedload(Atividade.turma)
+            *loader_options("atividades.detail")
         ).filter(Atividade.id == activity.id).first()
 
         return {"data": updated_atv}
@@ -205,8 +220,8 @@ def marcar_aluno_fez_atividade(
             raise HTTPException(status_code=404, detail="Atividade não encontrada")
         
         # Verifica se o aluno existe
-        aluno = db.query(Aluno).filter(Aluno.matricula == matricula).first()
-        if not aluno:
+        aluno_existe = db.scalar(select(Aluno.matricula).where(Aluno.matricula == matricula))
+        if not aluno_existe:
             raise HTTPException(status_code=404, detail="Aluno não encontrado")
         
         # Verifica se o aluno está na turma da atividade
@@ -232,46 +247,36 @@ def marcar_aluno_fez_atividade(
             # Se já existe, APENAS atualiza a nota
             if nota.nota is not None:
                 try:
-                    nota_valor = float(nota.nota)
-                    nota_max = float(atividade.nota_max) if atividade.nota_max else 10.0
-                    
-                    if nota_valor < 0 or nota_valor > nota_max:
-                        raise HTTPException(status_code=400, detail="Nota fora dos limites permitidos")
-                    
-                    existing.nota = str(nota_valor)
-                    db.commit()
-                except (ValueError, TypeError):
+                    nota_valor = notas.normalizar(nota.nota)
+                except ValueError:
                     raise HTTPException(status_code=400, detail="Nota inválida")
+                if nota_valor < 0 or nota_valor > notas.nota_maxima(atividade):
+                    raise HTTPException(status_code=400, detail="Nota fora dos limites permitidos")
+
+                existing.nota = nota_valor
+                db.commit()
             return {"msg": "Nota atualizada. O aluno já possuía o XP e Badge desta atividade."}
         
         # === 1. PROCESSAR NOTA ===
-        nota_valor = 0.0
-        if nota.nota is not None:
-            try:
-                nota_valor = float(nota.nota)
-                nota_max = float(atividade.nota_max) if atividade.nota_max else 10.0
-                if nota_valor < 0 or nota_valor > nota_max:
-                    raise HTTPException(status_code=400, detail="Nota fora dos limites permitidos")
-            except ValueError:
-                raise HTTPException(status_code=400, detail="Nota inválida")
+        try:
+            nota_valor = notas.normalizar(nota.nota)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Nota inválida")
+        if nota_valor < 0 or nota_valor > notas.nota_maxima(atividade):
+            raise HTTPException(status_code=400, detail="Nota fora dos limites permitidos")
         
         # Cria o registro de que fez a atividade
         novo_registro = AlunoAtividade(
             aluno_matricula_fk=matricula,
             atividade_id_fk=id,
-            nota=str(nota_valor)
+            nota=nota_valor
         )
         db.add(novo_registro)
         
         # === 2. ATRIBUIR XP E NÍVEL ===
+        # UPDATE atômico no banco (Nível a cada 1000 XP)
         pontos_da_atividade = atividade.pontos if atividade.pontos else 0
-        xp_atual = aluno.xp if aluno.xp else 0
-        
-        # Soma o XP
-        aluno.xp = xp_atual + pontos_da_atividade
-        
-        # CORREÇÃO: Nível a cada 1000 XP
-        aluno.nivel = 1 + (aluno.xp // 1000)
+        progression.conceder_xp(db, [matricula], pontos_da_atividade)
         
         # === 3. ATRIBUIR BADGE (SE HOUVER) ===
         msg_badge = ""
@@ -295,8 +300,9 @@ def marcar_aluno_fez_atividade(
 
         db.commit()
         
+        _, nivel_atual = progression.obter_progresso(db, matricula)
         return {
-            "msg": f"Atividade concluída! +{pontos_da_atividade} XP.{msg_badge} Nível atual: {aluno.nivel}"
+            "msg": f"Atividade concluída! +{pontos_da_atividade} XP.{msg_badge} Nível atual: {nivel_atual}"
         }
     
     except HTTPException as e:
@@ -319,6 +325,186 @@ def marcar_aluno_fez_atividade(
             detail="Erro interno do servidor ao marcar aluno."
         )
 
+# Tentativas de gravar o lote quando outra requisição registra, ao mesmo
+# tempo, a entrega de algum dos alunos
+TENTATIVAS_LOTE = 3
+
+def _gravar_notas(db: Session, atividade: Atividade, validas: dict):
+    """
+    Grava as notas já validadas: UPDATE em lote para quem já tem registro,
+    INSERT em lote para os demais, com XP, nível e badge só para os novos.
+    Devolve (novos, atualizados), ou None se algum dos novos foi registrado
+    por outra requisição depois da leitura; nesse caso a transação deve
+    ser desfeita e o lote refeito.
+    """
+    if not validas:
+        return [], []
+    id = atividade.id
+    ja_registrados = set(db.scalars(
+        select(AlunoAtividade.aluno_matricula_fk).where(
+            AlunoAtividade.atividade_id_fk == id,
+            AlunoAtividade.aluno_matricula_fk.in_(validas)
+        )
+    ))
+    novos = [m for m in validas if m not in ja_registrados]
+    atualizados = [m for m in validas if m in ja_registrados]
+
+    if atualizados:
+        db.execute(update(AlunoAtividade), [
+            {"aluno_matricula_fk": m, "atividade_id_fk": id, "nota": validas[m]}
+            for m in atualizados
+        ])
+    if not novos:
+        return novos, atualizados
+
+    # INSERT IGNORE: uma entrega registrada em paralelo (marcar_aluno_fez_atividade
+    # ou outro lote) não derruba a transação; menos linhas inseridas que o
+    # esperado indicam a colisão, e ninguém recebe XP em dobro
+    # (pela tabela: o INSERT em lote do ORM não informa rowcount)
+    inseridos = db.execute(
+        insert(AlunoAtividade.__table__)
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite"),
+        [{"aluno_matricula_fk": m, "atividade_id_fk": id, "nota": validas[m]} for m in novos]
+    ).rowcount
+    if inseridos != len(novos):
+        return None
+
+    # XP e nível: um UPDATE para todos os novos
+    progression.conceder_xp(db, novos, atividade.pontos or 0)
+
+    # Badge para quem ainda não tem
+    if atividade.badge_id_fk:
+        com_badge = set(db.scalars(
+            select(AlunoBadge.aluno_matricula_fk).where(
+                AlunoBadge.badge_id_fk == atividade.badge_id_fk,
+                AlunoBadge.aluno_matricula_fk.in_(novos)
+            )
+        ))
+        sem_badge = [m for m in novos if m not in com_badge]
+        if sem_badge:
+            db.execute(
+                insert(AlunoBadge)
+                .prefix_with("IGNORE", dialect="mysql")
+                .prefix_with("OR IGNORE", dialect="sqlite"),
+                [
+                    {
+                        "aluno_matricula_fk": m,
+                        "badge_id_fk": atividade.badge_id_fk,
+                        "data_conquista": datetime.now()
+                    }
+                    for m in sem_badge
+                ]
+            )
+    return novos, atualizados
+
+@router.post("/{id}/notas:batch", response_model=aluno_atividade_schemas.NotasLoteResponse)
+def lancar_notas_em_lote(
+    id: int,
+    lote: List[aluno_atividade_schemas.NotaAlunoLote],
+    db: Session = Depends(database.get_db)
+):
+    """
+    Lança as notas de vários alunos em uma atividade numa única transação.
+    Alunos sem registro ganham XP, nível e badge como em
+    marcar_aluno_fez_atividade; os demais só têm a nota atualizada.
+    Linhas inválidas são reportadas sem abortar o restante do lote.
+    Se outra requisição registrar a entrega de algum aluno no meio, o
+    lote é refeito e esse aluno sai como "atualizado".
+    """
+    try:
+        atividade = db.get(Atividade, id)
+        if not atividade:
+            raise HTTPException(status_code=404, detail="Atividade não encontrada")
+
+        nota_max = notas.nota_maxima(atividade)
+        resultados = {}
+        validas = {}
+
+        # === 1. VALIDA NOTAS (sem tocar no banco) ===
+        for item in lote:
+            if item.matricula in resultados or item.matricula in validas:
+                resultados[item.matricula] = {"status": "erro", "detail": "Matrícula repetida no lote"}
+                validas.pop(item.matricula, None)
+                continue
+            try:
+                nota_valor = notas.normalizar(item.nota)
+            except ValueError:
+                resultados[item.matricula] = {"status": "erro", "detail": "Nota inválida"}
+                continue
+            if nota_valor < 0 or nota_valor > nota_max:
+                resultados[item.matricula] = {"status": "erro", "detail": "Nota fora dos limites permitidos"}
+                continue
+            validas[item.matricula] = nota_valor
+
+        # === 2. EXISTÊNCIA E MATRÍCULA NA TURMA (uma consulta) ===
+        if validas:
+            stmt = select(Aluno.matricula, aluno_turma.c.turma_id_fk).outerjoin(
+                aluno_turma,
+                and_(
+                    aluno_turma.c.aluno_matricula_fk == Aluno.matricula,
+                    aluno_turma.c.turma_id_fk == atividade.turma_id_fk,
+                )
+            ).where(Aluno.matricula.in_(validas))
+            encontrados = {matricula: turma_id for matricula, turma_id in db.execute(stmt)}
+
+            for matricula in list(validas):
+                if matricula not in encontrados:
+                    resultados[matricula] = {"status": "erro", "detail": "Aluno não encontrado"}
+                    del validas[matricula]
+                elif atividade.turma_id_fk and encontrados[matricula] is None:
+                    resultados[matricula] = {
+                        "status": "erro",
+                        "detail": "Aluno não está matriculado na turma desta atividade"
+                    }
+                    del validas[matricula]
+
+        # === 3. GRAVAÇÃO (refeita se outra requisição registrar um aluno no meio) ===
+        for _ in range(TENTATIVAS_LOTE):
+            gravados = _gravar_notas(db, atividade, validas)
+            if gravados is not None:
+                break
+            db.rollback()
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Notas sendo lançadas em paralelo para os mesmos alunos; tente novamente."
+            )
+
+        novos, atualizados = gravados
+        for m in novos:
+            resultados[m] = {"status": "criado", "nota": validas[m]}
+        for m in atualizados:
+            resultados[m] = {"status": "atualizado", "nota": validas[m]}
+
+        db.commit()
+
+        return {
+            "atividade_id": id,
+            "resultados": [
+                {"matricula": item.matricula, **resultados[item.matricula]}
+                for item in lote
+            ]
+        }
+
+    except HTTPException as e:
+        db.rollback()
+        raise e
+    except SQLAlchemyError as e:
+        db.rollback()
+        print(f"Erro no banco de dados ao lançar notas em lote: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro no banco de dados ao lançar notas em lote."
+        )
+    except Exception as e:
+        db.rollback()
+        print(f"Erro inesperado ao lançar notas em lote: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor ao lançar notas em lote."
+        )
+
 @router.put("/{id}/alunos/{matricula}/nota")
 def atualizar_nota_aluno(
     id: int,
@@ -348,12 +534,12 @@ def atualizar_nota_aluno(
         
         # Valida a nota
         try:
-            nota_valor = float(nota_update.nota) if nota_update.nota is not None else 0.0
-        except (ValueError, TypeError):
+            nota_valor = notas.normalizar(nota_update.nota)
+        except ValueError:
             raise HTTPException(status_code=400, detail="Nota inválida")
         
         # Valida se a nota está dentro do range permitido
-        nota_max = float(atividade.nota_max) if atividade.nota_max else 10.0
+        nota_max = notas.nota_maxima(atividade)
         
         if nota_valor < 0:
             raise HTTPException(status_code=400, detail="A nota não pode ser menor que 0")
@@ -365,7 +551,7 @@ def atualizar_nota_aluno(
             )
         
         # Atualiza a nota
-        registro.nota = str(nota_valor)
+        registro.nota = nota_valor
         db.commit()
         
         return {"msg": f"Nota do aluno {matricula} atualizada com sucesso"}
@@ -400,9 +586,6 @@ def desmarcar_aluno_fez_atividade(
         if not atividade:
             raise HTTPException(status_code=404, detail="Atividade não encontrada")
 
-        # Busca o aluno
-        aluno = db.query(Aluno).filter(Aluno.matricula == matricula).first()
-
         # Busca o registro da atividade feita
         registro = db.query(AlunoAtividade).filter(
             AlunoAtividade.atividade_id_fk == id,
@@ -413,16 +596,9 @@ def desmarcar_aluno_fez_atividade(
             raise HTTPException(status_code=404, detail="Registro não encontrado")
         
         # === 1. REMOVE XP e RECALCULA NÍVEL ===
-        if aluno:
-            pontos_a_remover = atividade.pontos if atividade.pontos else 0
-            xp_atual = aluno.xp if aluno.xp else 0
-            
-            # Subtrai o XP
-            novo_xp = xp_atual - pontos_a_remover
-            aluno.xp = novo_xp if novo_xp >= 0 else 0
-            
-            # CORREÇÃO: Recalcula nível (Regra 1000 XP)
-            aluno.nivel = 1 + (aluno.xp // 1000)
+        # UPDATE atômico no banco (XP mínimo 0, Regra 1000 XP)
+        pontos_a_remover = atividade.pontos if atividade.pontos else 0
+        progression.remover_xp(db, [matricula], pontos_a_remover)
         
         # === 2. REMOVE BADGE (SE HOUVER E FOI GANHO NESTA ATIVIDADE) ===
         if atividade.badge_id_fk:
@@ -461,15 +637,22 @@ def desmarcar_aluno_fez_atividade(
 @router.post("/alunos/{matricula}/atividades/{atv_id}")
 def atribuir_nota_aluno(matricula: str, atv_id: int, nota: str, db: Session = Depends(database.get_db)):
     try:
+        try:
+            nota_valor = notas.normalizar(nota)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Nota inválida")
         atv_com_nota = AlunoAtividade(
             aluno_matricula_fk=matricula,
             atividade_id_fk=atv_id,
-            nota=nota
+            nota=nota_valor
         )
     
         db.add(atv_com_nota)
         db.commit()
         return {"msg": f"Nota da atividade {atv_id} atribuída ao aluno {matricula}"}
+    except HTTPException as e:
+        db.rollback()
+        raise e
     except SQLAlchemyError as e:
         db.rollback()
         print(f"Erro no banco de dados ao atribuir nota: {e}")
@@ -487,96 +670,108 @@ def atribuir_nota_aluno(matricula: str, atv_id: int, nota: str, db: Session = De
 
 @router.get("/{id}/alunos", response_model=aluno_atividade_schemas.AlunosAtividadeResponse)
 def get_alunos_atividade(id: int, db: Session = Depends(database.get_db)):
+    """
+    Alunos da turma da atividade (e quem entregou sem estar na turma),
+    com avatar, nota e se já fez. Uma única consulta:
+
+        Atividade LEFT JOIN (alunos da turma UNION quem entregou)
+                  JOIN Aluno LEFT JOIN Avatar LEFT JOIN Aluno_Atividade
+    """
     try:
-        # Busca a atividade com turma
-        atividade = db.query(Atividade).options(
-            joinedload(Atividade.turma)
-        ).filter(Atividade.id == id).first()
-        
-        if not atividade:
-            raise HTTPException(status_code=404, detail="Atividade não encontrada")
-        
-        if not atividade.turma:
-            return {"atividade_id": id, "alunos": []}
-        
-        alunos_da_turma = db.query(Aluno).join(
-            aluno_turma, Aluno.matricula == aluno_turma.c.aluno_matricula_fk
-        ).filter(
-            aluno_turma.c.turma_id_fk == atividade.turma.id
-        ).options(
-            joinedload(Aluno.avatar)
-        ).all()
-        
-        alunos_que_fizeram = db.query(AlunoAtividade).filter(
+        da_turma = select(aluno_turma.c.aluno_matricula_fk.label("matricula")).join(
+            Atividade, Atividade.turma_id_fk == aluno_turma.c.turma_id_fk
+        ).where(Atividade.id == id)
+        entregaram = select(AlunoAtividade.aluno_matricula_fk.label("matricula")).where(
             AlunoAtividade.atividade_id_fk == id
-        ).all()
-        
-        mapa_notas = {}
-        for aa in alunos_que_fizeram:
-            nota_val = str(aa.nota) if aa.nota is not None else None
-            mapa_notas[aa.aluno_matricula_fk] = nota_val
-        
-        matriculas_da_turma = {aluno.matricula for aluno in alunos_da_turma}
-        matriculas_com_atividade = set(mapa_notas.keys())
-        matriculas_extras = matriculas_com_atividade - matriculas_da_turma
-        
-        alunos_adicionais = []
-        if matriculas_extras:
-            alunos_adicionais = db.query(Aluno).filter(
-                Aluno.matricula.in_(list(matriculas_extras))
-            ).options(
-                joinedload(Aluno.avatar)
-            ).all()
-        
-        todos_alunos = list(alunos_da_turma) + list(alunos_adicionais)
-        
-        lista_final_alunos = []
-        
-        for aluno in todos_alunos:
-            try:
-                fez = aluno.matricula in mapa_notas
-                nota_aluno = mapa_notas.get(aluno.matricula)
-                
-                # BLINDAGEM DE DADOS: Evita erro de validação Pydantic
-                # Se o schema pedir string e vier None, quebra. Aqui garantimos string.
-                safe_nome = aluno.nome if aluno.nome else "Sem nome"
-                safe_nickname = aluno.nickname if aluno.nickname else "" 
-                
-                # Monta avatar
-                avatar_data = None
-                if aluno.avatar:
-                    avatar_data = {
-                        "id": aluno.avatar.id,
-                        "caminho_foto": aluno.avatar.caminho_foto or ""
-                    }
+        )
+        envolvidos = union(da_turma, entregaram).subquery()
 
-                aluno_obj = aluno_atividade_schemas.AlunoStatusAtividade(
-                    matricula=aluno.matricula,
-                    nome=safe_nome,
-                    nickname=safe_nickname,  # Passando string vazia em vez de None
-                    fez_atividade=fez,
-                    nota=nota_aluno,         # Pode ser None dependendo do schema
-                    avatar=avatar_data
-                )
-                lista_final_alunos.append(aluno_obj)
-                
-            except Exception as e:
-                print(f"ERRO DE VALIDAÇÃO NO ALUNO {aluno.matricula}: {e}")
-                # Não dá raise aqui, apenas pula o aluno problemático para não quebrar a tela toda
-                continue
+        stmt = (
+            select(
+                Atividade.turma_id_fk,
+                Aluno.matricula,
+                Aluno.nome,
+                Aluno.nickname,
+                Avatar.id.label("avatar_id"),
+                Avatar.caminho_foto,
+                AlunoAtividade.aluno_matricula_fk.label("entrega"),
+                AlunoAtividade.nota,
+            )
+            .select_from(Atividade)
+            # A linha da atividade sempre volta: sem linhas = 404
+            .outerjoin(envolvidos, true())
+            .outerjoin(Aluno, Aluno.matricula == envolvidos.c.matricula)
+            .outerjoin(Avatar, Avatar.id == Aluno.avatar_id_fk)
+            .outerjoin(AlunoAtividade, and_(
+                AlunoAtividade.aluno_matricula_fk == Aluno.matricula,
+                AlunoAtividade.atividade_id_fk == id
+            ))
+            .where(Atividade.id == id)
+            .order_by(Aluno.nome, Aluno.matricula)
+        )
+        rows = db.execute(stmt).all()
+
+        if not rows:
+            raise HTTPException(status_code=404, detail="Atividade não encontrada")
+
+        alunos = []
+        if rows[0].turma_id_fk is not None:
+            alunos = [
+                {
+                    "matricula": row.matricula,
+                    "nome": row.nome or "Sem nome",
+                    "nickname": row.nickname or "",
+                    "fez_atividade": row.entrega is not None,
+                    "nota": row.nota,
+                    "avatar": {"id": row.avatar_id, "caminho_foto": row.caminho_foto or ""}
+                    if row.avatar_id is not None else None,
+                }
+                for row in rows if row.matricula is not None
+            ]
+
+        # Linhas já no formato de AlunosAtividadeResponse: caminho rápido, sem revalidar
+        return serialization.resposta(
+            aluno_atividade_schemas.AlunosAtividadeResponse, {"atividade_id": id, "alunos": alunos}
+        )
 
-        return {
-            "atividade_id": id,
-            "alunos": lista_final_alunos
-        }
-    
     except HTTPException as e:
         raise e
+    except SQLAlchemyError as e:
+        print(f"Erro no banco de dados ao listar alunos da atividade: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro no banco de dados ao listar alunos da atividade."
+        )
     except Exception as e:
-        db.rollback()
         print("====== ERRO 500 CRÍTICO ======")
-        traceback.print_exc() 
+        traceback.print_exc()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Erro interno no servidor."
-        )
\ No newline at end of file
+        )
+
+@router.get("/{id}/estatisticas", response_model=notas_schemas.AtividadeEstatisticas)
+def get_estatisticas_atividade(id: int, db: Session = Depends(database.get_db)):
+    """
+    Entregas, média, mínima, máxima e distribuição das notas da
+    atividade (faixas em % da nota máxima), agregadas no banco.
+    """
+    try:
+        estatisticas = notas.estatisticas_atividades(db, atividade_id=id)
+        if not estatisticas:
+            raise HTTPException(status_code=404, detail="Atividade não encontrada")
+        return serialization.resposta(notas_schemas.AtividadeEstatisticas, estatisticas[0])
+    except HTTPException as e:
+        raise e
+    except SQLAlchemyError as e:
+        print(f"Erro no banco de dados ao calcular estatísticas da atividade: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro no banco de dados ao calcular estatísticas da atividade."
+        )
+    except Exception as e:
+        print(f"Erro inesperado ao calcular estatísticas da atividade: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor ao calcular estatísticas da atividade."
+        )
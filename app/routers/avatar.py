@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from app import database
+from app import database, etag, pagination
 from app.schemas import avatar as schemas 
 from app.models.avatar import Avatar     
-from typing import List
+from app.cache import avatar_cache
+from typing import List, Optional
 
 router = APIRouter(prefix="/avatares", tags=["Avatares"])
 
@@ -27,6 +29,7 @@ def create_avatar(
         db.add(new_avatar)
         db.commit()
         db.refresh(new_avatar)
+        avatar_cache.invalidate()
         
         return {"data": new_avatar}
     
@@ -48,20 +51,32 @@ def create_avatar(
         )
 
 @router.get("/", response_model=schemas.AvatarResponseList)
-def get_avatares(db: Session = Depends(database.get_db)):
+async def get_avatares(
+    request: Request,
+    response: Response,
+    after: Optional[int] = None,
+    limit: int = pagination.limit_param(),
+    db: AsyncSession = Depends(database.get_async_db)
+):
 
     try:
-        avatares = db.query(Avatar).all()
-        return {"data": avatares}
+        catalogo = await avatar_cache.acarregar(db)
+        tag = etag.gerar("avatares", catalogo.digest, after, limit)
+        if etag.corresponde(request, tag):
+            return etag.not_modified(tag)
+        etag.aplicar(response, tag)
+
+        avatares, next_cursor = catalogo.pagina(after, limit)
+        return {"data": avatares, "next_cursor": next_cursor}
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         print(f"Erro no banco de dados ao listar avatares: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro no banco de dados ao buscar lista de avatares."
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Erro inesperado ao listar avatares: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -69,26 +84,36 @@ def get_avatares(db: Session = Depends(database.get_db)):
         )
 
 @router.get("/{id}", response_model=schemas.AvatarResponseSingle)
-def get_avatar_by_id(id: int, db: Session = Depends(database.get_db)):
+async def get_avatar_by_id(
+    id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(database.get_async_db)
+):
 
     try:
-        avatar = db.query(Avatar).filter(Avatar.id == id).first()
+        avatar = await avatar_cache.aget(db, id)
         
         if not avatar:
             raise HTTPException(status_code=404, detail="Avatar não encontrado")
         
+        tag = etag.gerar("avatar", sorted(avatar.items()))
+        if etag.corresponde(request, tag):
+            return etag.not_modified(tag)
+        etag.aplicar(response, tag)
+        
         return {"data": avatar}
     except HTTPException as e:
         raise e
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         print(f"Erro no banco de dados ao buscar avatar por ID: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro no banco de dados ao buscar avatar."
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Erro inesperado ao buscar avatar por ID: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,13 +1,15 @@
 from datetime import date
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app import database
+from app import database, etag, pagination
 from app.models.aluno import Aluno
 from app.schemas import badge as schemas
 from app.models.badge import Badge
 
 from app.models.aluno_badge import AlunoBadge
+from app.cache import badge_cache
 
 router  = APIRouter(prefix="/badges", tags=["Badges"])
 
@@ -23,21 +25,44 @@ def create_badge(badge: schemas.BadgeCreate, db: Session = Depends(database.get_
     db.add(new_badge)
     db.commit()
     db.refresh(new_badge)
+    badge_cache.invalidate()
     
     return {"data": new_badge}
 
 @router.get("/", response_model=schemas.BadgeResponseList)
-def get_badges(db: Session = Depends(database.get_db)):
-    badges = db.query(Badge).all()
-    return {"data": badges}
+async def get_badges(
+    request: Request,
+    response: Response,
+    after: Optional[int] = None,
+    limit: int = pagination.limit_param(),
+    db: AsyncSession = Depends(database.get_async_db)
+):
+    catalogo = await badge_cache.acarregar(db)
+    tag = etag.gerar("badges", catalogo.digest, after, limit)
+    if etag.corresponde(request, tag):
+        return etag.not_modified(tag)
+    etag.aplicar(response, tag)
+
+    badges, next_cursor = catalogo.pagina(after, limit)
+    return {"data": badges, "next_cursor": next_cursor}
 
 @router.get("/{id}", response_model=schemas.BadgeResponseSingle)
-def get_badge_by_id(id: int, db: Session = Depends(database.get_db)):
-    badge = db.query(Badge).filter(Badge.id == id).first()
+async def get_badge_by_id(
+    id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(database.get_async_db)
+):
+    badge = await badge_cache.aget(db, id)
     
     if not badge:
         raise HTTPException(status_code=404, detail="Badge não encontrado")
     
+    tag = etag.gerar("badge", sorted(badge.items()))
+    if etag.corresponde(request, tag):
+        return etag.not_modified(tag)
+    etag.aplicar(response, tag)
+    
     return {"data": badge}
 
 @router.post("/{badge_id}/alunos/{matricula}")
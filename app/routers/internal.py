@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+from app import database
+from app.security import token_cache, verificar_token_interno
+from app.cache import avatar_cache, badge_cache
+from app.ranking import ranking_cache
+
+router = APIRouter(prefix="/internal", tags=["Interno"], dependencies=[Depends(verificar_token_interno)])
+
+@router.get("/pool")
+def get_pool_status():
+    """
+    Estado dos pools de conexão (síncrono e assíncrono).
+    """
+    return {
+        "data": {
+            "sync": database.pool_status(database.engine.pool),
+            "async": database.pool_status(database.async_engine.sync_engine.pool),
+        }
+    }
+
+@router.get("/token-cache")
+def get_token_cache_status():
+    return {"data": token_cache.stats()}
+
+@router.get("/cache")
+def get_catalog_cache_status():
+    return {"data": {"badges": badge_cache.stats(), "avatares": avatar_cache.stats()}}
+
+@router.get("/ranking")
+def get_ranking_status():
+    return {"data": ranking_cache.stats()}
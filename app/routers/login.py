@@ -4,22 +4,22 @@ from app.models.aluno import Aluno
 from app.models.professor import Professor
 from app.schemas import login as schemas
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from app.security import verify_password, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.security import verify_password_async, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 
 router = APIRouter(prefix="/login", tags=["Login"])
 
 @router.post("/aluno", response_model=schemas.LoginAlunoResponse)
-def login_aluno(aluno: schemas.LoginAlunoBase, db: Session = Depends(database.get_db)):
+async def login_aluno(aluno: schemas.LoginAlunoBase, db: AsyncSession = Depends(database.get_async_db)):
     
     try:
-        db_aluno = db.query(Aluno).filter(Aluno.matricula == aluno.matricula).first()
+        db_aluno = await db.get(Aluno, aluno.matricula)
         
         if db_aluno is None:
             raise HTTPException(status_code=404, detail="Matricula não registrada")
         
-        senha_corresponde = verify_password(plain_password=aluno.senha, hashed_password=db_aluno.senha)
+        senha_corresponde = await verify_password_async(plain_password=aluno.senha, hashed_password=db_aluno.senha)
         
         if not senha_corresponde:
             raise HTTPException(status_code=401, detail="Usuário e/ou senha incorretas.")
@@ -52,14 +52,14 @@ def login_aluno(aluno: schemas.LoginAlunoBase, db: Session = Depends(database.ge
         )
 
 @router.post("/professor", response_model=schemas.LoginProfessorResponse)
-def login_professor(professor: schemas.LoginProfessorBase, db: Session = Depends(database.get_db)):  
+async def login_professor(professor: schemas.LoginProfessorBase, db: AsyncSession = Depends(database.get_async_db)):  
     try:
-        db_prof = db.query(Professor).filter(Professor.matricula == professor.matricula).first()
+        db_prof = await db.get(Professor, professor.matricula)
         
         if db_prof is None:
             raise HTTPException(status_code=404, detail="Matricula não registrada")
         
-        senha_corresponde = verify_password(plain_password=professor.senha, hashed_password=db_prof.senha)
+        senha_corresponde = await verify_password_async(plain_password=professor.senha, hashed_password=db_prof.senha)
         
         if not senha_corresponde:
             raise HTTPException(status_code=401, detail="Usuário e/ou senha incorretas.")
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from app.metrics import render
+from app.security import verificar_token_interno
+
+router = APIRouter(tags=["Interno"], dependencies=[Depends(verificar_token_interno)])
+
+# Formato de exposição em texto do Prometheus
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    """
+    Métricas do processo para o Prometheus: latência por router/rota,
+    requisições em andamento, pools de conexão, fila do bcrypt e caches.
+    """
+    return PlainTextResponse(render(), media_type=CONTENT_TYPE)
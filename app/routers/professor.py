@@ -1,11 +1,12 @@
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError 
-from app import database
+from app import database, pagination
 from app.schemas import professor as schemas
 from app.models.professor import Professor
 from app.models.avatar import Avatar
+from app.cache import avatar_cache
 from datetime import timedelta
 from app.security import hash_password, verify_password, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 
@@ -22,13 +23,13 @@ def create_user(professor: schemas.ProfessorCreate, db: Session = Depends(databa
         
         avatar = None
         if professor.avatar_id_fk:
-            avatar = db.query(Avatar).filter(Avatar.id == professor.avatar_id_fk).first()
+            avatar = avatar_cache.get(db, professor.avatar_id_fk)
             if not avatar:
                 raise HTTPException(status_code=404, detail="Avatar não encontrado")
         
         hashed_pwd = hash_password(professor.senha)
         
-        avatar_id = avatar.id if avatar else None
+        avatar_id = avatar["id"] if avatar else None
         
         new_user = Professor(
             matricula=professor.matricula,
@@ -72,10 +73,15 @@ def create_user(professor: schemas.ProfessorCreate, db: Session = Depends(databa
         )
 
 @router.get("/", response_model=schemas.ProfessorResponseList)
-def get_profs(db: Session = Depends(database.get_db)):
+def get_profs(
+    after: Optional[str] = None,
+    limit: int = pagination.limit_param(),
+    db: Session = Depends(database.get_db)
+):
     try:
-        professores = db.query(Professor).all()
-        return {"data": professores}
+        query = pagination.keyset(db.query(Professor), Professor.matricula, after, limit)
+        professores, next_cursor = pagination.pagina(query.all(), limit, "matricula")
+        return {"data": professores, "next_cursor": next_cursor}
     except SQLAlchemyError as e:
         print(f"Erro no banco de dados ao listar professores: {e}")
         raise HTTPException(
@@ -128,7 +134,7 @@ def update_professor(
         
         # Valida avatar se fornecido
         if professor_update.avatar_id_fk is not None:
-            avatar = db.query(Avatar).filter(Avatar.id == professor_update.avatar_id_fk).first()
+            avatar = avatar_cache.get(db, professor_update.avatar_id_fk)
             if not avatar:
                 raise HTTPException(status_code=404, detail="Avatar não encontrado")
             professor.avatar_id_fk = professor_update.avatar_id_fk
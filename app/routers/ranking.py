@@ -0,0 +1,33 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from app import database, pagination
+from app.schemas import ranking as schemas
+from app.ranking import ranking_cache
+
+router = APIRouter(prefix="/ranking", tags=["Ranking"])
+
+@router.get("/", response_model=schemas.RankingResponse)
+def get_ranking(
+    limit: int = Query(10, ge=1, le=pagination.MAX_LIMIT),
+    matricula: Optional[str] = None,
+    db: Session = Depends(database.get_db)
+):
+    """
+    Ranking geral de alunos por XP. Com ?matricula= inclui a posição do aluno.
+    """
+    try:
+        return ranking_cache.consultar(db, None, limit, matricula)
+    except SQLAlchemyError as e:
+        print(f"Erro no banco de dados ao buscar ranking: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro no banco de dados ao buscar ranking."
+        )
+    except Exception as e:
+        print(f"Erro inesperado ao buscar ranking: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor ao buscar ranking."
+        )
@@ -1,16 +1,34 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from app import database
 from app.schemas import turma as schemas
+from app.schemas import ranking as ranking_schemas
+from app.schemas import notas as notas_schemas
 from app.models import turma as models
 from app.models.aluno import Aluno
 from app.models.turma import Turma
 from app.models.professor import Professor
+from app.models.aluno_turma import aluno_turma
+from app.models.atividade import Atividade
+from app.models.aluno_atividade import AlunoAtividade
+from app.loaders import loader_options
+from app import etag, notas, projections, pagination, serialization
+from app.ranking import ranking_cache
 
 router = APIRouter(prefix="/turmas", tags=["Turmas"])
 
+# Linhas buscadas por vez do cursor na exportação de notas
+EXPORT_YIELD_PER = 500
+
 @router.post("/", response_model=schemas.TurmaResponseSingle)
 def create_turma(turma: schemas.TurmaCreate, db: Session = Depends(database.get_db),):
 
@@ -51,11 +69,24 @@ def create_turma(turma: schemas.TurmaCreate, db: Session = Depends(database.get_
             detail="Erro interno do servidor ao criar turma."
         )
 
-@router.get("/", response_model=schemas.TurmaResponseList)
-def get_turmas(db: Session = Depends(database.get_db)):
+@router.get("/", response_model=schemas.TurmaResumoList)
+def get_turmas(
+    expand: Optional[str] = None,
+    after: Optional[int] = None,
+    limit: int = pagination.limit_param(),
+    db: Session = Depends(database.get_db)
+):
+    # Ex.: ?expand=alunos.avatar
+    expand_set = projections.parse_expand(expand, projections.TURMA_EXPANSOES)
     try:
-        turmas = db.query(Turma).all()
-        return {"data":turmas}
+        stmt = select(*projections.TURMA_COLUNAS).outerjoin(
+            Professor, Turma.professor_matricula_fk == Professor.matricula
+        )
+        stmt = pagination.keyset(stmt, Turma.id, after, limit)
+        turmas = [dict(row) for row in db.execute(stmt).mappings()]
+        turmas, next_cursor = pagination.pagina(turmas, limit, "id")
+        projections.expandir_turmas(db, turmas, expand_set)
+        return serialization.resposta(schemas.TurmaResumoList, {"data": turmas, "next_cursor": next_cursor})
     except SQLAlchemyError as e:
         print(f"Erro no banco de dados ao listar turmas: {e}")
         raise HTTPException(
@@ -70,14 +101,19 @@ def get_turmas(db: Session = Depends(database.get_db)):
         )
 
 @router.get("/{id}", response_model=schemas.TurmaResponseSingle)
-def get_turma_by_id(id: int, db: Session = Depends(database.get_db)):
+async def get_turma_by_id(id: int, request: Request, db: AsyncSession = Depends(database.get_async_db)):
     try:
-        turma = db.query(Turma).filter(Turma.id == id).first()
+        result = await db.execute(
+            select(Turma).options(
+                *loader_options("turmas.detail")
+            ).where(Turma.id == id)
+        )
+        turma = result.scalar_one_or_none()
         
         if not turma:
             raise HTTPException(status_code=404, detail="Turma não encontrada")
         
-        return {"data":turma}
+        return etag.json_response(request, schemas.TurmaResponseSingle, {"data": turma})
     except HTTPException as e:
         raise e
     except SQLAlchemyError as e:
@@ -93,6 +129,36 @@ def get_turma_by_id(id: int, db: Session = Depends(database.get_db)):
             detail="Erro interno do servidor ao buscar turma."
         )
 
+@router.get("/{id}/ranking", response_model=ranking_schemas.RankingResponse)
+def get_ranking_turma(
+    id: int,
+    limit: int = Query(10, ge=1, le=pagination.MAX_LIMIT),
+    matricula: Optional[str] = None,
+    db: Session = Depends(database.get_db)
+):
+    """
+    Alunos da turma ordenados por XP. Com ?matricula= inclui a posição do aluno.
+    """
+    try:
+        if not db.scalar(select(Turma.id).where(Turma.id == id)):
+            raise HTTPException(status_code=404, detail="Turma não encontrada")
+
+        return ranking_cache.consultar(db, id, limit, matricula)
+    except HTTPException as e:
+        raise e
+    except SQLAlchemyError as e:
+        print(f"Erro no banco de dados ao buscar ranking da turma: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro no banco de dados ao buscar ranking da turma."
+        )
+    except Exception as e:
+        print(f"Erro inesperado ao buscar ranking da turma: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor ao buscar ranking da turma."
+        )
+
 @router.post("/{turma_id}/alunos/{matricula}")
 def add_aluno_turma(matricula: str, turma_id: int, db: Session = Depends(database.get_db)):
     
@@ -110,6 +176,7 @@ def add_aluno_turma(matricula: str, turma_id: int, db: Session = Depends(databas
 
         aluno.turmas.append(turma)
         db.commit()
+        ranking_cache.invalidate()
         return {"msg": f"Aluno {aluno.nome} adicionado à turma {turma.nome}"}
     
     except HTTPException as e:
@@ -169,6 +236,7 @@ def remove_aluno_turma(matricula: str, turma_id: int, db: Session = Depends(data
 
         aluno.turmas.remove(turma) # Remove a relação
         db.commit()
+        ranking_cache.invalidate()
         return {"msg": f"Aluno {aluno.nome} removido da turma {turma.nome}"}
     
     except HTTPException as e:
@@ -180,4 +248,263 @@ def remove_aluno_turma(matricula: str, turma_id: int, db: Session = Depends(data
     except Exception as e:
         db.rollback()
         print(f"Erro inesperado: {e}")
-        raise HTTPException(status_code=500, detail="Erro interno do servidor.")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Erro interno do servidor.")
+
+def _linhas_notas(turma_id: int, atividades, formato: str):
+    """
+    Gera o boletim da turma linha a linha (um aluno por linha), lendo
+    alunos x notas de um cursor no servidor. Abre a própria sessão: o
+    corpo é gerado depois que a rota (e a sessão dela) já retornou.
+    """
+    ids = [a["id"] for a in atividades]
+    stmt = (
+        select(Aluno.matricula, Aluno.nome, Aluno.nickname, AlunoAtividade.atividade_id_fk, AlunoAtividade.nota)
+        .select_from(aluno_turma)
+        .join(Aluno, Aluno.matricula == aluno_turma.c.aluno_matricula_fk)
+        .outerjoin(AlunoAtividade, and_(
+            AlunoAtividade.aluno_matricula_fk == Aluno.matricula,
+            AlunoAtividade.atividade_id_fk.in_(ids or [None])
+        ))
+        .where(aluno_turma.c.turma_id_fk == turma_id)
+        .order_by(Aluno.matricula)
+        .execution_options(yield_per=EXPORT_YIELD_PER)
+    )
+
+    def formatar(aluno, notas):
+        if formato == "ndjson":
+            return json.dumps(
+                {**aluno, "notas": {str(i): notas.get(i) for i in ids}}, ensure_ascii=False
+            ) + "\n"
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(
+            [aluno["matricula"], aluno["nome"], aluno["nickname"] or ""] + [notas.get(i, "") for i in ids]
+        )
+        return buffer.getvalue()
+
+    if formato == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(
+            ["matricula", "nome", "nickname"] + [f"{a['nome']} (#{a['id']})" for a in atividades]
+        )
+        yield buffer.getvalue()
+
+    db = database.SessionLocal()
+    try:
+        atual = None
+        notas = {}
+        # Linhas ordenadas por aluno: só o aluno corrente fica em memória
+        for matricula, nome, nickname, atividade_id, nota in db.execute(stmt):
+            if atual is None or atual["matricula"] != matricula:
+                if atual is not None:
+                    yield formatar(atual, notas)
+                atual = {"matricula": matricula, "nome": nome, "nickname": nickname}
+                notas = {}
+            if atividade_id is not None:
+                # Decimal: "7.50", o mesmo texto das respostas JSON
+                notas[atividade_id] = None if nota is None else str(nota)
+        if atual is not None:
+            yield formatar(atual, notas)
+    except SQLAlchemyError as e:
+        # Cabeçalhos já enviados: só resta registrar e encerrar o corpo
+        print(f"Erro no banco de dados ao exportar notas da turma {turma_id}: {e}")
+        raise
+    finally:
+        db.close()
+
+@router.get("/{id}/estatisticas", response_model=notas_schemas.TurmaEstatisticas)
+def get_estatisticas_turma(
+    id: int,
+    limit: int = Query(10, ge=1, le=pagination.MAX_LIMIT),
+    db: Session = Depends(database.get_db)
+):
+    """
+    Estatísticas das notas de cada atividade da turma e os `limit`
+    alunos com maior média (em % da nota máxima), agregadas no banco.
+    """
+    try:
+        if not db.scalar(select(Turma.id).where(Turma.id == id)):
+            raise HTTPException(status_code=404, detail="Turma não encontrada")
+
+        return serialization.resposta(notas_schemas.TurmaEstatisticas, {
+            "turma_id": id,
+            "atividades": notas.estatisticas_atividades(db, turma_id=id),
+            "ranking": notas.ranking_notas(db, id, limit),
+        })
+    except HTTPException as e:
+        raise e
+    except SQLAlchemyError as e:
+        print(f"Erro no banco de dados ao calcular estatísticas da turma: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro no banco de dados ao calcular estatísticas da turma."
+        )
+    except Exception as e:
+        print(f"Erro inesperado ao calcular estatísticas da turma: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor ao calcular estatísticas da turma."
+        )
+
+@router.get("/{id}/notas/export")
+def exportar_notas_turma(
+    id: int,
+    formato: str = Query("csv", pattern="^(csv|ndjson)$"),
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    db: Session = Depends(database.get_db)
+):
+    """
+    Boletim da turma (alunos x atividades) em CSV ou NDJSON, enviado em
+    streaming. data_inicio/data_fim filtram as atividades pela entrega.
+    """
+    try:
+        if not db.scalar(select(Turma.id).where(Turma.id == id)):
+            raise HTTPException(status_code=404, detail="Turma não encontrada")
+
+        stmt = (
+            select(Atividade.id, Atividade.nome)
+            .where(Atividade.turma_id_fk == id)
+            .order_by(Atividade.data_entrega, Atividade.id)
+        )
+        if data_inicio is not None:
+            stmt = stmt.where(Atividade.data_entrega >= datetime.combine(data_inicio, time.min))
+        if data_fim is not None:
+            stmt = stmt.where(Atividade.data_entrega < datetime.combine(data_fim + timedelta(days=1), time.min))
+        atividades = [dict(row) for row in db.execute(stmt).mappings()]
+    except HTTPException as e:
+        raise e
+    except SQLAlchemyError as e:
+        print(f"Erro no banco de dados ao exportar notas da turma: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro no banco de dados ao exportar notas da turma."
+        )
+
+    media_type = "application/x-ndjson" if formato == "ndjson" else "text/csv; charset=utf-8"
+    return StreamingResponse(
+        _linhas_notas(id, atividades, formato),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="turma_{id}_notas.{formato}"'}
+    )
+
+def _membros(db: Session, turma_id: int, matriculas):
+    """
+    Uma consulta: {matricula: True/False (está na turma)} para os alunos
+    existentes entre `matriculas`.
+    """
+    stmt = select(Aluno.matricula, aluno_turma.c.turma_id_fk).outerjoin(
+        aluno_turma,
+        and_(
+            aluno_turma.c.aluno_matricula_fk == Aluno.matricula,
+            aluno_turma.c.turma_id_fk == turma_id,
+        )
+    ).where(Aluno.matricula.in_(matriculas))
+    return {matricula: turma is not None for matricula, turma in db.execute(stmt)}
+
+@router.post("/{id}/alunos:batch", response_model=schemas.MatriculasLoteResponse)
+def add_alunos_turma_em_lote(id: int, matriculas: List[str], db: Session = Depends(database.get_db)):
+    """
+    Matricula vários alunos na turma numa única transação. Quem já está
+    na turma é reportado como "ja_matriculado"; matrículas inexistentes
+    como "erro", sem abortar o restante do lote.
+    """
+    try:
+        if not db.scalar(select(Turma.id).where(Turma.id == id)):
+            raise HTTPException(status_code=404, detail="Turma não encontrada")
+
+        pedidas = list(dict.fromkeys(matriculas))
+        membros = _membros(db, id, pedidas) if pedidas else {}
+        novos = [m for m in pedidas if membros.get(m) is False]
+
+        if novos:
+            # INSERT IGNORE: uma matrícula feita em paralelo por outra
+            # requisição não derruba o lote
+            db.execute(
+                insert(aluno_turma)
+                .prefix_with("IGNORE", dialect="mysql")
+                .prefix_with("OR IGNORE", dialect="sqlite"),
+                [{"aluno_matricula_fk": m, "turma_id_fk": id} for m in novos]
+            )
+        db.commit()
+        if novos:
+            ranking_cache.invalidate()
+
+        resultados = []
+        for m in pedidas:
+            if m not in membros:
+                resultados.append({"matricula": m, "status": "erro", "detail": "Aluno não encontrado"})
+            elif membros[m]:
+                resultados.append({"matricula": m, "status": "ja_matriculado"})
+            else:
+                resultados.append({"matricula": m, "status": "matriculado"})
+        return {"turma_id": id, "resultados": resultados}
+
+    except HTTPException as e:
+        db.rollback()
+        raise e
+    except SQLAlchemyError as e:
+        db.rollback()
+        print(f"Erro no banco de dados ao matricular alunos em lote: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro no banco de dados ao matricular alunos em lote."
+        )
+    except Exception as e:
+        db.rollback()
+        print(f"Erro inesperado ao matricular alunos em lote: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor ao matricular alunos em lote."
+        )
+
+@router.delete("/{id}/alunos:batch", response_model=schemas.MatriculasLoteResponse)
+def remove_alunos_turma_em_lote(id: int, matriculas: List[str], db: Session = Depends(database.get_db)):
+    """
+    Remove vários alunos da turma com um único DELETE.
+    """
+    try:
+        if not db.scalar(select(Turma.id).where(Turma.id == id)):
+            raise HTTPException(status_code=404, detail="Turma não encontrada")
+
+        pedidas = list(dict.fromkeys(matriculas))
+        membros = _membros(db, id, pedidas) if pedidas else {}
+        removidos = [m for m in pedidas if membros.get(m)]
+
+        if removidos:
+            db.execute(
+                delete(aluno_turma).where(
+                    aluno_turma.c.turma_id_fk == id,
+                    aluno_turma.c.aluno_matricula_fk.in_(removidos)
+                )
+            )
+        db.commit()
+        if removidos:
+            ranking_cache.invalidate()
+
+        resultados = []
+        for m in pedidas:
+            if m not in membros:
+                resultados.append({"matricula": m, "status": "erro", "detail": "Aluno não encontrado"})
+            elif membros[m]:
+                resultados.append({"matricula": m, "status": "removido"})
+            else:
+                resultados.append({"matricula": m, "status": "nao_matriculado"})
+        return {"turma_id": id, "resultados": resultados}
+
+    except HTTPException as e:
+        db.rollback()
+        raise e
+    except SQLAlchemyError as e:
+        db.rollback()
+        print(f"Erro no banco de dados ao remover alunos em lote: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro no banco de dados ao remover alunos em lote."
+        )
+    except Exception as e:
+        db.rollback()
+        print(f"Erro inesperado ao remover alunos em lote: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor ao remover alunos em lote."
+        )
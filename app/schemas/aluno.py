@@ -16,6 +16,26 @@ class AlunoBase(BaseModel):
 class AlunoCreate(AlunoBase):
     pass
 
+class AlunoImport(BaseModel):
+    matricula: str
+    nome: str
+    nickname: str
+    senha: str
+    avatar_id_fk: int
+    turma_id: Optional[int] = None
+
+class ResultadoImportacao(BaseModel):
+    linha: int
+    matricula: Optional[str] = None
+    status: str  # "criado" ou "erro"
+    detail: Optional[str] = None
+
+class ImportacaoAlunosResponse(BaseModel):
+    total: int
+    criados: int
+    erros: int
+    resultados: List[ResultadoImportacao]
+
 class AlunoUpdate(BaseModel):
     nome: Optional[str] = None
     nickname: Optional[str] = None
@@ -48,6 +68,21 @@ class AlunoResponse(BaseModel):
                 cleaned_badges.append(item)
                 
         return cleaned_badges
+
+class AlunoResumo(BaseModel):
+    matricula: str
+    nome: str
+    nickname: Optional[str] = None
+    xp: Optional[int] = None
+    nivel: Optional[int] = None
+    avatar_id_fk: Optional[int] = None
+    avatar: Optional[AvatarResponse] = None
+    badges: Optional[List[BadgeResponse]] = None
+
+class AlunoResumoList(BaseModel):
+    data: List[AlunoResumo]
+    next_cursor: Optional[str] = None
+
 class AlunoResponseList(BaseModel):
     data: List[AlunoResponse]
         
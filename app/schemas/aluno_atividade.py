@@ -1,18 +1,24 @@
+from decimal import Decimal
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Union
 
 class AlunoAtividadeBase(BaseModel):
     aluno_matricula_fk: str
     atividade_id_fk: int
-    nota: str
+    nota: Decimal
+
+# Notas de entrada ficam como vieram ("7.5", 7.5, "abc"): as rotas
+# convertem com notas.normalizar e respondem "Nota inválida" (400, ou só
+# na linha do lote) em vez de um 422 da requisição inteira.
+NotaEntrada = Optional[Union[str, Decimal]]
 
 class AlunoAtividadeCreate(BaseModel):
-    nota: Optional[str] = "0"
+    nota: NotaEntrada = "0"
 
 class AlunoAtividadeResponse(BaseModel):
     aluno_matricula_fk: str
     atividade_id_fk: int
-    nota: str
+    nota: Decimal
     
     class Config:
         from_attributes = True
@@ -22,10 +28,23 @@ class AlunoStatusAtividade(BaseModel):
     nome: str
     nickname: Optional[str] = None
     fez_atividade: bool
-    nota: Optional[str] = None
+    nota: Optional[Decimal] = None
     avatar: Optional[dict] = None
 
 class AlunosAtividadeResponse(BaseModel):
     atividade_id: int
     alunos: list[AlunoStatusAtividade]
 
+class NotaAlunoLote(BaseModel):
+    matricula: str
+    nota: NotaEntrada = "0"
+
+class ResultadoNotaLote(BaseModel):
+    matricula: str
+    status: str  # "criado", "atualizado" ou "erro"
+    nota: Optional[Decimal] = None
+    detail: Optional[str] = None
+
+class NotasLoteResponse(BaseModel):
+    atividade_id: int
+    resultados: list[ResultadoNotaLote]
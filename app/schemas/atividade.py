@@ -3,7 +3,7 @@ from decimal import Decimal
 from typing import List, Optional
 from pydantic import BaseModel
 from .badge import BadgeResponse
-from .turma import TurmaResponse
+from .turma import TurmaResponse, TurmaResumo
 
 class AtividadeBase(BaseModel):
     nome: str
@@ -32,6 +32,26 @@ class AtividadeRead(BaseModel):
     class Config:
         from_attributes = True
 
+class AtividadeResumo(BaseModel):
+    id: int
+    nome: str
+    descricao: Optional[str] = None
+    nota_max: Optional[Decimal] = None
+    pontos: Optional[int] = None
+    badge_id_fk: int
+    turma_id_fk: Optional[int] = None
+    data_entrega: datetime
+    badge: Optional[BadgeResponse] = None
+    turma: Optional[TurmaResumo] = None
+
+class AtividadeDoAluno(AtividadeResumo):
+    fez_atividade: bool
+    nota: Optional[Decimal] = None
+
+class AtividadeResumoList(BaseModel):
+    data: List[AtividadeResumo]
+    next_cursor: Optional[str] = None
+
 class AtividadeResponse(BaseModel):
     data: List[AtividadeRead]
         
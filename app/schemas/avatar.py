@@ -16,6 +16,7 @@ class AvatarResponse(AvatarBase):
 
 class AvatarResponseList(BaseModel):
     data: List[AvatarResponse]
+    next_cursor: Optional[str] = None
     
     class Config:
         from_attributes = True
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
 
 class BadgeBase(BaseModel):
@@ -12,11 +12,12 @@ class BadgeCreate(BadgeBase):
 class BadgeResponse(BadgeBase):
     id: int
     nome: str
-    requisito: str
-    caminho_foto: str
+    requisito: Optional[str] = None
+    caminho_foto: Optional[str] = None
     
 class BadgeResponseList(BaseModel):
     data: List[BadgeResponse]
+    next_cursor: Optional[str] = None
     class Config:
         from_attributes = True
         
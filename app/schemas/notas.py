@@ -0,0 +1,31 @@
+from decimal import Decimal
+from pydantic import BaseModel
+from typing import List, Optional
+
+class FaixaNotas(BaseModel):
+    de: int  # % da nota máxima
+    ate: int
+    alunos: int
+
+class AtividadeEstatisticas(BaseModel):
+    atividade_id: int
+    nome: str
+    nota_max: Optional[Decimal] = None
+    entregas: int
+    media: Optional[Decimal] = None
+    minima: Optional[Decimal] = None
+    maxima: Optional[Decimal] = None
+    distribuicao: List[FaixaNotas]
+
+class RankingNotasItem(BaseModel):
+    posicao: int
+    matricula: str
+    nome: Optional[str] = None
+    nickname: Optional[str] = None
+    entregas: int
+    media_percentual: Optional[Decimal] = None
+
+class TurmaEstatisticas(BaseModel):
+    turma_id: int
+    atividades: List[AtividadeEstatisticas]
+    ranking: List[RankingNotasItem]
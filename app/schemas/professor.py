@@ -30,6 +30,7 @@ class ProfessorResponse(BaseModel):
         
 class ProfessorResponseList(BaseModel):
     data: List[ProfessorResponse]
+    next_cursor: Optional[str] = None
     class Config:
         from_attributes = True
         
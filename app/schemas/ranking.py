@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class RankingItem(BaseModel):
+    posicao: int
+    matricula: str
+    nome: Optional[str] = None
+    nickname: Optional[str] = None
+    xp: int
+    nivel: Optional[int] = None
+    avatar_id_fk: Optional[int] = None
+
+class RankingResponse(BaseModel):
+    turma_id: Optional[int] = None
+    total: int
+    data: List[RankingItem]
+    aluno: Optional[RankingItem] = None
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional
-from .aluno import AlunoResponse
+from .aluno import AlunoResponse, AlunoResumo
 
 class TurmaBase(BaseModel):
     nome: str
@@ -23,6 +23,17 @@ class TurmaResponse(BaseModel):
         if v and hasattr(v, 'nome'):
             return v.nome
 
+class TurmaResumo(BaseModel):
+    id: int
+    nome: str
+    professor_matricula_fk: Optional[str] = None
+    professor: Optional[str] = None
+    alunos: Optional[List[AlunoResumo]] = None
+
+class TurmaResumoList(BaseModel):
+    data: List[TurmaResumo]
+    next_cursor: Optional[str] = None
+
 class TurmaResponseList(BaseModel):
     data: List[TurmaResponse]
 
@@ -34,3 +45,12 @@ class TurmaResponseSingle(BaseModel):
 
     class Config:
         from_attributes = True
+
+class ResultadoMatriculaLote(BaseModel):
+    matricula: str
+    status: str  # "matriculado", "ja_matriculado", "removido", "nao_matriculado" ou "erro"
+    detail: Optional[str] = None
+
+class MatriculasLoteResponse(BaseModel):
+    turma_id: int
+    resultados: List[ResultadoMatriculaLote]
@@ -1,10 +1,18 @@
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from fastapi import Depends, HTTPException
+from fastapi import Depends, Header, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from dotenv import load_dotenv
+import asyncio
+import hashlib
+import multiprocessing
 import os
+import secrets
+import threading
+import time
 
 load_dotenv()
 
@@ -12,18 +20,215 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login/aluno")  
+# Custo do bcrypt (2^rounds iterações) e pool de processos que executa o hash
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(os.cpu_count() or 1)))
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", str(max(BCRYPT_WORKERS, 1) * 16)))
 
-def hash_password(password: str) -> str:
+# Quantidade máxima de tokens já verificados mantidos em memória (0 desativa)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+
+# Token das rotas operacionais (/internal/* e /metrics); vazio = rotas desativadas (404)
+INTERNAL_TOKEN = os.getenv("INTERNAL_TOKEN", "")
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login/aluno")
+
+def _hash(password: str) -> str:
     # bcrypt aceita no máximo 72 caracteres
     if len(password) > 72:
         password = password[:72]
     return pwd_context.hash(password)
 
-def verify_password(plain_password, hashed_password):
+def _verify(plain_password, hashed_password) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def _hash_lote(passwords: list) -> list:
+    return [_hash(p) for p in passwords]
+
+class FilaCheia(HTTPException):
+    """
+    503 devolvido quando a fila do bcrypt está cheia.
+    """
+
+    def __init__(self):
+        super().__init__(
+            status_code=503,
+            detail="Servidor ocupado, tente novamente em instantes.",
+            headers={"Retry-After": "1"},
+        )
+
+class PasswordService:
+    """
+    Executa hash/verificação bcrypt em um pool de processos, fora do GIL
+    e do event loop. A fila é limitada: acima de max_pending tarefas
+    aguardando, novas chamadas recebem 503 em vez de aumentar a latência
+    de todos.
+    Com workers=0 o bcrypt roda no próprio processo.
+    """
+
+    def __init__(self, workers: int = BCRYPT_WORKERS, max_pending: int = BCRYPT_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _reservar(self):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise FilaCheia()
+            self.pending += 1
+
+    def _liberar(self, *_):
+        with self._lock:
+            self.pending -= 1
+
+    def _submit(self, fn, *args):
+        self._reservar()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._liberar()
+            raise
+        future.add_done_callback(self._liberar)
+        return future
+
+    def hash(self, password: str) -> str:
+        if self.workers <= 0:
+            return _hash(password)
+        return self._submit(_hash, password).result()
+
+    def verify(self, plain_password, hashed_password) -> bool:
+        if self.workers <= 0:
+            return _verify(plain_password, hashed_password)
+        return self._submit(_verify, plain_password, hashed_password).result()
+
+    async def hash_async(self, password: str) -> str:
+        if self.workers <= 0:
+            return await asyncio.to_thread(_hash, password)
+        return await asyncio.wrap_future(self._submit(_hash, password))
+
+    async def verify_async(self, plain_password, hashed_password) -> bool:
+        if self.workers <= 0:
+            return await asyncio.to_thread(_verify, plain_password, hashed_password)
+        return await asyncio.wrap_future(self._submit(_verify, plain_password, hashed_password))
+
+    async def hash_many_async(self, passwords) -> list:
+        """
+        Hash de vários passwords (importação em lote). Divide a lista em
+        uma fatia por worker, então ocupa no máximo `workers` vagas da fila
+        e sobra espaço para os logins.
+        """
+        passwords = list(passwords)
+        if not passwords:
+            return []
+        if self.workers <= 0:
+            return await asyncio.to_thread(_hash_lote, passwords)
+
+        n = min(self.workers, len(passwords))
+        fatias = await asyncio.gather(*(
+            asyncio.wrap_future(self._submit(_hash_lote, passwords[i::n])) for i in range(n)
+        ))
+        hashes = [None] * len(passwords)
+        for i, fatia in enumerate(fatias):
+            hashes[i::n] = fatia
+        return hashes
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+password_service = PasswordService()
+
+def hash_password(password: str) -> str:
+    return password_service.hash(password)
+
+def verify_password(plain_password, hashed_password):
+    return password_service.verify(plain_password, hashed_password)
+
+async def hash_password_async(password: str) -> str:
+    return await password_service.hash_async(password)
+
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    return await password_service.verify_async(plain_password, hashed_password)
+
+async def hash_passwords_async(passwords) -> list:
+    return await password_service.hash_many_async(passwords)
+
+class TokenCache:
+    """
+    Cache LRU de tokens JWT já verificados, indexado pelo SHA-256 do token.
+    Cada entrada guarda o "sub" e vale até o "exp" do próprio token.
+    """
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        if self.maxsize <= 0:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                subject, exp = entry
+                if exp > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return subject
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, subject: str, exp):
+        if self.maxsize <= 0 or exp is None:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (subject, float(exp))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+token_cache = TokenCache()
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -31,6 +236,10 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 def get_current_user(token: str = Depends(oauth2_scheme)):
+    matricula = token_cache.get(token)
+    if matricula is not None:
+        return matricula
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         matricula: str = payload.get("sub")
@@ -40,10 +249,27 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
                 detail="Token inválido",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        token_cache.put(token, matricula, payload.get("exp"))
         return matricula
     except JWTError:
         raise HTTPException(
             status_code=401,
             detail="Token inválido ou expirado",
             headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+        )
+
+def verificar_token_interno(authorization: str | None = Header(None)):
+    """
+    Protege as rotas operacionais: exige "Authorization: Bearer <INTERNAL_TOKEN>".
+    Sem INTERNAL_TOKEN configurado as rotas respondem 404.
+    """
+    if not INTERNAL_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    esquema, _, token = (authorization or "").partition(" ")
+    if esquema.lower() != "bearer" or not secrets.compare_digest(token.encode(), INTERNAL_TOKEN.encode()):
+        raise HTTPException(
+            status_code=401,
+            detail="Token interno inválido",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
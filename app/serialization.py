@@ -0,0 +1,100 @@
+from decimal import Decimal
+from functools import lru_cache
+from types import UnionType
+from typing import List, Union, get_args, get_origin
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+import orjson
+
+# Caminho rápido de resposta para dados que já vêm tipados do banco
+# (linhas das projeções em app/projections.py). Em vez de validar os
+# dicts contra o response_model e serializar o resultado (duas
+# passadas que recriam toda a árvore), os dicts são só recortados para
+# os campos do schema, com os valores padrão, e vão direto para o
+# orjson. Para dados que passariam na validação, o corpo gerado é igual
+# ao do caminho normal do FastAPI; o que a validação rejeitaria (ex.:
+# None num campo obrigatório) sai como está, sem erro. Por isso, nos
+# schemas usados aqui, campos vindos de colunas anuláveis são Optional.
+#
+# Subárvores compartilhadas (a mesma turma expandida em várias
+# atividades) são recortadas uma vez por resposta.
+#
+# Use apenas com dados confiáveis e já no formato do schema: validadores
+# (ex.: AlunoResponse.parse_badges) e conversões de tipo não rodam. O
+# response_model da rota continua valendo para a documentação.
+
+def _aninhado(anotacao):
+    """
+    (modelo, lista?) se a anotação for Model, List[Model] ou um Optional
+    deles; None para os demais tipos.
+    """
+    origem = get_origin(anotacao)
+    if origem in (Union, UnionType):
+        tipos = [t for t in get_args(anotacao) if t is not type(None)]
+        return _aninhado(tipos[0]) if len(tipos) == 1 else None
+    if origem in (list, List):
+        tipos = get_args(anotacao)
+        if tipos and isinstance(tipos[0], type) and issubclass(tipos[0], BaseModel):
+            return tipos[0], True
+        return None
+    if isinstance(anotacao, type) and issubclass(anotacao, BaseModel):
+        return anotacao, False
+    return None
+
+@lru_cache(maxsize=None)
+def _campos(modelo) -> tuple:
+    # (nome no dict, nome no JSON, padrão, (modelo aninhado, lista?) ou None)
+    return tuple(
+        (
+            nome,
+            campo.serialization_alias or campo.alias or nome,
+            None if campo.is_required() else campo.get_default(call_default_factory=True),
+            _aninhado(campo.annotation),
+        )
+        for nome, campo in modelo.model_fields.items()
+    )
+
+def moldar(modelo, dados, _memo=None):
+    """
+    Recorta `dados` (dict ou lista de dicts) no formato de `modelo`,
+    recursivamente, sem validar: campos obrigatórios ausentes ou None
+    saem como null.
+    """
+    memo = {} if _memo is None else _memo
+    if isinstance(dados, list):
+        return [moldar(modelo, item, memo) for item in dados]
+
+    chave = (modelo, id(dados))
+    pronto = memo.get(chave)
+    if pronto is not None:
+        return pronto
+
+    pronto = {}
+    for nome, saida, padrao, aninhado in _campos(modelo):
+        valor = dados.get(nome, padrao)
+        if valor is not None and aninhado is not None:
+            valor = moldar(aninhado[0], valor, memo)
+        pronto[saida] = valor
+    memo[chave] = pronto
+    return pronto
+
+def _default(valor):
+    # Mesmo formato do Pydantic para Decimal (ex.: nota_max "10.00")
+    if isinstance(valor, Decimal):
+        return str(valor)
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+class TrustedORJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse que também aceita Decimal (datas o orjson já trata).
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+def resposta(modelo, dados, **kwargs) -> TrustedORJSONResponse:
+    """
+    Resposta JSON de `dados` no formato de `modelo` (ou de uma lista
+    dele, se `dados` for lista), sem passar pelo response_model.
+    """
+    return TrustedORJSONResponse(moldar(modelo, dados), **kwargs)
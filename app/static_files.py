@@ -0,0 +1,91 @@
+import json
+import os
+import re
+from urllib.parse import parse_qs
+import anyio
+from fastapi.responses import RedirectResponse
+from fastapi.staticfiles import StaticFiles
+
+# Arquivos gerados por scripts/build_static.py têm o hash do conteúdo no
+# nome (ex.: avatar1.3f2a9c0d1b4e.webp) e nunca mudam.
+FINGERPRINT_RE = re.compile(r"\.[0-9a-f]{12}(\.thumb)?\.[a-z0-9]+$")
+
+CACHE_IMUTAVEL = "public, max-age=31536000, immutable"
+CACHE_PADRAO = "public, max-age=3600"
+
+# Ordem de preferência das variantes quando o cliente as aceita
+FORMATOS = (("avif", "image/avif"), ("webp", "image/webp"))
+
+class AssetStaticFiles(StaticFiles):
+    """
+    StaticFiles com cabeçalhos de cache e negociação de formato.
+
+    - Caminhos com fingerprint (/static/dist/...) recebem cache imutável
+      de 1 ano.
+    - Caminhos originais (/static/imagens/..., os gravados em
+      caminho_foto) presentes no manifesto redirecionam (302) para a
+      melhor variante com fingerprint aceita pelo cliente (AVIF > WebP >
+      original); ?size=thumb aponta para a miniatura. O redirecionamento
+      fica em cache por CACHE_PADRAO (Vary: Accept) e a imagem em si por
+      um ano: depois que o cache do redirecionamento expira, o navegador
+      só revalida o 302, sem baixar a imagem de novo.
+    Sem manifesto (build não executado) o comportamento é o do StaticFiles.
+    """
+
+    def __init__(self, *args, manifest: str = "dist/manifest.json", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.manifest = self._carregar_manifest(manifest)
+
+    def _carregar_manifest(self, manifest: str) -> dict:
+        caminho = os.path.join(str(self.directory), manifest)
+        try:
+            with open(caminho, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Manifesto de assets inválido ({caminho}): {e}")
+            return {}
+
+    def _variantes(self, path: str, scope) -> list:
+        """
+        Caminhos com fingerprint para `path`, na ordem de preferência
+        para o Accept do cliente (vazio se não estiver no manifesto).
+        """
+        entrada = self.manifest.get(path)
+        if entrada is None:
+            return []
+
+        query = parse_qs(scope.get("query_string", b"").decode())
+        if query.get("size") == ["thumb"] and entrada.get("thumb"):
+            opcoes = entrada["thumb"]
+        else:
+            opcoes = {"original": entrada["original"], **entrada.get("variantes", {})}
+
+        accept = ""
+        for nome, valor in scope.get("headers", []):
+            if nome == b"accept":
+                accept = valor.decode("latin-1")
+                break
+
+        variantes = [opcoes[formato] for formato, mime in FORMATOS if formato in opcoes and mime in accept]
+        if opcoes.get("original"):
+            variantes.append(opcoes["original"])
+        return variantes
+
+    async def get_response(self, path: str, scope):
+        for variante in self._variantes(path, scope):
+            _, stat = await anyio.to_thread.run_sync(self.lookup_path, variante)
+            if stat is not None:
+                # root_path inclui o prefixo do mount (/static)
+                return RedirectResponse(
+                    f"{scope.get('root_path', '')}/{variante}",
+                    status_code=302,
+                    headers={"Cache-Control": CACHE_PADRAO, "Vary": "Accept"},
+                )
+
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            imutavel = FINGERPRINT_RE.search(path)
+            response.headers["Cache-Control"] = CACHE_IMUTAVEL if imutavel else CACHE_PADRAO
+        return response
@@ -0,0 +1,92 @@
+"""
+Mede GET /atividades/{id}/alunos (tela de correção do professor) para
+uma turma grande: consultas por requisição, latência e tamanho da
+resposta.
+
+Usa um SQLite temporário populado com uma turma de --alunos alunos, dos
+quais ~70% já entregaram a atividade, mais alguns alunos de fora da
+turma que também entregaram.
+
+Uso:
+    python -m benchmarks.alunos_atividade --alunos 500 --requisicoes 50
+"""
+import argparse
+import random
+import time
+
+from benchmarks import harness
+
+def _popular(alunos: int, extras: int):
+    from datetime import datetime
+    from decimal import Decimal
+    from sqlalchemy import insert
+    from app.database import Base, engine
+    from app.models import Aluno, AlunoAtividade, Atividade, Avatar, Badge, Professor, Turma, aluno_turma
+
+    rnd = random.Random(42)
+    Base.metadata.create_all(engine)
+    matriculas = [f"a{i:05d}" for i in range(alunos + extras)]
+    with engine.begin() as conn:
+        conn.execute(insert(Avatar), [
+            {"id": i, "nome": f"Avatar {i}", "caminho_foto": f"/imagens/avatares/avatar{i}.png"} for i in range(1, 11)
+        ])
+        conn.execute(insert(Badge), [{"id": 1, "nome": "Badge", "requisito": "", "caminho_foto": "/imagens/badges/badge1.png"}])
+        conn.execute(insert(Professor), [{"matricula": "prof", "nome": "Prof", "senha": "x", "avatar_id_fk": 1}])
+        conn.execute(insert(Turma), [{"id": 1, "nome": "Turma", "professor_matricula_fk": "prof"}])
+        conn.execute(insert(Atividade), [{
+            "id": 1, "nome": "Atividade", "descricao": "-", "nota_max": 10, "pontos": 100,
+            "data_entrega": datetime(2026, 1, 1), "badge_id_fk": 1, "turma_id_fk": 1
+        }])
+        conn.execute(insert(Aluno), [
+            {"matricula": m, "nome": f"Aluno {m}", "nickname": f"nick_{m}", "senha": "x",
+             "xp": 0, "nivel": 1, "avatar_id_fk": rnd.randint(1, 10)}
+            for m in matriculas
+        ])
+        conn.execute(insert(aluno_turma), [
+            {"aluno_matricula_fk": m, "turma_id_fk": 1} for m in matriculas[:alunos]
+        ])
+        conn.execute(insert(AlunoAtividade), [
+            {"aluno_matricula_fk": m, "atividade_id_fk": 1, "nota": Decimal(rnd.randint(0, 10))}
+            for i, m in enumerate(matriculas) if i >= alunos or rnd.random() < 0.7
+        ])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alunos", type=int, default=500)
+    parser.add_argument("--extras", type=int, default=5, help="alunos fora da turma que entregaram")
+    parser.add_argument("--requisicoes", type=int, default=50)
+    args = parser.parse_args()
+
+    harness.configurar_ambiente("alunos_atividade")
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from app.database import engine
+    from app.main import app
+
+    _popular(args.alunos, args.extras)
+
+    consultas = [0]
+    event.listen(engine, "before_cursor_execute", lambda *_: consultas.__setitem__(0, consultas[0] + 1))
+
+    with TestClient(app) as client:
+        resposta = client.get("/atividades/1/alunos")  # aquecimento
+        assert resposta.status_code == 200, resposta.text
+        total_alunos = len(resposta.json()["alunos"])
+
+        consultas[0] = 0
+        tempos = []
+        for _ in range(args.requisicoes):
+            inicio = time.perf_counter()
+            resposta = client.get("/atividades/1/alunos")
+            tempos.append((time.perf_counter() - inicio) * 1000)
+
+    latencia = harness.resumo_latencias(tempos)
+    print(f"alunos na resposta:      {total_alunos}")
+    print(f"consultas por requisição: {consultas[0] / args.requisicoes:.1f}")
+    print(f"tamanho da resposta:      {len(resposta.content)} bytes")
+    print(f"latência média:           {latencia['mean']:.2f} ms")
+    print(f"latência p50 / p95 / p99: {latencia['p50']:.2f} / {latencia['p95']:.2f} / {latencia['p99']:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Mede logins (verificações bcrypt) por segundo em função do número de
+workers do PasswordService.
+
+Uso:
+    python -m benchmarks.bcrypt_workers --logins 64 --workers 1 2 4 --rounds 10
+"""
+import argparse
+import asyncio
+import os
+import time
+
+def _rodar(workers: int, logins: int) -> float:
+    from app.security import PasswordService, _hash
+
+    service = PasswordService(workers=workers, max_pending=logins)
+    hashed = _hash("senha-de-teste")
+    try:
+        # Aquece o pool (inicialização dos processos fora da medição)
+        async def aquecer():
+            await asyncio.gather(*(
+                service.verify_async("senha-de-teste", hashed) for _ in range(max(workers, 1) * 2)
+            ))
+
+        asyncio.run(aquecer())
+
+        async def tempestade():
+            return await asyncio.gather(*(
+                service.verify_async("senha-de-teste", hashed) for _ in range(logins)
+            ))
+
+        inicio = time.perf_counter()
+        resultados = asyncio.run(tempestade())
+        duracao = time.perf_counter() - inicio
+    finally:
+        service.shutdown()
+
+    assert all(resultados)
+    return logins / duracao
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--rounds", type=int, default=None, help="sobrescreve BCRYPT_ROUNDS")
+    args = parser.parse_args()
+
+    if args.rounds is not None:
+        os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+
+    print(f"{'workers':>8} {'logins/s':>10}")
+    for workers in sorted(set(args.workers)):
+        print(f"{workers:>8} {_rodar(workers, args.logins):>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Cenários de carga. Cada cenário é uma corrotina
+    cenario(cliente, dados, rnd, worker, concorrencia)
+que executa uma "iteração" (uma visita típica) usando o ClienteMedido
+de benchmarks/harness.py. As escolhas usam só `rnd`, então a sequência
+de requisições é a mesma a cada execução.
+"""
+from benchmarks.dataset import SENHA
+
+async def login(cliente, dados, rnd, worker, concorrencia):
+    """
+    Tempestade de logins (início de aula): um login de aluno por
+    iteração e, de vez em quando, de um professor.
+    """
+    if rnd.random() < 0.1:
+        matricula = rnd.choice(dados.professores)
+        await cliente.post("/login/professor", json={"matricula": matricula, "senha": SENHA})
+    else:
+        matricula = rnd.choice(dados.matriculas)
+        await cliente.post("/login/aluno", json={"matricula": matricula, "senha": SENHA})
+
+async def correcao(cliente, dados, rnd, worker, concorrencia):
+    """
+    Professor corrigindo: abre a turma e a lista de alunos de uma
+    atividade, lança a entrega de um aluno pendente, corrige a nota e
+    desfaz o lançamento (a base volta ao estado inicial). Cada worker
+    usa uma fatia própria dos pendentes, sem disputar o mesmo registro.
+    """
+    turma_id = rnd.choice([t for t, atividades in dados.atividades.items() if atividades])
+    atividade_id = rnd.choice(dados.atividades[turma_id])
+    await cliente.get("/turmas/{id}", id=turma_id)
+    await cliente.get("/atividades/{id}/alunos", id=atividade_id)
+
+    fatia = dados.pendentes[worker::concorrencia]
+    if not fatia:
+        return
+    atividade_id, matricula = rnd.choice(fatia)
+    await cliente.post("/atividades/{id}/alunos/{matricula}", id=atividade_id, matricula=matricula,
+                       json={"nota": "7"})
+    await cliente.put("/atividades/{id}/alunos/{matricula}/nota", id=atividade_id, matricula=matricula,
+                      json={"nota": "9"})
+    await cliente.delete("/atividades/{id}/alunos/{matricula}", id=atividade_id, matricula=matricula)
+
+async def painel_aluno(cliente, dados, rnd, worker, concorrencia):
+    """
+    Tela inicial do aluno: perfil, atividades (todas e pendentes),
+    badges, turmas e rankings geral e da turma.
+    """
+    matricula = rnd.choice(dados.matriculas)
+    turma_id = rnd.choice(dados.turmas_do_aluno[matricula])
+    await cliente.get("/alunos/{matricula}", matricula=matricula)
+    await cliente.get("/alunos/{matricula}/atividades", matricula=matricula)
+    await cliente.get("/alunos/{matricula}/atividades", matricula=matricula, params={"pendentes": "true"})
+    await cliente.get("/alunos/{matricula}/badges", matricula=matricula)
+    await cliente.get("/alunos/{matricula}/turmas", matricula=matricula)
+    await cliente.get("/ranking/", params={"matricula": matricula})
+    await cliente.get("/turmas/{id}/ranking", id=turma_id, params={"matricula": matricula})
+
+async def catalogo(cliente, dados, rnd, worker, concorrencia):
+    """
+    Navegação nos catálogos: badges (revalidado com If-None-Match, como
+    faz o navegador), avatares paginados, uma imagem estática e uma
+    página de atividades e de turmas.
+    """
+    resposta = await cliente.get("/badges/")
+    tag = resposta.headers.get("etag")
+    if tag:
+        await cliente.get("/badges/", headers={"If-None-Match": tag}, esperado=(304,))
+
+    after = None
+    for _ in range(3):
+        params = {"limit": 20}
+        if after:
+            params["after"] = after
+        resposta = await cliente.get("/avatares/", params=params)
+        after = resposta.json().get("next_cursor")
+        if not after:
+            break
+
+    avatares = resposta.json().get("data") or []
+    if avatares:
+        avatar = rnd.choice(avatares)
+        await cliente.get("/static/{caminho}", caminho=avatar["caminho_foto"].lstrip("/"))
+
+    await cliente.get("/atividades/", params={"limit": 50, "expand": "badge"})
+    await cliente.get("/turmas/", params={"limit": 50})
+
+CENARIOS = {
+    "login": login,
+    "correcao": correcao,
+    "painel_aluno": painel_aluno,
+    "catalogo": catalogo,
+}
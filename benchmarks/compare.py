@@ -0,0 +1,87 @@
+"""
+Compara dois resultados de benchmarks/run.py (ex.: main e o branch).
+
+Mostra, por cenário e por rota, vazão, p50/p95/p99 e consultas por
+requisição do resultado base e do novo, com a variação percentual.
+Sai com código 1 se algum cenário piorou mais que --tolerancia no p95
+ou na vazão, ou passou a fazer mais consultas por requisição.
+
+Uso:
+    python -m benchmarks.compare resultados/main.json resultados/atual.json
+    python -m benchmarks.compare base.json novo.json --rotas --tolerancia 15
+"""
+import argparse
+import json
+
+def _carregar(caminho: str) -> dict:
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+def _variacao(base: float, novo: float) -> float:
+    if not base:
+        return 0.0
+    return (novo - base) / base * 100
+
+def _linha(nome: str, base: dict, novo: dict) -> str:
+    partes = [f"{nome:<48}"]
+    for chave in ("p50", "p95", "p99"):
+        b, n = base["latency_ms"][chave], novo["latency_ms"][chave]
+        partes.append(f"{chave} {b:>8.2f} -> {n:>8.2f} ({_variacao(b, n):+6.1f}%)")
+    partes.append(f"consultas {base['queries_per_request']:>5.1f} -> {novo['queries_per_request']:>5.1f}")
+    return "  ".join(partes)
+
+def comparar(base: dict, novo: dict, tolerancia: float, rotas: bool) -> list:
+    """
+    Imprime a comparação e devolve a lista de regressões encontradas.
+    """
+    for rotulo, r in (("base", base), ("novo", novo)):
+        meta = r.get("meta", {})
+        commit = (meta.get("commit") or "?")[:12] + ("+" if meta.get("dirty") else "")
+        print(f"{rotulo}: {commit} {meta.get('timestamp', '')} {meta.get('database', '')}")
+    if base.get("params", {}).get("dataset") != novo.get("params", {}).get("dataset"):
+        print("atenção: as bases foram geradas com parâmetros diferentes")
+    print()
+
+    regressoes = []
+    for nome, b in base.get("scenarios", {}).items():
+        n = novo.get("scenarios", {}).get(nome)
+        if n is None:
+            print(f"{nome}: ausente no resultado novo")
+            continue
+        vazao = _variacao(b["throughput_rps"], n["throughput_rps"])
+        print(f"== {nome}: {b['throughput_rps']:.1f} -> {n['throughput_rps']:.1f} req/s ({vazao:+.1f}%)")
+        print(_linha("total", b, n))
+        if rotas:
+            for rota, br in b.get("routes", {}).items():
+                nr = n.get("routes", {}).get(rota)
+                if nr is not None:
+                    print(_linha(rota, br, nr))
+
+        if _variacao(b["latency_ms"]["p95"], n["latency_ms"]["p95"]) > tolerancia:
+            regressoes.append(f"{nome}: p95 piorou mais de {tolerancia}%")
+        if vazao < -tolerancia:
+            regressoes.append(f"{nome}: vazão caiu mais de {tolerancia}%")
+        if n["queries_per_request"] > b["queries_per_request"]:
+            regressoes.append(f"{nome}: mais consultas por requisição")
+        if n["errors"] > b["errors"]:
+            regressoes.append(f"{nome}: mais erros ({b['errors']} -> {n['errors']})")
+    return regressoes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("novo")
+    parser.add_argument("--tolerancia", type=float, default=10.0, help="piora aceitável em %% (p95 e vazão)")
+    parser.add_argument("--rotas", action="store_true", help="detalha cada rota")
+    args = parser.parse_args()
+
+    regressoes = comparar(_carregar(args.base), _carregar(args.novo), args.tolerancia, args.rotas)
+    print()
+    for regressao in regressoes:
+        print(f"REGRESSÃO {regressao}")
+    if not regressoes:
+        print("sem regressões acima da tolerância")
+    raise SystemExit(1 if regressoes else 0)
+
+if __name__ == "__main__":
+    main()
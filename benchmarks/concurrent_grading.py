@@ -0,0 +1,132 @@
+"""
+Verifica a contabilidade de XP sob lançamentos concorrentes.
+
+Cria uma turma com N atividades e um aluno, lança as N atividades em
+paralelo (uma thread e uma sessão por lançamento) e confere se o XP e o
+nível finais são exatamente a soma dos pontos. Em seguida desfaz metade
+dos lançamentos, também em paralelo, e confere de novo.
+
+Por padrão usa um SQLite temporário; para rodar contra o MySQL passe
+--database-url (as tabelas são criadas se não existirem e os dados de
+teste são removidos ao final).
+
+Uso:
+    python -m benchmarks.concurrent_grading --lancamentos 50 --pontos 150
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from benchmarks import harness
+
+MATRICULA = "bench-xp-0001"
+
+def _preparar(lancamentos: int, pontos: int):
+    from app.database import Base, SessionLocal, engine
+    from app.models import Aluno, Atividade, Badge, Professor, Turma, aluno_turma
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        professor = Professor(matricula="bench-prof-0001", nome="Bench", senha="x")
+        turma = Turma(nome="Bench XP", professor=professor)
+        aluno = Aluno(matricula=MATRICULA, nome="Bench", nickname=MATRICULA, senha="x", xp=0, nivel=1)
+        db.add_all([professor, turma, aluno])
+        db.flush()
+        db.execute(aluno_turma.insert().values(aluno_matricula_fk=MATRICULA, turma_id_fk=turma.id))
+        # Um badge por atividade: só o UPDATE de XP disputa a mesma linha
+        atividades = [
+            Atividade(
+                nome=f"bench {i}", descricao="bench", nota_max=10, pontos=pontos,
+                data_entrega=datetime(2030, 1, 1), turma_id_fk=turma.id,
+                badge=Badge(nome=f"bench {i}", requisito="bench")
+            )
+            for i in range(lancamentos)
+        ]
+        db.add_all(atividades)
+        db.commit()
+        return turma.id, [a.id for a in atividades], [a.badge_id_fk for a in atividades]
+    finally:
+        db.close()
+
+def _limpar(turma_id: int, badge_ids):
+    from sqlalchemy import delete
+    from app.database import SessionLocal
+    from app.models import Aluno, AlunoAtividade, AlunoBadge, Atividade, Badge, Professor, Turma, aluno_turma
+
+    db = SessionLocal()
+    try:
+        db.execute(delete(AlunoAtividade).where(AlunoAtividade.aluno_matricula_fk == MATRICULA))
+        db.execute(delete(AlunoBadge).where(AlunoBadge.aluno_matricula_fk == MATRICULA))
+        db.execute(delete(Atividade).where(Atividade.turma_id_fk == turma_id))
+        db.execute(delete(Badge).where(Badge.id.in_(badge_ids)))
+        db.execute(delete(aluno_turma).where(aluno_turma.c.turma_id_fk == turma_id))
+        db.execute(delete(Turma).where(Turma.id == turma_id))
+        db.execute(delete(Aluno).where(Aluno.matricula == MATRICULA))
+        db.execute(delete(Professor).where(Professor.matricula == "bench-prof-0001"))
+        db.commit()
+    finally:
+        db.close()
+
+def _em_paralelo(funcao, atividade_ids, threads: int):
+    from app.database import SessionLocal
+
+    def executar(atividade_id):
+        db = SessionLocal()
+        try:
+            return funcao(atividade_id, db)
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(executar, atividade_ids))
+
+def _conferir(esperado: int, etapa: str):
+    from app import progression
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        xp, nivel = progression.obter_progresso(db, MATRICULA)
+    finally:
+        db.close()
+
+    nivel_esperado = 1 + esperado // progression.XP_POR_NIVEL
+    ok = xp == esperado and nivel == nivel_esperado
+    print(f"{etapa:<10} xp={xp} (esperado {esperado}) nivel={nivel} (esperado {nivel_esperado}) {'OK' if ok else 'FALHOU'}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lancamentos", type=int, default=50)
+    parser.add_argument("--pontos", type=int, default=150)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    harness.configurar_ambiente("concurrent_grading", args.database_url)
+
+    from app.routers.atividade import desmarcar_aluno_fez_atividade, marcar_aluno_fez_atividade
+    from app.schemas.aluno_atividade import AlunoAtividadeCreate
+
+    turma_id, atividade_ids, badge_ids = _preparar(args.lancamentos, args.pontos)
+    try:
+        _em_paralelo(
+            lambda atividade_id, db: marcar_aluno_fez_atividade(atividade_id, MATRICULA, AlunoAtividadeCreate(nota="10"), db),
+            atividade_ids, args.threads
+        )
+        ok = _conferir(args.lancamentos * args.pontos, "marcar")
+
+        metade = atividade_ids[: args.lancamentos // 2]
+        _em_paralelo(
+            lambda atividade_id, db: desmarcar_aluno_fez_atividade(atividade_id, MATRICULA, db),
+            metade, args.threads
+        )
+        ok = _conferir((args.lancamentos - len(metade)) * args.pontos, "desmarcar") and ok
+    finally:
+        _limpar(turma_id, badge_ids)
+
+    raise SystemExit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Gerador determinístico da base usada pelos benchmarks.
+
+A mesma semente e os mesmos parâmetros produzem sempre as mesmas linhas
+(ids, matrículas, notas, datas; só o sal do hash da senha muda), em
+SQLite ou MySQL, para que resultados de commits diferentes sejam
+comparáveis.
+
+Forma dos dados:
+- `turmas` turmas, divididas entre professores (um para cada 5 turmas);
+- `alunos` alunos distribuídos em rodízio pelas turmas; ~20% também
+  matriculados em uma segunda turma;
+- `atividades` atividades distribuídas em rodízio pelas turmas, com
+  pontos de 50 a 300, entregas ao longo de um semestre e um badge
+  sorteado entre `badges`;
+- AlunoAtividade: cada aluno entregou ~`entrega` das atividades de suas
+  turmas (mais as mais antigas que as recentes), com nota inteira
+  entre 0 e nota_max;
+- AlunoBadge e XP/nível coerentes com as entregas, como se cada uma
+  tivesse passado por POST /atividades/{id}/alunos/{matricula}.
+
+Todos os usuários têm a senha SENHA (um único hash bcrypt, com o
+BCRYPT_ROUNDS configurado).
+
+Uso direto (popula DATABASE_URL, que deve estar vazio):
+    python -m benchmarks.dataset --turmas 20 --alunos 600 --atividades 200
+"""
+import argparse
+import os
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+SENHA = "senha-benchmark"
+INICIO_SEMESTRE = datetime(2025, 2, 3, 23, 59)
+PASTA_IMAGENS = os.path.join(os.path.dirname(__file__), "..", "app", "static", "imagens")
+# Linhas por INSERT executemany
+LOTE = 1000
+
+@dataclass
+class Parametros:
+    turmas: int = 20
+    alunos: int = 600
+    atividades: int = 200
+    badges: int = 15
+    avatares: int = 40
+    entrega: float = 0.7
+    seed: int = 42
+
+@dataclass
+class Dataset:
+    """
+    O que os cenários precisam saber sobre a base gerada.
+    """
+    parametros: Parametros
+    professores: list = field(default_factory=list)
+    # turma_id -> matrículas
+    turmas: dict = field(default_factory=dict)
+    # matrícula -> turma_ids
+    turmas_do_aluno: dict = field(default_factory=dict)
+    # turma_id -> atividade_ids
+    atividades: dict = field(default_factory=dict)
+    # (atividade_id, matrícula) de alunos da turma que ainda não entregaram
+    pendentes: list = field(default_factory=list)
+    linhas: dict = field(default_factory=dict)
+
+    @property
+    def matriculas(self) -> list:
+        return list(self.turmas_do_aluno)
+
+def matricula(i: int) -> str:
+    return f"a{i:06d}"
+
+def nickname(i: int) -> str:
+    return f"nick{i:06d}"
+
+def _imagens(pasta: str, quantidade: int) -> list:
+    try:
+        arquivos = sorted(os.listdir(os.path.join(PASTA_IMAGENS, pasta)))
+    except FileNotFoundError:
+        arquivos = []
+    if not arquivos:
+        arquivos = ["sem-imagem.png"]
+    return [f"/imagens/{pasta}/{arquivos[i % len(arquivos)]}" for i in range(quantidade)]
+
+def _inserir(conn, tabela, linhas):
+    from sqlalchemy import insert
+
+    for i in range(0, len(linhas), LOTE):
+        conn.execute(insert(tabela), linhas[i:i + LOTE])
+
+def gerar(p: Parametros):
+    """
+    Monta as linhas de cada tabela sem tocar no banco.
+    Retorna (Dataset, {nome da tabela: linhas}).
+    """
+    from app.progression import XP_POR_NIVEL
+    from app.security import _hash
+
+    rnd = random.Random(p.seed)
+    senha = _hash(SENHA)
+    dados = Dataset(parametros=p)
+
+    avatares = [
+        {"id": i + 1, "nome": f"Avatar {i + 1}", "caminho_foto": caminho}
+        for i, caminho in enumerate(_imagens("avatares", p.avatares))
+    ]
+    badges = [
+        {"id": i + 1, "nome": f"Badge {i + 1}", "requisito": f"Requisito do badge {i + 1}", "caminho_foto": caminho}
+        for i, caminho in enumerate(_imagens("badges", p.badges))
+    ]
+
+    dados.professores = [f"prof{i:04d}" for i in range(max(1, p.turmas // 5))]
+    professores = [
+        {"matricula": m, "nome": f"Professor {i}", "senha": senha, "avatar_id_fk": rnd.randint(1, p.avatares)}
+        for i, m in enumerate(dados.professores)
+    ]
+    turmas = [
+        {"id": t, "nome": f"Turma {t}", "professor_matricula_fk": dados.professores[(t - 1) % len(dados.professores)]}
+        for t in range(1, p.turmas + 1)
+    ]
+    dados.turmas = {t["id"]: [] for t in turmas}
+
+    alunos = []
+    matriculas = []
+    for i in range(p.alunos):
+        m = matricula(i)
+        alunos.append({
+            "matricula": m, "nome": f"Aluno {i}", "nickname": nickname(i), "senha": senha,
+            "xp": 0, "nivel": 1, "avatar_id_fk": rnd.randint(1, p.avatares),
+        })
+        primeira = i % p.turmas + 1
+        ids = [primeira]
+        if p.turmas > 1 and rnd.random() < 0.2:
+            ids.append(rnd.choice([t for t in range(1, p.turmas + 1) if t != primeira]))
+        dados.turmas_do_aluno[m] = ids
+        for t in ids:
+            dados.turmas[t].append(m)
+            matriculas.append({"aluno_matricula_fk": m, "turma_id_fk": t})
+
+    atividades = []
+    dados.atividades = {t: [] for t in dados.turmas}
+    for k in range(1, p.atividades + 1):
+        t = (k - 1) % p.turmas + 1
+        ordem = len(dados.atividades[t])
+        dados.atividades[t].append(k)
+        atividades.append({
+            "id": k, "nome": f"Atividade {k}", "descricao": f"Descrição da atividade {k}",
+            "nota_max": rnd.choice((10, 10, 10, 20, 100)), "pontos": rnd.randrange(50, 301, 50),
+            "data_entrega": INICIO_SEMESTRE + timedelta(days=7 * ordem + rnd.randint(0, 6)),
+            "badge_id_fk": rnd.randint(1, p.badges), "turma_id_fk": t,
+        })
+
+    por_id = {a["id"]: a for a in atividades}
+    por_matricula = {a["matricula"]: a for a in alunos}
+    entregas = []
+    conquistas = {}
+    for t, membros in dados.turmas.items():
+        total = len(dados.atividades[t])
+        for posicao, atividade_id in enumerate(dados.atividades[t]):
+            atividade = por_id[atividade_id]
+            # As primeiras do semestre têm mais entregas que as últimas
+            chance = min(1.0, p.entrega * (1.3 - 0.6 * posicao / max(total - 1, 1)))
+            for m in membros:
+                if rnd.random() >= chance:
+                    dados.pendentes.append((atividade_id, m))
+                    continue
+                entregas.append({
+                    "aluno_matricula_fk": m, "atividade_id_fk": atividade_id,
+                    "nota": Decimal(rnd.randint(0, atividade["nota_max"])),
+                })
+                por_matricula[m]["xp"] += atividade["pontos"]
+                chave = (m, atividade["badge_id_fk"])
+                if chave not in conquistas:
+                    conquistas[chave] = {
+                        "aluno_matricula_fk": m, "badge_id_fk": atividade["badge_id_fk"],
+                        "data_conquista": atividade["data_entrega"].date() - timedelta(days=rnd.randint(0, 6)),
+                    }
+    for aluno in alunos:
+        aluno["nivel"] = 1 + aluno["xp"] // XP_POR_NIVEL
+
+    linhas = {
+        "Avatar": avatares, "Badge": badges, "Professor": professores, "Turma": turmas,
+        "Aluno": alunos, "Aluno_Turma": matriculas, "Atividade": atividades,
+        "Aluno_Atividade": entregas, "Aluno_Badge": list(conquistas.values()),
+    }
+    dados.linhas = {nome: len(valores) for nome, valores in linhas.items()}
+    return dados, linhas
+
+def popular(engine, p: Parametros = None, criar_tabelas: bool = True) -> Dataset:
+    """
+    Cria as tabelas (se preciso) e insere a base gerada. O banco deve
+    estar vazio: os ids são fixos.
+    """
+    from app.database import Base
+    from app import models  # registra as tabelas no metadata
+
+    p = p or Parametros()
+    dados, linhas = gerar(p)
+    if criar_tabelas:
+        Base.metadata.create_all(engine)
+    tabelas = Base.metadata.tables
+    with engine.begin() as conn:
+        # Ordem das FKs: catálogos, usuários, turmas, atividades, relações
+        for nome in ("Avatar", "Badge", "Professor", "Turma", "Aluno", "Aluno_Turma",
+                     "Atividade", "Aluno_Atividade", "Aluno_Badge"):
+            _inserir(conn, tabelas[nome], linhas[nome])
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+    return dados
+
+def adicionar_argumentos(parser):
+    padrao = Parametros()
+    grupo = parser.add_argument_group("base de dados")
+    grupo.add_argument("--turmas", type=int, default=padrao.turmas)
+    grupo.add_argument("--alunos", type=int, default=padrao.alunos, help="total de alunos")
+    grupo.add_argument("--atividades", type=int, default=padrao.atividades, help="total de atividades")
+    grupo.add_argument("--badges", type=int, default=padrao.badges)
+    grupo.add_argument("--avatares", type=int, default=padrao.avatares)
+    grupo.add_argument("--entrega", type=float, default=padrao.entrega, help="fração média de atividades entregues")
+    grupo.add_argument("--seed", type=int, default=padrao.seed)
+
+def parametros(args) -> Parametros:
+    return Parametros(
+        turmas=args.turmas, alunos=args.alunos, atividades=args.atividades, badges=args.badges,
+        avatares=args.avatares, entrega=args.entrega, seed=args.seed,
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    from app.database import engine
+
+    dados = popular(engine, parametros(args))
+    for tabela, total in dados.linhas.items():
+        print(f"{tabela:<16} {total:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Infraestrutura comum dos benchmarks: banco temporário, cliente ASGI
+que mede cada requisição, percentis e gravação dos resultados em JSON.
+
+As requisições passam pela aplicação inteira (middlewares, validação,
+serialização) sem rede, via httpx.ASGITransport. O número de consultas
+SQL de cada requisição vem do cabeçalho Server-Timing gerado por
+app/observability.py.
+"""
+import asyncio
+import json
+import os
+import platform
+import re
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+_CONSULTAS = re.compile(r'desc="(\d+) queries"')
+
+def configurar_ambiente(nome: str, database_url: str = None) -> str:
+    """
+    Define as variáveis de ambiente antes de importar app.*: por padrão
+    um SQLite novo em um diretório temporário. Retorna a URL usada.
+    """
+    if not database_url:
+        arquivo = os.path.join(tempfile.mkdtemp(prefix="xplearn-bench-"), f"{nome}.sqlite")
+        database_url = f"sqlite:///{arquivo}"
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("BCRYPT_WORKERS", "0")
+    os.environ["SERVER_TIMING"] = "true"
+    # O log de requisições lentas atrapalharia a leitura do resultado
+    os.environ.setdefault("SLOW_REQUEST_MS", "1000000")
+    os.environ.setdefault("QUERY_COUNT_WARN", "1000000")
+    return database_url
+
+def percentil(valores, p: float) -> float:
+    """
+    Percentil por interpolação linear (valores já ordenados).
+    """
+    if not valores:
+        return 0.0
+    posicao = (len(valores) - 1) * p / 100
+    inferior = int(posicao)
+    superior = min(inferior + 1, len(valores) - 1)
+    return valores[inferior] + (valores[superior] - valores[inferior]) * (posicao - inferior)
+
+def resumo_latencias(tempos_ms) -> dict:
+    tempos = sorted(tempos_ms)
+    if not tempos:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "mean": round(sum(tempos) / len(tempos), 3),
+        "p50": round(percentil(tempos, 50), 3),
+        "p95": round(percentil(tempos, 95), 3),
+        "p99": round(percentil(tempos, 99), 3),
+        "max": round(tempos[-1], 3),
+    }
+
+class Amostra:
+    __slots__ = ("rota", "status", "ms", "consultas", "erro")
+
+    def __init__(self, rota, status, ms, consultas, erro):
+        self.rota = rota
+        self.status = status
+        self.ms = ms
+        self.consultas = consultas
+        self.erro = erro
+
+class ClienteMedido:
+    """
+    Envolve um httpx.AsyncClient: cada chamada recebe o template da rota
+    (rótulo no relatório) e os parâmetros do caminho, e fica registrada
+    com latência, status e consultas SQL.
+    """
+
+    def __init__(self, cliente, amostras: list):
+        self.cliente = cliente
+        self.amostras = amostras
+
+    async def request(self, metodo: str, rota: str, esperado=(200,), params=None, json=None,
+                      headers=None, **caminho):
+        url = rota.format(**caminho)
+        inicio = time.perf_counter()
+        resposta = await self.cliente.request(metodo, url, params=params, json=json, headers=headers)
+        # Lê o corpo inteiro (inclui respostas em streaming)
+        await resposta.aread()
+        ms = (time.perf_counter() - inicio) * 1000
+
+        encontrado = _CONSULTAS.search(resposta.headers.get("server-timing", ""))
+        consultas = int(encontrado.group(1)) if encontrado else 0
+        erro = resposta.status_code not in esperado
+        self.amostras.append(Amostra(f"{metodo} {rota}", resposta.status_code, ms, consultas, erro))
+        return resposta
+
+    async def get(self, rota: str, **kwargs):
+        return await self.request("GET", rota, **kwargs)
+
+    async def post(self, rota: str, **kwargs):
+        return await self.request("POST", rota, **kwargs)
+
+    async def put(self, rota: str, **kwargs):
+        return await self.request("PUT", rota, **kwargs)
+
+    async def delete(self, rota: str, **kwargs):
+        return await self.request("DELETE", rota, **kwargs)
+
+def _resumir(amostras, duracao_s: float, iteracoes: int) -> dict:
+    por_rota = {}
+    for a in amostras:
+        por_rota.setdefault(a.rota, []).append(a)
+
+    def bloco(grupo):
+        consultas = [a.consultas for a in grupo]
+        status = {}
+        for a in grupo:
+            status[str(a.status)] = status.get(str(a.status), 0) + 1
+        return {
+            "requests": len(grupo),
+            "errors": sum(1 for a in grupo if a.erro),
+            "status": dict(sorted(status.items())),
+            "latency_ms": resumo_latencias([a.ms for a in grupo]),
+            "queries_per_request": round(sum(consultas) / len(grupo), 2) if grupo else 0.0,
+            "queries_max": max(consultas) if consultas else 0,
+        }
+
+    resultado = bloco(amostras)
+    resultado.update(
+        iterations=iteracoes,
+        duration_s=round(duracao_s, 3),
+        throughput_rps=round(len(amostras) / duracao_s, 2) if duracao_s else 0.0,
+        iterations_per_s=round(iteracoes / duracao_s, 2) if duracao_s else 0.0,
+        routes={rota: bloco(grupo) for rota, grupo in sorted(por_rota.items())},
+    )
+    return resultado
+
+async def executar_cenario(app, cenario, dados, concorrencia: int, iteracoes: int,
+                           seed: int = 0, aquecimento: int = 1) -> dict:
+    """
+    Roda `cenario(cliente, dados, rnd, worker, concorrencia)` em
+    `concorrencia` tarefas simultâneas, `iteracoes` vezes em cada uma.
+    Antes, `aquecimento` iterações sem medição (caches e pools).
+    """
+    import random
+
+    import httpx
+
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://benchmark") as cliente:
+        descartadas = []
+        rnd = random.Random(seed)
+        for _ in range(aquecimento):
+            await cenario(ClienteMedido(cliente, descartadas), dados, rnd, 0, 1)
+
+        amostras = []
+
+        async def worker(indice: int):
+            rnd = random.Random(seed * 1000 + indice)
+            medido = ClienteMedido(cliente, amostras)
+            for _ in range(iteracoes):
+                await cenario(medido, dados, rnd, indice, concorrencia)
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concorrencia)))
+        duracao = time.perf_counter() - inicio
+
+    return _resumir(amostras, duracao, iteracoes * concorrencia)
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, timeout=10,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+def metadados(database_url: str) -> dict:
+    from sqlalchemy.engine import make_url
+    import fastapi
+    import sqlalchemy
+
+    return {
+        "commit": _git("rev-parse", "HEAD") or None,
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "fastapi": fastapi.__version__,
+        "sqlalchemy": sqlalchemy.__version__,
+        "database": make_url(database_url).get_backend_name(),
+        "bcrypt_rounds": int(os.getenv("BCRYPT_ROUNDS", "12")),
+        "bcrypt_workers": int(os.getenv("BCRYPT_WORKERS", "0")),
+    }
+
+def salvar(resultado: dict, caminho: str):
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+        arquivo.write("\n")
@@ -0,0 +1,106 @@
+"""
+Mostra o plano de execução das consultas mais frequentes sem e com os
+índices secundários declarados em app/models (idx_*), sobre a base
+sintética de benchmarks/dataset.py, e o tempo médio de cada consulta.
+
+Por padrão usa um SQLite temporário. Com --database-url é possível
+apontar para um MySQL *vazio* (as tabelas são criadas pelo script);
+lá as colunas de FK já têm índices implícitos, então a diferença
+aparece principalmente nos índices compostos.
+
+Uso:
+    python -m benchmarks.query_plans --turmas 50 --alunos 40 --atividades 30
+"""
+import argparse
+import time
+
+from benchmarks import dataset, harness
+
+REPETICOES = 50
+
+def _consultas(dados):
+    from sqlalchemy import select
+    from app.models import Aluno, AlunoAtividade, Atividade, Turma, aluno_turma
+
+    turma = len(dados.turmas) // 2 or 1
+    atividade = dados.atividades[turma][0]
+    membros = dados.turmas[turma]
+    nickname = dataset.nickname(dados.matriculas.index(membros[len(membros) // 2]))
+    return {
+        "atividades das turmas do aluno": select(Atividade.id, Atividade.nome, Atividade.data_entrega)
+            .where(Atividade.turma_id_fk.in_([turma, turma + 1]))
+            .order_by(Atividade.turma_id_fk, Atividade.data_entrega),
+        "alunos que fizeram a atividade": select(AlunoAtividade.aluno_matricula_fk, AlunoAtividade.nota)
+            .where(AlunoAtividade.atividade_id_fk == atividade),
+        "aluno por nickname": select(Aluno.matricula)
+            .where(Aluno.nickname == nickname),
+        "alunos da turma": select(aluno_turma.c.aluno_matricula_fk)
+            .where(aluno_turma.c.turma_id_fk == turma),
+        "turmas do professor": select(Turma.id, Turma.nome)
+            .where(Turma.professor_matricula_fk == dados.professores[0]),
+    }
+
+def _plano(conn, stmt) -> str:
+    sql = str(stmt.compile(conn.engine, compile_kwargs={"literal_binds": True}))
+    if conn.engine.dialect.name == "sqlite":
+        linhas = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+        return "\n".join(f"    {linha[-1]}" for linha in linhas)
+    linhas = conn.exec_driver_sql(f"EXPLAIN {sql}").mappings().all()
+    return "\n".join(
+        f"    {l['table']}: type={l['type']} key={l['key']} rows={l['rows']} extra={l['Extra']}"
+        for l in linhas
+    )
+
+def _medir(conn, stmt) -> float:
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES):
+        conn.execute(stmt).all()
+    return (time.perf_counter() - inicio) / REPETICOES * 1000
+
+def _relatorio(engine, consultas, titulo: str) -> dict:
+    print(f"\n=== {titulo} ===")
+    tempos = {}
+    with engine.connect() as conn:
+        for nome, stmt in consultas.items():
+            tempos[nome] = _medir(conn, stmt)
+            print(f"- {nome} ({tempos[nome]:.3f} ms)")
+            print(_plano(conn, stmt))
+    return tempos
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turmas", type=int, default=50)
+    parser.add_argument("--alunos", type=int, default=40, help="alunos por turma")
+    parser.add_argument("--atividades", type=int, default=30, help="atividades por turma")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    harness.configurar_ambiente("query_plans", args.database_url)
+
+    from app import models  # registra as tabelas no metadata
+    from app.database import Base, engine
+
+    indices = [ix for tabela in Base.metadata.sorted_tables for ix in tabela.indexes if ix.name.startswith("idx_")]
+
+    Base.metadata.create_all(engine)
+    for ix in indices:
+        ix.drop(engine)
+    dados = dataset.popular(engine, dataset.Parametros(
+        turmas=args.turmas, alunos=args.turmas * args.alunos, atividades=args.turmas * args.atividades
+    ), criar_tabelas=False)
+    consultas = _consultas(dados)
+
+    antes = _relatorio(engine, consultas, "SEM índices secundários")
+    for ix in indices:
+        ix.create(engine)
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+    depois = _relatorio(engine, consultas, "COM índices secundários")
+
+    print(f"\n{'consulta':<34} {'antes (ms)':>11} {'depois (ms)':>12}")
+    for nome in consultas:
+        print(f"{nome:<34} {antes[nome]:>11.3f} {depois[nome]:>12.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Roda os cenários de carga (benchmarks/cenarios.py) contra uma base
+gerada por benchmarks/dataset.py e grava o resultado em JSON.
+
+Para cada cenário: vazão (requisições e iterações por segundo),
+latência p50/p95/p99, erros, status e consultas SQL por requisição,
+no total e por rota. O JSON inclui commit, versões e parâmetros, para
+comparar com benchmarks/compare.py.
+
+Por padrão usa um SQLite temporário. Com --database-url aponta para um
+MySQL *vazio* (a base é criada pelo script; o cenário de correção
+desfaz o que lança, mas as tabelas ficam populadas).
+
+Uso:
+    python -m benchmarks.run --saida resultados/atual.json
+    python -m benchmarks.run --cenarios painel_aluno catalogo --concorrencia 16 --iteracoes 50
+    python -m benchmarks.run --cenarios login --bcrypt-rounds 10 --bcrypt-workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks import dataset, harness
+
+def main():
+    from benchmarks.cenarios import CENARIOS
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cenarios", nargs="+", choices=sorted(CENARIOS), default=list(CENARIOS))
+    parser.add_argument("--concorrencia", type=int, default=8, help="clientes simultâneos por cenário")
+    parser.add_argument("--iteracoes", type=int, default=25, help="iterações por cliente")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--bcrypt-rounds", type=int, default=None, help="sobrescreve BCRYPT_ROUNDS")
+    parser.add_argument("--bcrypt-workers", type=int, default=None, help="sobrescreve BCRYPT_WORKERS")
+    parser.add_argument("--saida", default=None, help="arquivo JSON do resultado")
+    dataset.adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    if args.bcrypt_rounds is not None:
+        os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    if args.bcrypt_workers is not None:
+        os.environ["BCRYPT_WORKERS"] = str(args.bcrypt_workers)
+    database_url = harness.configurar_ambiente("run", args.database_url)
+
+    from app.database import engine
+    from app.main import app
+    from app.security import password_service
+
+    inicio = time.perf_counter()
+    dados = dataset.popular(engine, dataset.parametros(args))
+    print(f"base gerada em {time.perf_counter() - inicio:.1f}s: "
+          + ", ".join(f"{tabela}={total}" for tabela, total in dados.linhas.items()))
+
+    resultado = {
+        "meta": harness.metadados(database_url),
+        "params": {
+            "concorrencia": args.concorrencia,
+            "iteracoes": args.iteracoes,
+            "dataset": vars(dados.parametros),
+            "linhas": dados.linhas,
+        },
+        "scenarios": {},
+    }
+    try:
+        for nome in args.cenarios:
+            r = asyncio.run(harness.executar_cenario(
+                app, CENARIOS[nome], dados, args.concorrencia, args.iteracoes, seed=args.seed
+            ))
+            resultado["scenarios"][nome] = r
+            lat = r["latency_ms"]
+            print(
+                f"{nome:<14} {r['requests']:>6} req {r['throughput_rps']:>9.1f} req/s  "
+                f"p50 {lat['p50']:>8.2f}  p95 {lat['p95']:>8.2f}  p99 {lat['p99']:>8.2f} ms  "
+                f"{r['queries_per_request']:>5.1f} consultas/req  {r['errors']} erros"
+            )
+    finally:
+        password_service.shutdown()
+
+    if args.saida:
+        harness.salvar(resultado, args.saida)
+        print(f"resultado gravado em {args.saida}")
+    else:
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
+
+    erros = sum(r["errors"] for r in resultado["scenarios"].values())
+    raise SystemExit(1 if erros else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Microbenchmark da serialização de GET /atividades/: a partir das
+mesmas linhas (projeções já carregadas do banco), mede só o trabalho
+de transformar o retorno da rota no corpo HTTP.
+
+- validação + json:     dicts validados pelo response_model
+                        (serialize_response do FastAPI) e JSONResponse;
+- validação + orjson:   o mesmo com ORJSONResponse;
+- model_construct:      modelos montados com model_construct (sem
+                        validação) e serializados pelo FastAPI;
+- caminho rápido:       app.serialization.resposta (dicts recortados
+                        no formato do schema direto para o orjson), o
+                        caminho atual da rota.
+
+Também confere que os corpos são idênticos.
+
+Uso:
+    python -m benchmarks.serializacao --limit 500 --expand badge,turma.alunos.badges
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks import dataset, harness
+
+def _carregar(limit: int, expand: str):
+    from sqlalchemy import select
+    from app import pagination, projections
+    from app.database import SessionLocal
+    from app.models.atividade import Atividade
+
+    db = SessionLocal()
+    try:
+        expand_set = projections.parse_expand(expand, projections.ATIVIDADE_EXPANSOES)
+        stmt = pagination.keyset(select(*projections.ATIVIDADE_COLUNAS), Atividade.id, None, limit)
+        atvs = [dict(row) for row in db.execute(stmt).mappings()]
+        atvs, next_cursor = pagination.pagina(atvs, limit, "id")
+        projections.expandir_atividades(db, atvs, expand_set)
+        return {"data": atvs, "next_cursor": next_cursor}
+    finally:
+        db.close()
+
+def _construir(modelo, dados):
+    """
+    model_construct recursivo: modelos sem validação, para comparar.
+    """
+    from app import serialization
+
+    if isinstance(dados, list):
+        return [_construir(modelo, item) for item in dados]
+    valores = dict(dados)
+    for nome, _, _, aninhado in serialization._campos(modelo):
+        if valores.get(nome) is not None and aninhado is not None:
+            valores[nome] = _construir(aninhado[0], valores[nome])
+    return modelo.model_construct(**valores)
+
+def _medir(funcao, repeticoes: int):
+    funcao()  # aquecimento
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        corpo = funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return corpo, harness.resumo_latencias(tempos)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=500, help="atividades na página")
+    parser.add_argument("--expand", default="badge,turma.alunos.badges")
+    parser.add_argument("--repeticoes", type=int, default=50)
+    parser.add_argument("--saida", default=None, help="arquivo JSON do resultado")
+    dataset.adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    database_url = harness.configurar_ambiente("serializacao")
+
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from fastapi.routing import serialize_response
+    from app import serialization
+    from app.schemas.atividade import AtividadeResumoList
+    from app.database import engine
+    from app.main import app
+
+    dataset.popular(engine, dataset.parametros(args))
+    conteudo = _carregar(args.limit, args.expand)
+    rota = next(r for r in app.routes if getattr(r, "path", None) == "/atividades/" and "GET" in r.methods)
+
+    loop = asyncio.new_event_loop()
+
+    def serializar(resposta):
+        return loop.run_until_complete(serialize_response(field=rota.response_field, response_content=resposta))
+
+    casos = {
+        "validação + json": lambda: JSONResponse(serializar(conteudo)).body,
+        "validação + orjson": lambda: ORJSONResponse(serializar(conteudo)).body,
+        "model_construct": lambda: ORJSONResponse(serializar(_construir(AtividadeResumoList, conteudo))).body,
+        "caminho rápido": lambda: serialization.resposta(AtividadeResumoList, conteudo).body,
+    }
+
+    resultados = {}
+    corpos = {}
+    print(f"{len(conteudo['data'])} atividades, expand={args.expand or '-'}")
+    print(f"{'caso':<22} {'média (ms)':>11} {'p50':>9} {'p95':>9}")
+    for nome, funcao in casos.items():
+        corpos[nome], latencia = _medir(funcao, args.repeticoes)
+        resultados[nome] = latencia
+        print(f"{nome:<22} {latencia['mean']:>11.2f} {latencia['p50']:>9.2f} {latencia['p95']:>9.2f}")
+
+    base = resultados["validação + json"]["mean"]
+    atual = resultados["caminho rápido"]["mean"]
+    iguais = len(set(corpos.values())) == 1
+    print(f"ganho: {base / atual:.1f}x, corpo de {len(corpos['caminho rápido'])} bytes, "
+          f"corpos idênticos: {'sim' if iguais else 'NÃO'}")
+
+    loop.close()
+    if args.saida:
+        harness.salvar({
+            "meta": harness.metadados(database_url),
+            "params": {"limit": args.limit, "expand": args.expand, "repeticoes": args.repeticoes},
+            "bytes": len(corpos["caminho rápido"]),
+            "identicos": iguais,
+            "casos": resultados,
+        }, args.saida)
+    raise SystemExit(0 if iguais else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.database import DATABASE_URL, Base
+from app import models  # registra as tabelas no metadata
+from migrations import online
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+def run_migrations_offline():
+    """
+    Gera o SQL das migrações sem conectar (alembic upgrade head --sql).
+    """
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url") or DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    connectable = create_engine(
+        config.get_main_option("sqlalchemy.url") or DATABASE_URL,
+        poolclass=pool.NullPool,
+    )
+    with connectable.connect() as connection:
+        online.configurar_sessao(connection)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # Um commit por migração: uma falha não desfaz as anteriores
+            transaction_per_migration=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,235 @@
+"""
+Operações de esquema que não travam o tráfego da aplicação.
+
+No MySQL/InnoDB os índices e colunas são criados com ALTER TABLE online
+(ALGORITHM=INSTANT/INPLACE, LOCK=NONE): leituras e escritas continuam
+durante a operação e, se o servidor não conseguir fazê-la online, o
+comando falha em vez de bloquear a tabela. Cópias de dados (backfill)
+são feitas em lotes pela chave primária, com commit a cada lote, para
+que nenhuma transação segure locks de linha por muito tempo.
+
+Em outros bancos (SQLite em desenvolvimento) as operações equivalentes
+do Alembic são usadas diretamente.
+
+Todas as operações são idempotentes: rodar de novo em um banco que já
+tem o índice/coluna apenas registra que nada foi feito.
+"""
+import os
+import time
+
+import sqlalchemy as sa
+from alembic import op
+from dotenv import load_dotenv
+from sqlalchemy.schema import CreateColumn
+
+load_dotenv()
+
+# Segundos que um ALTER espera pelo metadata lock. Um ALTER esperando o
+# lock bloqueia todas as consultas que chegam depois dele, então é
+# melhor falhar rápido e tentar de novo fora do pico.
+MIGRATION_LOCK_WAIT_TIMEOUT = int(os.getenv("MIGRATION_LOCK_WAIT_TIMEOUT", "5"))
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "1000"))
+# Pausa entre lotes do backfill (segundos), para dar folga à replicação
+MIGRATION_BATCH_PAUSE = float(os.getenv("MIGRATION_BATCH_PAUSE", "0.05"))
+
+def configurar_sessao(connection):
+    """
+    Limita a espera por locks na conexão usada pelas migrações.
+    """
+    if connection.dialect.name == "mysql":
+        connection.exec_driver_sql(f"SET SESSION lock_wait_timeout = {MIGRATION_LOCK_WAIT_TIMEOUT}")
+        connection.exec_driver_sql(f"SET SESSION innodb_lock_wait_timeout = {MIGRATION_LOCK_WAIT_TIMEOUT}")
+
+def _offline() -> bool:
+    # alembic upgrade --sql: só gera o SQL, sem conexão para inspecionar
+    return op.get_context().as_sql
+
+def _mysql() -> bool:
+    return op.get_bind().dialect.name == "mysql"
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+def _q(nome: str) -> str:
+    return op.get_bind().dialect.identifier_preparer.quote(nome)
+
+def indice_existe(tabela: str, nome: str) -> bool:
+    if _offline():
+        return False
+    inspector = _inspector()
+    nomes = {ix["name"] for ix in inspector.get_indexes(tabela)}
+    nomes |= {uc["name"] for uc in inspector.get_unique_constraints(tabela)}
+    return nome in nomes
+
+def coluna_existe(tabela: str, nome: str) -> bool:
+    if _offline():
+        return False
+    return any(c["name"] == nome for c in _inspector().get_columns(tabela))
+
+def tipo_coluna(tabela: str, nome: str):
+    """
+    Tipo refletido da coluna, ou None se não existir (ou no modo --sql).
+    """
+    if _offline():
+        return None
+    return next((c["type"] for c in _inspector().get_columns(tabela) if c["name"] == nome), None)
+
+def _alter_online(tabela: str, operacao: str, algoritmos=("INPLACE",)):
+    """
+    Executa ALTER TABLE tentando cada algoritmo em ordem (ex.: INSTANT e,
+    se o servidor não suportar para esta operação, INPLACE).
+    """
+    if _offline():
+        # Sem como tentar de novo: gera com o algoritmo mais conservador
+        algoritmos = algoritmos[-1:]
+    ultimo_erro = None
+    for algoritmo in algoritmos:
+        lock = "" if algoritmo == "INSTANT" else ", LOCK=NONE"
+        try:
+            op.execute(f"ALTER TABLE {_q(tabela)} {operacao}, ALGORITHM={algoritmo}{lock}")
+            return
+        except sa.exc.DBAPIError as e:
+            print(f"ALTER {tabela} com ALGORITHM={algoritmo} não suportado: {e.orig}")
+            ultimo_erro = e
+    raise ultimo_erro
+
+def criar_indice(tabela: str, nome: str, colunas, unique: bool = False):
+    if indice_existe(tabela, nome):
+        print(f"Índice {nome} já existe em {tabela}, nada a fazer.")
+        return
+    if _mysql():
+        tipo = "UNIQUE INDEX" if unique else "INDEX"
+        lista = ", ".join(_q(c) for c in colunas)
+        _alter_online(tabela, f"ADD {tipo} {_q(nome)} ({lista})")
+    else:
+        op.create_index(nome, tabela, list(colunas), unique=unique)
+
+def remover_indice(tabela: str, nome: str):
+    if not indice_existe(tabela, nome):
+        print(f"Índice {nome} não existe em {tabela}, nada a fazer.")
+        return
+    if _mysql():
+        _alter_online(tabela, f"DROP INDEX {_q(nome)}")
+    else:
+        op.drop_index(nome, table_name=tabela)
+
+def renomear_indice(tabela: str, antigo: str, novo: str):
+    """
+    Só metadados no MySQL. Em outros bancos recria o índice com o novo nome.
+    """
+    if not _offline() and (indice_existe(tabela, novo) or not indice_existe(tabela, antigo)):
+        print(f"Índice {antigo} -> {novo} em {tabela}: nada a fazer.")
+        return
+    if _mysql():
+        _alter_online(tabela, f"RENAME INDEX {_q(antigo)} TO {_q(novo)}")
+        return
+    inspector = _inspector()
+    ix = next((ix for ix in inspector.get_indexes(tabela) if ix["name"] == antigo), None)
+    if ix is not None:
+        op.create_index(novo, tabela, ix["column_names"], unique=bool(ix["unique"]))
+        op.drop_index(antigo, table_name=tabela)
+    else:
+        # UNIQUE de coluna no SQLite: não dá para remover sem recriar a
+        # tabela, então só cria o índice com o novo nome
+        uc = next(uc for uc in inspector.get_unique_constraints(tabela) if uc["name"] == antigo)
+        op.create_index(novo, tabela, uc["column_names"], unique=True)
+
+def adicionar_coluna(tabela: str, coluna: sa.Column):
+    """
+    Adiciona uma coluna anulável ou com server_default (senão o banco
+    teria de reescrever a tabela para preencher as linhas existentes).
+    """
+    if coluna_existe(tabela, coluna.name):
+        print(f"Coluna {tabela}.{coluna.name} já existe, nada a fazer.")
+        return
+    if not coluna.nullable and coluna.server_default is None:
+        raise ValueError(
+            f"{tabela}.{coluna.name}: colunas novas devem ser anuláveis ou ter server_default; "
+            "preencha com preencher_em_lotes() e torne NOT NULL depois."
+        )
+    if _mysql():
+        ddl = CreateColumn(coluna).compile(dialect=op.get_bind().dialect)
+        _alter_online(tabela, f"ADD COLUMN {ddl}", algoritmos=("INSTANT", "INPLACE"))
+    else:
+        op.add_column(tabela, coluna)
+
+def remover_coluna(tabela: str, nome: str):
+    if not coluna_existe(tabela, nome):
+        print(f"Coluna {tabela}.{nome} não existe, nada a fazer.")
+        return
+    if _mysql():
+        _alter_online(tabela, f"DROP COLUMN {_q(nome)}", algoritmos=("INSTANT", "INPLACE"))
+    else:
+        with op.batch_alter_table(tabela) as batch:
+            batch.drop_column(nome)
+
+def trocar_coluna(tabela: str, antiga: str, nova: str):
+    """
+    Remove `antiga` e renomeia `nova` para o nome dela. No MySQL é um
+    único ALTER online, então as consultas da aplicação nunca encontram
+    a tabela sem a coluna. Use depois de preencher `nova` com
+    preencher_em_lotes().
+    """
+    if not _offline() and not coluna_existe(tabela, nova):
+        print(f"Coluna {tabela}.{nova} não existe, nada a fazer.")
+        return
+    if _mysql():
+        _alter_online(
+            tabela,
+            f"DROP COLUMN {_q(antiga)}, RENAME COLUMN {_q(nova)} TO {_q(antiga)}",
+            algoritmos=("INSTANT", "INPLACE"),
+        )
+    else:
+        with op.batch_alter_table(tabela) as batch:
+            batch.drop_column(antiga)
+            batch.alter_column(nova, new_column_name=antiga)
+
+def preencher_em_lotes(tabela: str, valores, where=None,
+                       batch_size: int = MIGRATION_BATCH_SIZE, pausa: float = MIGRATION_BATCH_PAUSE) -> int:
+    """
+    UPDATE em lotes de `batch_size` linhas, percorrendo a chave primária.
+    Cada lote é um UPDATE por faixa de chave com commit próprio.
+
+    valores: função que recebe a Table refletida e devolve o dict do SET.
+    where:   função opcional (Table -> condição) que restringe as linhas;
+             use-a para que uma execução interrompida retome de onde parou
+             (ex.: lambda t: t.c.nova.is_(None)).
+    Retorna o total de linhas atualizadas.
+    """
+    if _offline():
+        raise RuntimeError("preencher_em_lotes precisa de conexão com o banco; rode sem --sql.")
+    bind = op.get_bind()
+    tabela_ref = sa.Table(tabela, sa.MetaData(), autoload_with=bind)
+    pk = list(tabela_ref.primary_key.columns)
+    chave = sa.tuple_(*pk) if len(pk) > 1 else pk[0]
+
+    def valor_chave(row):
+        return sa.tuple_(*row) if len(pk) > 1 else row[0]
+
+    total = 0
+    ultimo = None
+    with op.get_context().autocommit_block():
+        while True:
+            stmt = sa.select(*pk).order_by(*pk).limit(batch_size)
+            if where is not None:
+                stmt = stmt.where(where(tabela_ref))
+            if ultimo is not None:
+                stmt = stmt.where(chave > valor_chave(ultimo))
+            lote = bind.execute(stmt).all()
+            if not lote:
+                break
+
+            update = sa.update(tabela_ref).values(valores(tabela_ref)).where(
+                chave >= valor_chave(lote[0]), chave <= valor_chave(lote[-1])
+            )
+            if where is not None:
+                update = update.where(where(tabela_ref))
+            total += bind.execute(update).rowcount
+            ultimo = lote[-1]
+            print(f"{tabela}: {total} linhas atualizadas (até {tuple(ultimo)})")
+
+            if len(lote) < batch_size:
+                break
+            if pausa:
+                time.sleep(pausa)
+    return total
@@ -0,0 +1,118 @@
+"""Esquema inicial (equivale a scripts/XPLearn_BD_create.txt sem os índices idx_*)
+
+Bancos já existentes devem ser marcados com `alembic stamp 0001` em vez
+de executar esta migração.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# INT UNSIGNED no MySQL, INTEGER nos demais bancos
+ID = sa.Integer().with_variant(mysql.INTEGER(unsigned=True), "mysql")
+MYSQL = {"mysql_engine": "InnoDB"}
+
+
+def upgrade():
+    op.create_table(
+        "Avatar",
+        sa.Column("id", ID, primary_key=True, autoincrement=True),
+        sa.Column("nome", sa.String(255), nullable=False),
+        sa.Column("caminho_foto", sa.String(255), nullable=False, unique=True),
+        **MYSQL
+    )
+    op.create_table(
+        "Badge",
+        sa.Column("id", ID, primary_key=True, autoincrement=True),
+        sa.Column("nome", sa.String(255), nullable=False),
+        sa.Column("requisito", sa.Text()),
+        sa.Column("caminho_foto", sa.String(255), nullable=False, unique=True),
+        **MYSQL
+    )
+    op.create_table(
+        "Professor",
+        sa.Column("matricula", sa.String(255), primary_key=True),
+        sa.Column("nome", sa.String(255), nullable=False),
+        sa.Column("senha", sa.String(255), nullable=False),
+        sa.Column("avatar_id_fk", ID, nullable=False),
+        sa.ForeignKeyConstraint(["avatar_id_fk"], ["Avatar.id"], name="fk_professor_avatar"),
+        **MYSQL
+    )
+    op.create_table(
+        "Turma",
+        sa.Column("id", ID, primary_key=True, autoincrement=True),
+        sa.Column("nome", sa.String(255), nullable=False),
+        sa.Column("professor_matricula_fk", sa.String(255), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["professor_matricula_fk"], ["Professor.matricula"], name="fk_turma_professor",
+            onupdate="CASCADE", ondelete="RESTRICT"
+        ),
+        **MYSQL
+    )
+    op.create_table(
+        "Atividade",
+        sa.Column("id", ID, primary_key=True, autoincrement=True),
+        sa.Column("nome", sa.String(255), nullable=False),
+        sa.Column("descricao", sa.Text()),
+        sa.Column("nota_max", sa.Numeric(5, 2), nullable=False, server_default="10.00"),
+        sa.Column("pontos", ID, nullable=False, server_default="0"),
+        sa.Column("data_entrega", sa.DateTime()),
+        sa.Column("badge_id_fk", ID, nullable=False),
+        sa.Column("turma_id_fk", ID, nullable=False),
+        sa.ForeignKeyConstraint(["badge_id_fk"], ["Badge.id"], name="fk_atividade_badge"),
+        sa.ForeignKeyConstraint(["turma_id_fk"], ["Turma.id"], name="fk_atividade_turma", ondelete="CASCADE"),
+        **MYSQL
+    )
+    op.create_table(
+        "Aluno",
+        sa.Column("matricula", sa.String(255), primary_key=True),
+        sa.Column("nome", sa.String(255), nullable=False),
+        sa.Column("nickname", sa.String(255), nullable=False),
+        sa.Column("senha", sa.String(255), nullable=False),
+        sa.Column("xp", ID, nullable=False, server_default="0"),
+        sa.Column("nivel", ID, nullable=False, server_default="1"),
+        sa.Column("avatar_id_fk", ID, nullable=False),
+        sa.UniqueConstraint("nickname", name="nickname"),
+        sa.ForeignKeyConstraint(["avatar_id_fk"], ["Avatar.id"], name="fk_aluno_avatar"),
+        **MYSQL
+    )
+    op.create_table(
+        "Aluno_Turma",
+        sa.Column("aluno_matricula_fk", sa.String(255), primary_key=True),
+        sa.Column("turma_id_fk", ID, primary_key=True),
+        sa.ForeignKeyConstraint(["aluno_matricula_fk"], ["Aluno.matricula"], name="fk_alunoturma_aluno", ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["turma_id_fk"], ["Turma.id"], name="fk_alunoturma_turma", ondelete="CASCADE"),
+        **MYSQL
+    )
+    op.create_table(
+        "Aluno_Atividade",
+        sa.Column("aluno_matricula_fk", sa.String(255), primary_key=True),
+        sa.Column("atividade_id_fk", ID, primary_key=True),
+        sa.Column("nota", sa.Numeric(5, 2)),
+        sa.ForeignKeyConstraint(["aluno_matricula_fk"], ["Aluno.matricula"], name="fk_alunoatividade_aluno", ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["atividade_id_fk"], ["Atividade.id"], name="fk_alunoatividade_atividade", ondelete="CASCADE"),
+        **MYSQL
+    )
+    op.create_table(
+        "Aluno_Badge",
+        sa.Column("aluno_matricula_fk", sa.String(255), primary_key=True),
+        sa.Column("badge_id_fk", ID, primary_key=True),
+        sa.Column("data_conquista", sa.TIMESTAMP(), nullable=False, server_default=sa.func.current_timestamp()),
+        sa.ForeignKeyConstraint(["aluno_matricula_fk"], ["Aluno.matricula"], name="fk_alunobadge_aluno", ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["badge_id_fk"], ["Badge.id"], name="fk_alunobadge_badge", ondelete="CASCADE"),
+        **MYSQL
+    )
+
+
+def downgrade():
+    for tabela in ("Aluno_Badge", "Aluno_Atividade", "Aluno_Turma", "Aluno",
+                   "Atividade", "Turma", "Professor", "Badge", "Avatar"):
+        op.drop_table(tabela)
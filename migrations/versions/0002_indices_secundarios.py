@@ -0,0 +1,39 @@
+"""Índices secundários declarados em app/models (idx_*)
+
+Criados online (ALGORITHM=INPLACE, LOCK=NONE) no MySQL; os índices que
+já existirem (bancos criados com o XPLearn_BD_create.txt atual) são
+mantidos. Os índices implícitos das FKs são descartados pelo próprio
+MySQL, já que os novos também atendem às constraints.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from migrations import online
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDICES = (
+    ("Atividade", "idx_atividade_turma_entrega", ("turma_id_fk", "data_entrega")),
+    ("Aluno_Atividade", "idx_alunoatividade_atividade", ("atividade_id_fk", "aluno_matricula_fk")),
+    ("Aluno_Turma", "idx_alunoturma_turma", ("turma_id_fk", "aluno_matricula_fk")),
+    ("Turma", "idx_turma_professor", ("professor_matricula_fk",)),
+)
+
+
+def upgrade():
+    for tabela, nome, colunas in INDICES:
+        online.criar_indice(tabela, nome, colunas)
+    # O UNIQUE de Aluno.nickname já existe; só recebe o nome usado nos models
+    online.renomear_indice("Aluno", "nickname", "idx_aluno_nickname")
+
+
+def downgrade():
+    online.renomear_indice("Aluno", "idx_aluno_nickname", "nickname")
+    for tabela, nome, _ in reversed(INDICES):
+        online.remover_indice(tabela, nome)
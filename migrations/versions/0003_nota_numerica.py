@@ -0,0 +1,73 @@
+"""Aluno_Atividade.nota numérica (DECIMAL(5, 2))
+
+Bancos criados pelos models antigos (create_all) têm nota VARCHAR com o
+texto gravado pela API ("7.5", "10.0"). A coluna passa a DECIMAL(5, 2),
+como já declaram o XPLearn_BD_create.txt e a 0001; em bancos que já
+têm a coluna numérica nada é feito.
+
+Sem reescrever a tabela de uma vez (MODIFY COLUMN copiaria a tabela
+inteira com as escritas bloqueadas):
+
+1. nota_num DECIMAL(5, 2) anulável (ALGORITHM=INSTANT);
+2. backfill em lotes com CAST(nota AS DECIMAL(5, 2)), retomável;
+3. uma segunda passada para as notas gravadas durante o backfill e a
+   troca nota -> nota_num num único ALTER online.
+
+Uma nota lançada entre a segunda passada e a troca ficaria nula: rode
+fora do horário de correção.
+
+Uma nota que não seja número faz o UPDATE do lote falhar no MySQL
+(modo estrito): corrija a linha e rode de novo, o backfill continua de
+onde parou.
+
+Sem downgrade: a coluna fica numérica (ver downgrade()).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from migrations import online
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+TABELA = "Aluno_Atividade"
+
+
+def _preencher():
+    online.preencher_em_lotes(
+        TABELA,
+        valores=lambda t: {"nota_num": sa.cast(t.c.nota, sa.Numeric(5, 2))},
+        where=lambda t: sa.and_(t.c.nota_num.is_(None), t.c.nota.isnot(None)),
+    )
+
+
+def upgrade():
+    if op.get_context().as_sql:
+        # O backfill precisa de conexão; bancos do script SQL já têm DECIMAL
+        print(f"{TABELA}.nota: modo --sql, rode esta migração conectado ao banco.")
+        return
+    if isinstance(online.tipo_coluna(TABELA, "nota"), sa.Numeric):
+        print(f"{TABELA}.nota já é numérica, nada a fazer.")
+        return
+
+    online.adicionar_coluna(TABELA, sa.Column("nota_num", sa.Numeric(5, 2), nullable=True))
+    _preencher()
+    # Notas lançadas pela versão anterior da API durante o backfill
+    _preencher()
+    online.trocar_coluna(TABELA, "nota", "nota_num")
+
+
+def downgrade():
+    # Irreversível: o upgrade não registra se a coluna era VARCHAR (models
+    # antigos) ou já DECIMAL (0001/script SQL), e voltar para texto
+    # mudaria o esquema da 0001.
+    raise NotImplementedError(
+        f"A 0003 é irreversível: {TABELA}.nota continua DECIMAL(5, 2). "
+        "A 0002 funciona com a coluna numérica; para voltar a ela sem "
+        "alterar o banco, use 'alembic stamp 0002'."
+    )
@@ -0,0 +1,112 @@
+"""
+Gera a versão otimizada das imagens em app/static/imagens.
+
+Para cada imagem cria, em app/static/dist/:
+  - uma cópia com hash do conteúdo no nome (cache imutável no navegador);
+  - variantes WebP e AVIF (quando o Pillow suporta o formato);
+  - uma miniatura (TAMANHO_THUMB px) nos mesmos formatos.
+E grava app/static/dist/manifest.json, usado por app/static_files.py
+para escolher a variante conforme o header Accept.
+
+Requer Pillow para gerar as variantes (pip install Pillow). Sem ele,
+apenas as cópias com hash são geradas.
+
+Uso:
+    python scripts/build_static.py
+"""
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# --- CONFIGURAÇÕES ---
+PASTA_STATIC = Path(__file__).resolve().parent.parent / "app" / "static"
+PASTA_ORIGEM = PASTA_STATIC / "imagens"
+PASTA_DESTINO = PASTA_STATIC / "dist"
+EXTENSOES = (".png", ".jpg", ".jpeg", ".webp")
+TAMANHO_THUMB = 128
+QUALIDADE = 80
+TAMANHO_HASH = 12
+# ---------------------
+
+def _hash_arquivo(caminho: Path) -> str:
+    return hashlib.sha256(caminho.read_bytes()).hexdigest()[:TAMANHO_HASH]
+
+def _formatos_disponiveis():
+    if Image is None:
+        return []
+    Image.init()
+    return [fmt for fmt in ("avif", "webp") if fmt.upper() in Image.SAVE]
+
+def _salvar(imagem, destino: Path, formato: str):
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    imagem.save(destino, format=formato.upper(), quality=QUALIDADE)
+
+def processar_imagem(origem: Path, formatos) -> dict:
+    relativo = origem.relative_to(PASTA_STATIC)
+    digest = _hash_arquivo(origem)
+    base = PASTA_DESTINO / relativo.parent / f"{origem.stem}.{digest}"
+
+    original = base.with_name(f"{base.name}{origem.suffix}")
+    original.parent.mkdir(parents=True, exist_ok=True)
+    if not original.exists():
+        shutil.copy2(origem, original)
+
+    def rel(caminho: Path) -> str:
+        return caminho.relative_to(PASTA_STATIC).as_posix()
+
+    entrada = {"original": rel(original), "variantes": {}, "thumb": {}}
+    if not formatos:
+        return entrada
+
+    with Image.open(origem) as imagem:
+        imagem.load()
+        miniatura = imagem.copy()
+        miniatura.thumbnail((TAMANHO_THUMB, TAMANHO_THUMB))
+
+        thumb_original = base.with_name(f"{base.name}.thumb{origem.suffix}")
+        if not thumb_original.exists():
+            miniatura.save(thumb_original)
+        entrada["thumb"]["original"] = rel(thumb_original)
+
+        for formato in formatos:
+            destino = base.with_name(f"{base.name}.{formato}")
+            if not destino.exists():
+                _salvar(imagem, destino, formato)
+            entrada["variantes"][formato] = rel(destino)
+
+            destino_thumb = base.with_name(f"{base.name}.thumb.{formato}")
+            if not destino_thumb.exists():
+                _salvar(miniatura, destino_thumb, formato)
+            entrada["thumb"][formato] = rel(destino_thumb)
+
+    return entrada
+
+def gerar_assets():
+    formatos = _formatos_disponiveis()
+    if Image is None:
+        print("⚠️ Pillow não instalado: gerando apenas as cópias com hash (sem WebP/AVIF/miniaturas).")
+
+    arquivos = sorted(p for p in PASTA_ORIGEM.rglob("*") if p.suffix.lower() in EXTENSOES)
+    if not arquivos:
+        print(f"Nenhuma imagem encontrada em {PASTA_ORIGEM}")
+        return
+
+    manifest = {}
+    for origem in arquivos:
+        manifest[origem.relative_to(PASTA_STATIC).as_posix()] = processar_imagem(origem, formatos)
+
+    PASTA_DESTINO.mkdir(parents=True, exist_ok=True)
+    with open(PASTA_DESTINO / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    print(f"✅ {len(arquivos)} imagens processadas (formatos extras: {', '.join(formatos) or 'nenhum'}).")
+    print(f"Manifesto salvo em {PASTA_DESTINO / 'manifest.json'}")
+
+if __name__ == "__main__":
+    gerar_assets()
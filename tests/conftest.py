@@ -0,0 +1,87 @@
+"""
+Configuração comum dos testes: um SQLite temporário, definido antes de
+importar app.* (app/database.py lê DATABASE_URL na importação).
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="xplearn-tests-"), "testes.sqlite")
+os.environ.setdefault("SECRET_KEY", "testes")
+os.environ.setdefault("BCRYPT_WORKERS", "0")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("SLOW_REQUEST_MS", "1000000")
+os.environ.setdefault("QUERY_COUNT_WARN", "1000000")
+os.environ.setdefault("INTERNAL_TOKEN", "testes-interno")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.cache import avatar_cache, badge_cache
+from app.database import Base, async_engine, engine
+from app.main import app
+from app.ranking import ranking_cache
+
+def _limpar_caches():
+    for cache in (badge_cache, avatar_cache, ranking_cache):
+        cache.invalidate()
+
+@pytest.fixture
+def banco():
+    """
+    Banco vazio (tabelas recriadas) e caches em memória zerados.
+    """
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    _limpar_caches()
+    yield engine
+    _limpar_caches()
+
+@pytest.fixture
+def popular(banco):
+    """
+    Função que recria o banco com a base de benchmarks/dataset.py nos
+    parâmetros dados e devolve o Dataset.
+    """
+    from benchmarks import dataset
+
+    def _popular(**parametros):
+        Base.metadata.drop_all(engine)
+        dados = dataset.popular(engine, dataset.Parametros(**parametros))
+        _limpar_caches()
+        return dados
+
+    return _popular
+
+@pytest.fixture
+def cliente():
+    return TestClient(app)
+
+class ContadorConsultas:
+    __slots__ = ("total", "sql")
+
+    def __init__(self):
+        self.total = 0
+        self.sql = []
+
+@contextmanager
+def contar_consultas():
+    """
+    Conta os statements enviados ao banco (engines síncrona e assíncrona)
+    dentro do bloco.
+    """
+    contador = ContadorConsultas()
+
+    def antes(conn, cursor, statement, parameters, context, executemany):
+        contador.total += 1
+        contador.sql.append(statement)
+
+    engines = (engine, async_engine.sync_engine)
+    for e in engines:
+        event.listen(e, "before_cursor_execute", antes)
+    try:
+        yield contador
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", antes)
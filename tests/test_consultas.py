@@ -0,0 +1,39 @@
+"""
+Número de consultas SQL por endpoint: deve ser limitado e não crescer
+com o tamanho da base (sem N+1 nas relações aninhadas).
+"""
+import pytest
+
+from tests.conftest import contar_consultas
+
+PEQUENA = {"turmas": 2, "alunos": 20, "atividades": 6, "badges": 3, "avatares": 4}
+GRANDE = {"turmas": 4, "alunos": 160, "atividades": 40, "badges": 12, "avatares": 20}
+
+def _aluno_com_mais_turmas(dados):
+    return max(dados.matriculas, key=lambda m: len(dados.turmas_do_aluno[m]))
+
+# rota -> (caminho a partir do Dataset, máximo de consultas)
+ENDPOINTS = {
+    "/atividades/{id}": (lambda dados: "/atividades/1", 4),
+    "/turmas/{id}": (lambda dados: "/turmas/1", 3),
+    "/alunos/{matricula}": (lambda dados: f"/alunos/{_aluno_com_mais_turmas(dados)}", 2),
+    "/alunos/{matricula}/turmas": (lambda dados: f"/alunos/{_aluno_com_mais_turmas(dados)}/turmas", 4),
+}
+
+@pytest.mark.parametrize("rota", list(ENDPOINTS))
+def test_consultas_constantes_com_o_tamanho_da_base(popular, cliente, rota):
+    caminho, maximo = ENDPOINTS[rota]
+    contagens = []
+    tamanhos = []
+    for parametros in (PEQUENA, GRANDE):
+        dados = popular(**parametros)
+        # Caches frios nas duas medições: a carga do catálogo entra na conta
+        with contar_consultas() as consultas:
+            resposta = cliente.get(caminho(dados))
+        assert resposta.status_code == 200, resposta.text
+        contagens.append(consultas.total)
+        tamanhos.append(len(resposta.content))
+
+    assert tamanhos[1] > tamanhos[0], "a base maior deveria gerar uma resposta maior"
+    assert contagens[0] == contagens[1], f"{rota}: {contagens[0]} -> {contagens[1]} consultas"
+    assert contagens[1] <= maximo, f"{rota}: {contagens[1]} consultas (máximo {maximo})"
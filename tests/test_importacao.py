@@ -0,0 +1,69 @@
+import asyncio
+
+from sqlalchemy import func, select
+
+from app import importacao
+from app.database import AsyncSessionLocal, SessionLocal
+from app.models.aluno import Aluno
+from app.security import FilaCheia
+
+CABECALHO = b"matricula,nome,nickname,senha,avatar_id_fk\n"
+
+def _csv(quantidade: int) -> bytes:
+    return CABECALHO + b"".join(
+        f"imp-{i:04d},Aluno {i},imp{i},senha{i},1\n".encode() for i in range(quantidade)
+    )
+
+async def _stream(corpo: bytes):
+    yield corpo
+
+def _importar(corpo: bytes, tamanho_lote: int):
+    async def rodar():
+        async with AsyncSessionLocal() as db:
+            return await importacao.importar_alunos(db, _stream(corpo), "csv", tamanho_lote=tamanho_lote)
+    return asyncio.run(rodar())
+
+def _importados() -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(Aluno).where(Aluno.matricula.like("imp-%")))
+
+def _fila_cheia_no_lote(monkeypatch, lotes_recusados):
+    """
+    Fila do bcrypt recusando as chamadas de número em `lotes_recusados`
+    (contadas a partir de 1).
+    """
+    original = importacao.hash_passwords_async
+    chamadas = []
+
+    async def hash_passwords_async(senhas):
+        chamadas.append(1)
+        if len(chamadas) in lotes_recusados:
+            raise FilaCheia()
+        return await original(senhas)
+
+    monkeypatch.setattr(importacao, "hash_passwords_async", hash_passwords_async)
+    return chamadas
+
+def test_fila_cheia_marca_linhas_do_lote_como_erro(popular, monkeypatch):
+    popular(turmas=1, alunos=2, atividades=1, badges=1, avatares=1)
+    monkeypatch.setattr(importacao, "IMPORT_QUEUE_WAIT", 0)
+    _fila_cheia_no_lote(monkeypatch, {2})
+
+    resposta = _importar(_csv(6), tamanho_lote=2)
+
+    status = [r["status"] for r in resposta["resultados"]]
+    assert status == ["criado", "criado", "erro", "erro", "criado", "criado"]
+    assert "Servidor ocupado" in resposta["resultados"][2]["detail"]
+    assert (resposta["total"], resposta["criados"], resposta["erros"]) == (6, 4, 2)
+    assert _importados() == 4
+
+def test_fila_cheia_espera_vaga(popular, monkeypatch):
+    popular(turmas=1, alunos=2, atividades=1, badges=1, avatares=1)
+    monkeypatch.setattr(importacao, "ESPERA_FILA", 0)
+    chamadas = _fila_cheia_no_lote(monkeypatch, {1, 2})
+
+    resposta = _importar(_csv(3), tamanho_lote=3)
+
+    assert resposta["criados"] == 3
+    assert len(chamadas) == 3
+    assert _importados() == 3
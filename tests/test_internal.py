@@ -0,0 +1,17 @@
+import pytest
+
+from app import security
+
+ROTAS = ["/internal/pool", "/internal/token-cache", "/internal/cache", "/internal/ranking", "/metrics"]
+AUTORIZADO = {"Authorization": f"Bearer {security.INTERNAL_TOKEN}"}
+
+@pytest.mark.parametrize("rota", ROTAS)
+def test_rota_interna_exige_token(cliente, rota):
+    assert cliente.get(rota).status_code == 401
+    assert cliente.get(rota, headers={"Authorization": "Bearer errado"}).status_code == 401
+    assert cliente.get(rota, headers=AUTORIZADO).status_code == 200
+
+@pytest.mark.parametrize("rota", ROTAS)
+def test_rota_interna_desativada_sem_token(cliente, rota, monkeypatch):
+    monkeypatch.setattr(security, "INTERNAL_TOKEN", "")
+    assert cliente.get(rota, headers=AUTORIZADO).status_code == 404
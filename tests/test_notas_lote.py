@@ -0,0 +1,135 @@
+"""
+POST /atividades/{id}/notas:batch: classificação de cada linha e um
+único lançamento de XP/badge por entrega nova, inclusive quando outra
+requisição registra a mesma entrega no meio do lote.
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, func, insert, select
+
+from app.database import SessionLocal, engine
+from app.models import Aluno, AlunoAtividade, AlunoBadge, Atividade, Badge, Turma, aluno_turma
+
+PONTOS = 120
+MEMBROS = ["lote-01", "lote-02", "lote-03", "lote-04", "lote-05"]
+FORA_DA_TURMA = "lote-99"
+
+@pytest.fixture
+def atividade(banco):
+    """
+    Atividade (nota máxima 10) de uma turma com MEMBROS; lote-01 já
+    entregou (nota 5). FORA_DA_TURMA existe, mas não é da turma.
+    """
+    db = SessionLocal()
+    try:
+        turma = Turma(nome="Teste lote")
+        alunos = [
+            Aluno(matricula=m, nome=m, nickname=m, senha="x", xp=0, nivel=1)
+            for m in MEMBROS + [FORA_DA_TURMA]
+        ]
+        badge = Badge(nome="Badge lote", requisito="teste")
+        db.add_all([turma, badge, *alunos])
+        db.flush()
+        atividade = Atividade(
+            nome="Lote", descricao="teste", nota_max=10, pontos=PONTOS,
+            data_entrega=datetime(2030, 1, 1), turma_id_fk=turma.id, badge_id_fk=badge.id
+        )
+        db.add(atividade)
+        db.flush()
+        db.execute(aluno_turma.insert(), [{"aluno_matricula_fk": m, "turma_id_fk": turma.id} for m in MEMBROS])
+        db.add(AlunoAtividade(aluno_matricula_fk="lote-01", atividade_id_fk=atividade.id, nota=5))
+        db.commit()
+        return atividade.id
+    finally:
+        db.close()
+
+def _lancar(cliente, atividade_id, lote):
+    resposta = cliente.post(f"/atividades/{atividade_id}/notas:batch", json=lote)
+    assert resposta.status_code == 200, resposta.text
+    return [(r["matricula"], r["status"], r.get("detail")) for r in resposta.json()["resultados"]]
+
+def _estado(atividade_id):
+    db = SessionLocal()
+    try:
+        xp = dict(db.execute(select(Aluno.matricula, Aluno.xp)).all())
+        notas = dict(db.execute(
+            select(AlunoAtividade.aluno_matricula_fk, AlunoAtividade.nota)
+            .where(AlunoAtividade.atividade_id_fk == atividade_id)
+        ).all())
+        badges = dict(db.execute(
+            select(AlunoBadge.aluno_matricula_fk, func.count()).group_by(AlunoBadge.aluno_matricula_fk)
+        ).all())
+        return xp, notas, badges
+    finally:
+        db.close()
+
+def test_lote_classifica_cada_linha(cliente, atividade):
+    lote = [
+        {"matricula": "lote-01", "nota": "8"},
+        {"matricula": "lote-02", "nota": "7.5"},
+        {"matricula": "lote-03", "nota": "6"},
+        {"matricula": "lote-03", "nota": "9"},
+        {"matricula": "lote-04", "nota": "10.01"},
+        {"matricula": "lote-05", "nota": "abc"},
+        {"matricula": FORA_DA_TURMA, "nota": "5"},
+        {"matricula": "nao-existe", "nota": "5"},
+    ]
+    assert _lancar(cliente, atividade, lote) == [
+        ("lote-01", "atualizado", None),
+        ("lote-02", "criado", None),
+        ("lote-03", "erro", "Matrícula repetida no lote"),
+        ("lote-03", "erro", "Matrícula repetida no lote"),
+        ("lote-04", "erro", "Nota fora dos limites permitidos"),
+        ("lote-05", "erro", "Nota inválida"),
+        (FORA_DA_TURMA, "erro", "Aluno não está matriculado na turma desta atividade"),
+        ("nao-existe", "erro", "Aluno não encontrado"),
+    ]
+
+    xp, notas, badges = _estado(atividade)
+    assert notas == {"lote-01": 8, "lote-02": 7.5}
+    assert xp == {m: PONTOS if m == "lote-02" else 0 for m in MEMBROS + [FORA_DA_TURMA]}
+    assert badges == {"lote-02": 1}
+
+    # Relançar não concede XP nem badge de novo
+    assert _lancar(cliente, atividade, [{"matricula": "lote-02", "nota": "9"}]) == [
+        ("lote-02", "atualizado", None),
+    ]
+    xp, notas, badges = _estado(atividade)
+    assert notas["lote-02"] == 9
+    assert xp["lote-02"] == PONTOS
+    assert badges == {"lote-02": 1}
+
+def test_entrega_registrada_em_paralelo_vira_atualizado(cliente, atividade):
+    """
+    Outra requisição registra lote-02 entre a leitura das entregas e o
+    INSERT do lote: o lote é refeito e lote-02 sai como "atualizado",
+    sem XP deste lote.
+    """
+    concorrente = []
+
+    def registrar_em_paralelo(conn, cursor, statement, parameters, context, executemany):
+        if concorrente or not statement.startswith("INSERT") or "Aluno_Atividade" not in statement:
+            return
+        concorrente.append(True)
+        with engine.connect() as outra:
+            outra.execute(insert(AlunoAtividade), {
+                "aluno_matricula_fk": "lote-02", "atividade_id_fk": atividade, "nota": 3
+            })
+            outra.commit()
+
+    event.listen(engine, "before_cursor_execute", registrar_em_paralelo)
+    try:
+        resultados = _lancar(cliente, atividade, [
+            {"matricula": "lote-02", "nota": "7"},
+            {"matricula": "lote-03", "nota": "8"},
+        ])
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar_em_paralelo)
+
+    assert concorrente
+    assert resultados == [("lote-02", "atualizado", None), ("lote-03", "criado", None)]
+    xp, notas, badges = _estado(atividade)
+    assert notas == {"lote-01": 5, "lote-02": 7, "lote-03": 8}
+    assert (xp["lote-02"], xp["lote-03"]) == (0, PONTOS)
+    assert badges == {"lote-03": 1}
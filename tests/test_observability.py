@@ -0,0 +1,27 @@
+import json
+import logging
+
+from app import observability
+
+class _Coletor(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.registros = []
+
+    def emit(self, record):
+        self.registros.append(record)
+
+def test_requisicao_lenta_vai_para_o_logger(cliente, monkeypatch, capsys):
+    coletor = _Coletor()
+    observability.logger.addHandler(coletor)
+    monkeypatch.setattr(observability, "SLOW_REQUEST_MS", 0)
+    try:
+        cliente.get("/")
+    finally:
+        observability.logger.removeHandler(coletor)
+
+    assert capsys.readouterr().out == ""
+    [registro] = coletor.registros
+    assert registro.levelno == logging.WARNING
+    dados = json.loads(registro.getMessage())
+    assert (dados["evento"], dados["path"], dados["slow"]) == ("request", "/", True)
@@ -0,0 +1,105 @@
+"""
+Contabilidade de XP sob lançamentos concorrentes: o UPDATE atômico de
+app/progression.py não pode perder incrementos, e o ranking em memória
+deve terminar com o mesmo XP do banco.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from app import progression
+from app.database import SessionLocal
+from app.models import Aluno, Atividade, Badge, Professor, Turma, aluno_turma
+from app.ranking import ranking_cache
+
+MATRICULA = "teste-xp-0001"
+LANCAMENTOS = 40
+PONTOS = 150
+THREADS = 16
+
+@pytest.fixture
+def turma(banco):
+    """
+    Uma turma com LANCAMENTOS atividades (um badge em cada) e um aluno.
+    """
+    db = SessionLocal()
+    try:
+        professor = Professor(matricula="teste-prof-0001", nome="Teste", senha="x")
+        turma = Turma(nome="Teste XP", professor=professor)
+        aluno = Aluno(matricula=MATRICULA, nome="Teste", nickname=MATRICULA, senha="x", xp=0, nivel=1)
+        db.add_all([professor, turma, aluno])
+        db.flush()
+        db.execute(aluno_turma.insert().values(aluno_matricula_fk=MATRICULA, turma_id_fk=turma.id))
+        atividades = [
+            Atividade(
+                nome=f"teste {i}", descricao="teste", nota_max=10, pontos=PONTOS,
+                data_entrega=datetime(2030, 1, 1), turma_id_fk=turma.id,
+                badge=Badge(nome=f"teste {i}", requisito="teste")
+            )
+            for i in range(LANCAMENTOS)
+        ]
+        db.add_all(atividades)
+        db.commit()
+        return turma.id, [a.id for a in atividades]
+    finally:
+        db.close()
+
+def _em_paralelo(funcao, itens):
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        return list(executor.map(funcao, itens))
+
+def _conferir(turma_id: int, esperado: int):
+    db = SessionLocal()
+    try:
+        xp, nivel = progression.obter_progresso(db, MATRICULA)
+        assert xp == esperado
+        assert nivel == 1 + esperado // progression.XP_POR_NIVEL
+        for filtro in (None, turma_id):
+            ranking = ranking_cache.consultar(db, filtro, 10, MATRICULA)
+            assert ranking["aluno"]["xp"] == esperado
+            assert ranking["aluno"]["posicao"] == 1
+    finally:
+        db.close()
+
+def _com_ranking_carregado():
+    # Carrega o ranking antes: as variações chegam a ele incrementalmente
+    db = SessionLocal()
+    try:
+        ranking_cache.consultar(db, None, 1)
+    finally:
+        db.close()
+
+def test_conceder_xp_concorrente(turma):
+    turma_id, _ = turma
+    _com_ranking_carregado()
+
+    def conceder(_):
+        db = SessionLocal()
+        try:
+            progression.conceder_xp(db, [MATRICULA], PONTOS)
+            db.commit()
+        finally:
+            db.close()
+
+    _em_paralelo(conceder, range(LANCAMENTOS))
+    _conferir(turma_id, LANCAMENTOS * PONTOS)
+
+def test_lancamentos_e_desfeitos_concorrentes(turma, cliente):
+    turma_id, atividade_ids = turma
+    _com_ranking_carregado()
+
+    respostas = _em_paralelo(
+        lambda atividade_id: cliente.post(f"/atividades/{atividade_id}/alunos/{MATRICULA}", json={"nota": "10"}),
+        atividade_ids,
+    )
+    assert [r.status_code for r in respostas] == [200] * LANCAMENTOS
+    _conferir(turma_id, LANCAMENTOS * PONTOS)
+
+    metade = atividade_ids[: LANCAMENTOS // 2]
+    respostas = _em_paralelo(
+        lambda atividade_id: cliente.delete(f"/atividades/{atividade_id}/alunos/{MATRICULA}"),
+        metade,
+    )
+    assert [r.status_code for r in respostas] == [200] * len(metade)
+    _conferir(turma_id, (LANCAMENTOS - len(metade)) * PONTOS)
@@ -0,0 +1,28 @@
+"""
+Leaderboard: ordem por XP, empates dividindo a posição e atualizações
+incrementais.
+"""
+from app.ranking import Leaderboard
+
+def test_top_posicao_e_empates():
+    ranking = Leaderboard()
+    for matricula, xp in (("a", 300), ("b", 500), ("c", 300), ("d", 100)):
+        ranking.definir(matricula, xp)
+
+    assert ranking.top(3) == [(1, "b", 500), (2, "a", 300), (2, "c", 300)]
+    assert ranking.posicao("d") == (4, "d", 100)
+    assert ranking.posicao("x") is None
+    assert len(ranking) == 4
+
+def test_atualizacao_e_remocao():
+    ranking = Leaderboard()
+    for i in range(1000):
+        ranking.definir(f"m{i:04d}", i)
+
+    ranking.definir("m0000", 5000)
+    assert ranking.top(1) == [(1, "m0000", 5000)]
+    assert ranking.posicao("m0999") == (2, "m0999", 999)
+
+    ranking.remover("m0000")
+    assert ranking.top(1) == [(1, "m0999", 999)]
+    assert len(ranking) == 999
@@ -0,0 +1,38 @@
+from datetime import datetime
+from decimal import Decimal
+
+import orjson
+
+from app import serialization
+from app.schemas.aluno import AlunoResumoList
+from app.schemas.atividade import AtividadeDoAluno
+from app.schemas.notas import TurmaEstatisticas
+
+# Colunas anuláveis vazias: o caminho rápido e a validação do
+# response_model precisam produzir o mesmo corpo.
+BADGE = {"id": 1, "nome": "Badge", "requisito": None, "caminho_foto": None}
+
+CASOS = [
+    (AlunoResumoList, {
+        "data": [{"matricula": "a1", "nome": "Aluno", "nickname": None, "xp": None, "nivel": None,
+                  "avatar_id_fk": None, "avatar": None, "badges": [BADGE]}],
+        "next_cursor": None,
+    }),
+    (AtividadeDoAluno, {
+        "id": 1, "nome": "Atividade", "descricao": None, "nota_max": None, "pontos": None,
+        "badge_id_fk": 1, "turma_id_fk": None, "data_entrega": datetime(2024, 5, 1, 12, 0),
+        "badge": BADGE, "turma": None, "fez_atividade": True, "nota": Decimal("7.50"),
+    }),
+    (TurmaEstatisticas, {
+        "turma_id": 1,
+        "atividades": [],
+        "ranking": [{"posicao": 1, "matricula": "a1", "nome": "Aluno", "nickname": None,
+                     "entregas": 1, "media_percentual": None}],
+    }),
+]
+
+def test_moldar_igual_a_validacao_com_colunas_nulas():
+    for modelo, dados in CASOS:
+        esperado = modelo.model_validate(dados).model_dump_json(by_alias=True)
+        obtido = serialization.resposta(modelo, dados).body
+        assert orjson.loads(obtido) == orjson.loads(esperado), modelo.__name__
@@ -0,0 +1,53 @@
+"""
+Caminhos originais das imagens redirecionam para a cópia com hash do
+manifesto, que é servida com cache imutável.
+"""
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.static_files import CACHE_IMUTAVEL, CACHE_PADRAO, AssetStaticFiles
+
+HASH = "0123456789ab"
+
+@pytest.fixture
+def cliente_static(tmp_path):
+    (tmp_path / "imagens").mkdir()
+    (tmp_path / "imagens" / "a.png").write_bytes(b"png")
+    dist = tmp_path / "dist" / "imagens"
+    dist.mkdir(parents=True)
+    for nome in (f"a.{HASH}.png", f"a.{HASH}.webp", f"a.{HASH}.thumb.png"):
+        (dist / nome).write_bytes(b"x")
+    (tmp_path / "dist" / "manifest.json").write_text(json.dumps({
+        "imagens/a.png": {
+            "original": f"dist/imagens/a.{HASH}.png",
+            "variantes": {"webp": f"dist/imagens/a.{HASH}.webp", "avif": f"dist/imagens/a.{HASH}.avif"},
+            "thumb": {"original": f"dist/imagens/a.{HASH}.thumb.png"},
+        }
+    }))
+    app = FastAPI()
+    app.mount("/static", AssetStaticFiles(directory=str(tmp_path)), name="static")
+    return TestClient(app)
+
+def test_original_redireciona_para_variante_com_hash(cliente_static):
+    resposta = cliente_static.get(
+        "/static/imagens/a.png", headers={"accept": "image/avif,image/webp,*/*"}, follow_redirects=False
+    )
+    # AVIF está no manifesto mas não no disco: cai para o WebP
+    assert resposta.status_code == 302
+    assert resposta.headers["location"] == f"/static/dist/imagens/a.{HASH}.webp"
+    assert resposta.headers["cache-control"] == CACHE_PADRAO
+    assert resposta.headers["vary"] == "Accept"
+
+    destino = cliente_static.get(resposta.headers["location"])
+    assert destino.status_code == 200
+    assert destino.headers["cache-control"] == CACHE_IMUTAVEL
+
+def test_miniatura_e_formato_original(cliente_static):
+    resposta = cliente_static.get("/static/imagens/a.png?size=thumb", follow_redirects=False)
+    assert resposta.headers["location"] == f"/static/dist/imagens/a.{HASH}.thumb.png"
+
+    resposta = cliente_static.get("/static/imagens/a.png", headers={"accept": "image/png"}, follow_redirects=False)
+    assert resposta.headers["location"] == f"/static/dist/imagens/a.{HASH}.png"